@@ -112,6 +112,30 @@ ENV_PHOENIX_ENABLE_WEBSOCKETS = "PHOENIX_ENABLE_WEBSOCKETS"
 """
 Whether or not to enable websockets. Defaults to None.
 """
+ENV_PHOENIX_MAX_SPANS_QUEUE_SIZE = "PHOENIX_MAX_SPANS_QUEUE_SIZE"
+"""
+The maximum number of spans to hold in memory while they await insertion into the database.
+When this many spans are buffered, new spans are rejected over HTTP (503 with Retry-After) and
+gRPC (RESOURCE_EXHAUSTED) so that clients back off until the buffer drains. Defaults to 20000.
+"""
+ENV_PHOENIX_SPAN_DECODER_PROCESSES = "PHOENIX_SPAN_DECODER_PROCESSES"
+"""
+The number of worker processes used to decode large OTLP export requests in parallel. Defaults
+to 0, in which case each export request is decoded in a single call on the threadpool.
+"""
+ENV_PHOENIX_SPAN_SPOOL_DIR = "PHOENIX_SPAN_SPOOL_DIR"
+"""
+The directory of an on-disk spool to which incoming spans are written before they are
+acknowledged. Spans that have not been committed to the database when the server stops are
+replayed from the spool on startup. The spool is disabled if this is not set.
+"""
+ENV_PHOENIX_SQLITE_READ_POOL_SIZE = "PHOENIX_SQLITE_READ_POOL_SIZE"
+"""
+The number of read-only connections used for queries when Phoenix is backed by a SQLite file,
+in addition to the one connection used for writes. Since the database is in WAL mode, reads on
+these connections neither wait for nor block the writer. Defaults to 4. If 0, reads share the
+connection used for writes.
+"""
 
 # Phoenix server OpenTelemetry instrumentation environment variables
 ENV_PHOENIX_SERVER_INSTRUMENTATION_OTLP_TRACE_COLLECTOR_HTTP_ENDPOINT = (
@@ -452,6 +476,44 @@ def get_env_enable_websockets() -> Optional[bool]:
     return _bool_val(ENV_PHOENIX_ENABLE_WEBSOCKETS)
 
 
+def get_env_max_spans_queue_size() -> int:
+    max_spans_queue_size = _int_val(ENV_PHOENIX_MAX_SPANS_QUEUE_SIZE, DEFAULT_MAX_SPANS_QUEUE_SIZE)
+    if max_spans_queue_size <= 0:
+        raise ValueError(
+            f"Invalid value for environment variable {ENV_PHOENIX_MAX_SPANS_QUEUE_SIZE}: "
+            f"{max_spans_queue_size}. Value must be a positive integer."
+        )
+    return max_spans_queue_size
+
+
+def get_env_span_decoder_processes() -> int:
+    span_decoder_processes = _int_val(ENV_PHOENIX_SPAN_DECODER_PROCESSES, 0)
+    if span_decoder_processes < 0:
+        raise ValueError(
+            f"Invalid value for environment variable {ENV_PHOENIX_SPAN_DECODER_PROCESSES}: "
+            f"{span_decoder_processes}. Value must be a non-negative integer."
+        )
+    return span_decoder_processes
+
+
+def get_env_sqlite_read_pool_size() -> int:
+    sqlite_read_pool_size = _int_val(
+        ENV_PHOENIX_SQLITE_READ_POOL_SIZE, DEFAULT_SQLITE_READ_POOL_SIZE
+    )
+    if sqlite_read_pool_size < 0:
+        raise ValueError(
+            f"Invalid value for environment variable {ENV_PHOENIX_SQLITE_READ_POOL_SIZE}: "
+            f"{sqlite_read_pool_size}. Value must be a non-negative integer."
+        )
+    return sqlite_read_pool_size
+
+
+def get_env_span_spool_dir() -> Optional[Path]:
+    if not (span_spool_dir := getenv(ENV_PHOENIX_SPAN_SPOOL_DIR)):
+        return None
+    return Path(span_spool_dir)
+
+
 @dataclass(frozen=True)
 class OAuth2ClientConfig:
     idp_name: str
@@ -537,6 +599,10 @@ GRPC_PORT = 4317
 """The port the gRPC server will run on after launch_app is called.
 The default network port for OTLP/gRPC is 4317.
 See https://opentelemetry.io/docs/specs/otlp/#otlpgrpc-default-port"""
+DEFAULT_MAX_SPANS_QUEUE_SIZE = 20_000
+"""The maximum number of spans buffered in memory for insertion before ingestion is rejected."""
+DEFAULT_SQLITE_READ_POOL_SIZE = 4
+"""The number of read-only connections to a SQLite database, in addition to the writer."""
 GENERATED_INFERENCES_NAME_PREFIX = "phoenix_inferences_"
 """The prefix of datasets that are auto-assigned a name."""
 WORKING_DIR = get_working_dir()
@@ -3,14 +3,19 @@ import logging
 from asyncio import Queue, as_completed
 from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
 from dataclasses import dataclass, field
+from datetime import datetime
 from functools import singledispatchmethod
 from itertools import islice
 from time import perf_counter
 from typing import Any, Optional, cast
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import TypeAlias
 
 import phoenix.trace.v1 as pb
+from phoenix.config import DEFAULT_MAX_SPANS_QUEUE_SIZE
+from phoenix.datetime_utils import normalize_datetime
+from phoenix.db.insertion.cache import RowIdCache
 from phoenix.db.insertion.constants import DEFAULT_RETRY_ALLOWANCE, DEFAULT_RETRY_DELAY_SEC
 from phoenix.db.insertion.document_annotation import DocumentAnnotationQueueInserter
 from phoenix.db.insertion.evaluation import (
@@ -18,11 +23,12 @@ from phoenix.db.insertion.evaluation import (
     insert_evaluation,
 )
 from phoenix.db.insertion.helpers import DataManipulation, DataManipulationEvent
-from phoenix.db.insertion.span import SpanInsertionEvent, insert_span
+from phoenix.db.insertion.span import SpanInsertionEvent, insert_span, insert_spans
 from phoenix.db.insertion.span_annotation import SpanAnnotationQueueInserter
 from phoenix.db.insertion.trace_annotation import TraceAnnotationQueueInserter
 from phoenix.db.insertion.types import Insertables, Precursors
 from phoenix.server.dml_event import DmlEvent, SpanInsertEvent
+from phoenix.server.span_spool import SpanSpool
 from phoenix.server.types import CanPutItem, DbSessionFactory
 from phoenix.trace.schemas import Span
 
@@ -46,29 +52,59 @@ class BulkInserter:
         initial_batch_of_evaluations: Optional[Iterable[pb.Evaluation]] = None,
         sleep: float = 0.1,
         max_ops_per_transaction: int = 1000,
+        max_spans_per_transaction: int = 10_000,
+        max_flush_latency: float = 0.1,
+        target_commit_latency: float = 0.5,
         max_queue_size: int = 1000,
+        max_spans_queue_size: int = DEFAULT_MAX_SPANS_QUEUE_SIZE,
         enable_prometheus: bool = False,
         retry_delay_sec: float = DEFAULT_RETRY_DELAY_SEC,
         retry_allowance: int = DEFAULT_RETRY_ALLOWANCE,
+        rowid_cache: Optional[RowIdCache] = None,
+        span_spool: Optional[SpanSpool] = None,
     ) -> None:
         """
         :param db: A function to initiate a new database session.
         :param initial_batch_of_spans: Initial batch of spans to insert.
-        :param sleep: The time to sleep between bulk insertions
+        :param sleep: The time to sleep between bulk insertions when there is nothing to insert
         :param max_ops_per_transaction: The maximum number of operations to dequeue from
-        the operations queue for each transaction.
+        the operations queue for each transaction. It is also the initial number of spans
+        inserted per transaction, which is then adjusted based on observed commit times.
+        :param max_spans_per_transaction: The upper bound on the number of spans inserted
+        per transaction.
+        :param max_flush_latency: The maximum time a span waits in the buffer before it's
+        flushed, unless a full transaction's worth of spans has accumulated sooner.
+        :param target_commit_latency: The duration of a span insertion transaction that the
+        number of spans per transaction is adjusted towards.
         :param max_queue_size: The maximum length of the operations queue.
+        :param max_spans_queue_size: The number of buffered spans, including those admitted
+        by `admit_spans` but not yet queued, above which `span_queue_is_full` returns True,
+        so that ingestion can apply backpressure.
         :param enable_prometheus: Whether Prometheus is enabled.
+        :param rowid_cache: The cache of project, trace and project session row ids used
+        for span insertion. It should be invalidated whenever projects or their traces are
+        deleted. A new one is created if not provided.
+        :param span_spool: The on-disk spool holding the spans being ingested, if any. Spans
+        are released from it once committed, and spans whose transaction fails are kept in
+        the buffer to be retried, up to `retry_allowance` times, instead of being dropped.
         """
         self._db = db
         self._running = False
         self._sleep = sleep
         self._max_ops_per_transaction = max_ops_per_transaction
+        self._max_spans_per_transaction = max(max_spans_per_transaction, max_ops_per_transaction)
+        self._spans_per_transaction = max_ops_per_transaction
+        self._max_flush_latency = max_flush_latency
+        self._target_commit_latency = target_commit_latency
+        self._wakeup = asyncio.Event()
         self._operations: Optional[Queue[DataManipulation]] = None
         self._max_queue_size = max_queue_size
+        self._max_spans_queue_size = max_spans_queue_size
+        self._num_admitted_spans = 0
         self._spans: list[tuple[Span, str]] = (
             [] if initial_batch_of_spans is None else list(initial_batch_of_spans)
         )
+        self._oldest_span_time: Optional[float] = perf_counter() if self._spans else None
         self._evaluations: list[pb.Evaluation] = (
             [] if initial_batch_of_evaluations is None else list(initial_batch_of_evaluations)
         )
@@ -77,7 +113,12 @@ class BulkInserter:
         self._enable_prometheus = enable_prometheus
         self._retry_delay_sec = retry_delay_sec
         self._retry_allowance = retry_allowance
+        self._span_retries_left = retry_allowance
         self._queue_inserters = _QueueInserters(db, self._retry_delay_sec, self._retry_allowance)
+        self._rowid_cache = (
+            RowIdCache(enable_prometheus=enable_prometheus) if rowid_cache is None else rowid_cache
+        )
+        self._span_spool = span_spool
 
     async def __aenter__(
         self,
@@ -109,8 +150,43 @@ class BulkInserter:
     def _enqueue_operation(self, operation: DataManipulation) -> None:
         cast("Queue[DataManipulation]", self._operations).put_nowait(operation)
 
+    def span_queue_is_full(self) -> bool:
+        """
+        Whether the buffer of spans awaiting insertion, together with the spans admitted
+        but not yet queued, has reached its high-water mark, in which case new spans should
+        be rejected until it drains.
+        """
+        return len(self._spans) + self._num_admitted_spans >= self._max_spans_queue_size
+
+    def admit_spans(self, num_spans: int) -> Callable[[], None]:
+        """
+        Counts `num_spans` spans that have been accepted for ingestion, but are still to be
+        decoded and queued, towards `span_queue_is_full` until the returned function is
+        called. Otherwise, a burst of requests accepted while their spans are being decoded
+        would all pass the check against a buffer that has yet to grow.
+        """
+        self._num_admitted_spans += num_spans
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self._num_admitted_spans -= num_spans
+
+        return release
+
     async def _queue_span(self, span: Span, project_name: str) -> None:
+        if not self._spans:
+            self._oldest_span_time = perf_counter()
+            self._wakeup.set()
         self._spans.append((span, project_name))
+        if len(self._spans) == self._spans_per_transaction:
+            self._wakeup.set()
+        if self._enable_prometheus:
+            from phoenix.server.prometheus import BULK_LOADER_SPAN_QUEUE_SIZE
+
+            BULK_LOADER_SPAN_QUEUE_SIZE.set(len(self._spans))
 
     async def _queue_evaluation(self, evaluation: pb.Evaluation) -> None:
         self._evaluations.append(evaluation)
@@ -134,7 +210,17 @@ class BulkInserter:
                 and not self._spans
                 and not self._evaluations
             ):
-                await asyncio.sleep(self._sleep)
+                await self._wait(self._sleep)
+                continue
+            if (
+                self._queue_inserters.empty
+                and self._operations.empty()
+                and not self._evaluations
+                and self._running
+                and (remaining := self._time_until_spans_are_due()) > 0
+            ):
+                # Let more spans accumulate, up to a full transaction's worth.
+                await self._wait(remaining)
                 continue
             ops_remaining = self._max_ops_per_transaction
             async with self._db() as session:
@@ -158,6 +244,18 @@ class BulkInserter:
             if self._spans:
                 spans_buffer = self._spans
                 self._spans = []
+                if self._enable_prometheus:
+                    from phoenix.server.prometheus import (
+                        BULK_LOADER_SPAN_QUEUE_SIZE,
+                        BULK_LOADER_SPAN_QUEUE_WAIT_TIME,
+                    )
+
+                    BULK_LOADER_SPAN_QUEUE_SIZE.set(0)
+                    if self._oldest_span_time is not None:
+                        BULK_LOADER_SPAN_QUEUE_WAIT_TIME.observe(
+                            perf_counter() - self._oldest_span_time
+                        )
+                self._oldest_span_time = None
             if self._evaluations:
                 evaluations_buffer = self._evaluations
                 self._evaluations = []
@@ -171,44 +269,156 @@ class BulkInserter:
                 evaluations_buffer = None
             async for event in self._queue_inserters.insert():
                 self._event_queue.put(event)
-            await asyncio.sleep(self._sleep)
+            if len(self._spans) < self._spans_per_transaction:
+                await self._wait(self._sleep)
+
+    def _time_until_spans_are_due(self) -> float:
+        """
+        The time left before the buffered spans must be flushed, which is zero once a full
+        transaction's worth of spans has accumulated.
+        """
+        if not self._spans or len(self._spans) >= self._spans_per_transaction:
+            return 0
+        if self._oldest_span_time is None:
+            return 0
+        return self._max_flush_latency - (perf_counter() - self._oldest_span_time)
+
+    async def _wait(self, timeout: float) -> None:
+        """
+        Sleeps for up to `timeout` seconds, waking up early when the first span arrives in
+        an empty buffer or when a full transaction's worth of spans has accumulated.
+        """
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _adjust_spans_per_transaction(self, num_spans: int, commit_latency: float) -> None:
+        """
+        Scales the number of spans per transaction towards the target commit latency,
+        by at most a factor of two either way, growing only after a full transaction.
+        """
+        ratio = self._target_commit_latency / max(commit_latency, 1e-3)
+        ratio = min(2.0, max(0.5, ratio))
+        if ratio > 1 and num_spans < self._spans_per_transaction:
+            return
+        self._spans_per_transaction = min(
+            self._max_spans_per_transaction,
+            max(1, round(self._spans_per_transaction * ratio)),
+        )
+        if self._enable_prometheus:
+            from phoenix.server.prometheus import BULK_LOADER_SPANS_PER_TRANSACTION
+
+            BULK_LOADER_SPANS_PER_TRANSACTION.set(self._spans_per_transaction)
 
     async def _insert_spans(self, spans: list[tuple[Span, str]]) -> None:
         project_ids = set()
-        for i in range(0, len(spans), self._max_ops_per_transaction):
+        start_times: list[datetime] = []
+        i = 0
+        while i < len(spans):
+            chunk = spans[i : i + self._spans_per_transaction]
+            i += len(chunk)
             try:
                 start = perf_counter()
                 async with self._db() as session:
-                    for span, project_name in islice(spans, i, i + self._max_ops_per_transaction):
-                        if self._enable_prometheus:
-                            from phoenix.server.prometheus import BULK_LOADER_SPAN_INSERTIONS
+                    if self._enable_prometheus:
+                        from phoenix.server.prometheus import BULK_LOADER_SPAN_INSERTIONS
 
-                            BULK_LOADER_SPAN_INSERTIONS.inc()
-                        result: Optional[SpanInsertionEvent] = None
-                        try:
-                            async with session.begin_nested():
-                                result = await insert_span(session, span, project_name)
-                        except Exception:
-                            if self._enable_prometheus:
-                                from phoenix.server.prometheus import BULK_LOADER_EXCEPTIONS
+                        BULK_LOADER_SPAN_INSERTIONS.inc(len(chunk))
+                    results: list[SpanInsertionEvent] = []
+                    try:
+                        async with session.begin_nested():
+                            results = await insert_spans(session, *chunk, cache=self._rowid_cache)
+                    except Exception:
+                        self._rowid_cache.clear()
+                        if self._enable_prometheus:
+                            from phoenix.server.prometheus import BULK_LOADER_EXCEPTIONS
 
-                                BULK_LOADER_EXCEPTIONS.inc()
-                            logger.exception(
-                                f"Failed to insert span with span_id={span.context.span_id}"
-                            )
-                        if result is not None:
-                            project_ids.add(result.project_rowid)
+                            BULK_LOADER_EXCEPTIONS.inc()
+                        logger.exception(
+                            f"Failed to bulk insert {len(chunk)} spans. "
+                            "Will try to insert them individually instead."
+                        )
+                        results = await self._insert_spans_individually(session, chunk)
+                    for result in results:
+                        project_ids.add(result.project_rowid)
+                        start_times.append(cast(datetime, normalize_datetime(result.start_time)))
+                        if result.previous_trace_start_time is not None:
+                            start_times.append(result.previous_trace_start_time)
+                if self._span_spool is not None:
+                    self._span_spool.release(chunk)
+                self._span_retries_left = self._retry_allowance
+                commit_latency = perf_counter() - start
+                self._adjust_spans_per_transaction(len(chunk), commit_latency)
                 if self._enable_prometheus:
-                    from phoenix.server.prometheus import BULK_LOADER_INSERTION_TIME
+                    from phoenix.server.prometheus import (
+                        BULK_LOADER_INSERTION_TIME,
+                        BULK_LOADER_SPAN_TRANSACTION_SIZE,
+                        BULK_LOADER_SPAN_TRANSACTION_TIME,
+                    )
+
+                    BULK_LOADER_INSERTION_TIME.observe(commit_latency)
+                    BULK_LOADER_SPAN_TRANSACTION_SIZE.observe(len(chunk))
+                    BULK_LOADER_SPAN_TRANSACTION_TIME.observe(commit_latency)
+            except Exception:
+                self._rowid_cache.clear()
+                if self._enable_prometheus:
+                    from phoenix.server.prometheus import BULK_LOADER_EXCEPTIONS
 
-                    BULK_LOADER_INSERTION_TIME.observe(perf_counter() - start)
+                    BULK_LOADER_EXCEPTIONS.inc()
+                if self._span_spool is None:
+                    logger.exception("Failed to insert spans")
+                    continue
+                if self._span_retries_left <= 0:
+                    # Give up on these spans rather than retry them at the head of the buffer
+                    # forever, e.g. if they are rejected by the database.
+                    logger.exception(
+                        f"Failed to insert {len(chunk)} spans after {self._retry_allowance} "
+                        "retries. Dropping them."
+                    )
+                    self._span_spool.release(chunk)
+                    self._span_retries_left = self._retry_allowance
+                    continue
+                self._span_retries_left -= 1
+                # The spans are still on disk, so put them back in the buffer to be retried,
+                # e.g. when the database is briefly unavailable.
+                remaining = spans[i - len(chunk) :]
+                logger.exception(
+                    f"Failed to insert {len(remaining)} spans. "
+                    f"Will retry in {self._retry_delay_sec} seconds."
+                )
+                self._spans[:0] = remaining
+                if self._oldest_span_time is None:
+                    self._oldest_span_time = perf_counter()
+                await asyncio.sleep(self._retry_delay_sec)
+                break
+        self._event_queue.put(
+            SpanInsertEvent(
+                tuple(project_ids),
+                min_start_time=min(start_times, default=None),
+                max_start_time=max(start_times, default=None),
+            )
+        )
+
+    async def _insert_spans_individually(
+        self,
+        session: AsyncSession,
+        spans: Iterable[tuple[Span, str]],
+    ) -> list[SpanInsertionEvent]:
+        results: list[SpanInsertionEvent] = []
+        for span, project_name in spans:
+            try:
+                async with session.begin_nested():
+                    if (result := await insert_span(session, span, project_name)) is not None:
+                        results.append(result)
             except Exception:
                 if self._enable_prometheus:
                     from phoenix.server.prometheus import BULK_LOADER_EXCEPTIONS
 
                     BULK_LOADER_EXCEPTIONS.inc()
-                logger.exception("Failed to insert spans")
-        self._event_queue.put(SpanInsertEvent(tuple(project_ids)))
+                logger.exception(f"Failed to insert span with span_id={span.context.span_id}")
+        return results
 
     async def _insert_evaluations(self, evaluations: list[pb.Evaluation]) -> None:
         for i in range(0, len(evaluations), self._max_ops_per_transaction):
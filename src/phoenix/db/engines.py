@@ -4,13 +4,13 @@ from collections.abc import Callable
 from datetime import datetime
 from enum import Enum
 from sqlite3 import Connection
-from typing import Any, Mapping
+from typing import Any, Mapping, Optional
 
 import aiosqlite
 import numpy as np
 import sqlalchemy
 import sqlean
-from sqlalchemy import URL, StaticPool, event, make_url
+from sqlalchemy import URL, AsyncAdaptedQueuePool, StaticPool, event, make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from typing_extensions import assert_never
 
@@ -33,6 +33,14 @@ def set_sqlite_pragma(connection: Connection, _: Any) -> None:
     cursor.close()
 
 
+def set_sqlite_read_pragma(connection: Connection, _: Any) -> None:
+    cursor = connection.cursor()
+    cursor.execute("PRAGMA query_only = ON;")
+    cursor.execute("PRAGMA cache_size = -32000;")
+    cursor.execute("PRAGMA busy_timeout = 10000;")
+    cursor.close()
+
+
 def get_printable_db_url(connection_str: str) -> str:
     return make_url(connection_str).render_as_string(hide_password=True)
 
@@ -98,6 +106,22 @@ def create_engine(
         assert_never(backend)
 
 
+def create_read_engine(
+    connection_str: str,
+    pool_size: int,
+    log_to_stdout: bool = False,
+) -> Optional[AsyncEngine]:
+    """
+    Factory to create a SQLAlchemy engine with a pool of read-only connections from a URL
+    string, for databases where the engine from `create_engine` serializes all queries on
+    a single connection, i.e. SQLite files. Returns None if there is no such need.
+    """
+    url = get_async_db_url(connection_str)
+    if pool_size <= 0 or url.get_backend_name() != SupportedSQLDialect.SQLITE.value:
+        return None
+    return aio_sqlite_read_engine(url=url, pool_size=pool_size, log_to_stdout=log_to_stdout)
+
+
 def aio_sqlite_engine(
     url: URL,
     migrate: bool = True,
@@ -111,20 +135,11 @@ def aio_sqlite_engine(
     if database.startswith(":memory:") and shared_cache:
         url = url.set(query={**url.query, "cache": "shared"}, database=":memory:")
     database = url.render_as_string().partition("///")[-1]
-
-    def async_creator() -> aiosqlite.Connection:
-        conn = aiosqlite.Connection(
-            lambda: sqlean.connect(f"file:{database}", uri=True),
-            iter_chunk_size=64,
-        )
-        conn.daemon = True
-        return conn
-
     engine = create_async_engine(
         url=url,
         echo=log_to_stdout,
         json_serializer=_dumps,
-        async_creator=async_creator,
+        async_creator=_aiosqlite_creator(database),
         poolclass=StaticPool,
     )
     event.listen(engine.sync_engine, "connect", set_sqlite_pragma)
@@ -148,6 +163,48 @@ def aio_sqlite_engine(
     return engine
 
 
+def aio_sqlite_read_engine(
+    url: URL,
+    pool_size: int,
+    log_to_stdout: bool = False,
+) -> Optional[AsyncEngine]:
+    """
+    Creates an engine with a pool of read-only connections to a SQLite file, which is in WAL
+    mode (see `set_sqlite_pragma`), so that reads neither wait for nor block the one writer.
+    Returns None for an in-memory database, since it has no WAL and connections sharing its
+    cache would lock each other out instead.
+    """
+    database = url.database or ":memory:"
+    if database.startswith("file:"):
+        database = database[5:]
+    if database.startswith(":memory:"):
+        return None
+    database = url.render_as_string().partition("///")[-1]
+    engine = create_async_engine(
+        url=url,
+        echo=log_to_stdout,
+        json_serializer=_dumps,
+        async_creator=_aiosqlite_creator(database),
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+    event.listen(engine.sync_engine, "connect", set_sqlite_read_pragma)
+    return engine
+
+
+def _aiosqlite_creator(database: str) -> Callable[[], aiosqlite.Connection]:
+    def async_creator() -> aiosqlite.Connection:
+        conn = aiosqlite.Connection(
+            lambda: sqlean.connect(f"file:{database}", uri=True),
+            iter_chunk_size=64,
+        )
+        conn.daemon = True
+        return conn
+
+    return async_creator
+
+
 def set_postgresql_search_path(schema: str) -> Callable[[Connection, Any], None]:
     def _(connection: Connection, _: Any) -> None:
         cursor = connection.cursor()
@@ -0,0 +1,137 @@
+"""
+Write-through cache of the row ids (and time bounds) of the projects, traces and
+project sessions recently touched by span insertion, so that consecutive batches of
+spans, which typically share a handful of projects and traces, don't need to look
+them up again. Entries are written only by the span insertion path, so they are
+accurate as long as nothing else modifies those rows; deletions must be followed by
+a call to `invalidate_project`, and any failed insertion should call `clear`.
+"""
+
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Generic, Literal, NamedTuple, Optional, TypeVar
+
+from cachetools import TTLCache
+from typing_extensions import TypeAlias
+
+ProjectName: TypeAlias = str
+ProjectRowId: TypeAlias = int
+TraceId: TypeAlias = str
+SessionId: TypeAlias = str
+
+_CacheName: TypeAlias = Literal["project", "trace", "project_session", "project_session_id"]
+
+_KeyT = TypeVar("_KeyT")
+_ValueT = TypeVar("_ValueT")
+
+
+class CachedTrace(NamedTuple):
+    rowid: int
+    project_rowid: ProjectRowId
+    start_time: datetime
+    end_time: datetime
+    project_session_rowid: Optional[int]
+
+
+class CachedProjectSession(NamedTuple):
+    rowid: int
+    session_id: SessionId
+    project_rowid: ProjectRowId
+    start_time: datetime
+    end_time: datetime
+
+
+class _Section(Generic[_KeyT, _ValueT]):
+    def __init__(
+        self,
+        name: _CacheName,
+        maxsize: int,
+        ttl: float,
+        enable_prometheus: bool,
+    ) -> None:
+        self._name = name
+        self._cache: TTLCache[_KeyT, _ValueT] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._enable_prometheus = enable_prometheus
+
+    def get(self, key: _KeyT) -> Optional[_ValueT]:
+        value = self._cache.get(key)
+        if self._enable_prometheus:
+            from phoenix.server.prometheus import (
+                SPAN_INSERTION_CACHE_HITS,
+                SPAN_INSERTION_CACHE_MISSES,
+            )
+
+            if value is None:
+                SPAN_INSERTION_CACHE_MISSES.labels(cache=self._name).inc()
+            else:
+                SPAN_INSERTION_CACHE_HITS.labels(cache=self._name).inc()
+        return value
+
+    def set(self, key: _KeyT, value: _ValueT) -> None:
+        self._cache[key] = value
+
+    def pop(self, key: _KeyT) -> None:
+        self._cache.pop(key, None)
+
+    def items(self) -> Iterator[tuple[_KeyT, _ValueT]]:
+        yield from list(self._cache.items())
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class RowIdCache:
+    def __init__(
+        self,
+        *,
+        maxsize: int = 10_000,
+        ttl: float = 600,
+        enable_prometheus: bool = False,
+    ) -> None:
+        """
+        :param maxsize: The maximum number of entries for each of projects, traces and
+        project sessions.
+        :param ttl: The number of seconds after which an entry expires.
+        :param enable_prometheus: Whether Prometheus is enabled.
+        """
+        self.projects: _Section[ProjectName, ProjectRowId] = _Section(
+            "project", maxsize, ttl, enable_prometheus
+        )
+        self.traces: _Section[TraceId, CachedTrace] = _Section(
+            "trace", maxsize, ttl, enable_prometheus
+        )
+        self.project_sessions: _Section[int, CachedProjectSession] = _Section(
+            "project_session", maxsize, ttl, enable_prometheus
+        )
+        self.project_session_rowids: _Section[SessionId, int] = _Section(
+            "project_session_id", maxsize, ttl, enable_prometheus
+        )
+
+    def invalidate_project(self, *project_rowids: ProjectRowId) -> None:
+        """
+        Evicts the given projects along with the traces and project sessions that
+        belong to them, e.g. after the project is deleted or its spans are cleared.
+        """
+        ids = set(project_rowids)
+        traces = [(k, v) for k, v in self.traces.items() if v.project_rowid in ids]
+        session_rowids = {v.project_session_rowid for _, v in traces}
+        sessions = [
+            (k, v)
+            for k, v in self.project_sessions.items()
+            if v.project_rowid in ids or k in session_rowids
+        ]
+        _evict(self.projects, (k for k, v in self.projects.items() if v in ids))
+        _evict(self.traces, (k for k, _ in traces))
+        _evict(self.project_sessions, (k for k, _ in sessions))
+        _evict(self.project_session_rowids, (v.session_id for _, v in sessions))
+
+    def clear(self) -> None:
+        self.projects.clear()
+        self.traces.clear()
+        self.project_sessions.clear()
+        self.project_session_rowids.clear()
+
+
+def _evict(section: _Section[_KeyT, _ValueT], keys: Iterable[_KeyT]) -> None:
+    for key in list(keys):
+        section.pop(key)
@@ -1,12 +1,15 @@
 from abc import ABC
 from collections.abc import Awaitable, Callable, Iterable, Iterator, Mapping, Sequence
 from enum import Enum, auto
-from typing import Any, Optional
+from itertools import count
+from typing import Any, Optional, TypeVar
 
-from sqlalchemy import Insert
+from sqlalchemy import Insert, column, inspect, select, text
+from sqlalchemy import table as table_clause
 from sqlalchemy.dialects.postgresql import insert as insert_postgresql
 from sqlalchemy.dialects.sqlite import insert as insert_sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql.elements import KeyedColumnElement
 from typing_extensions import TypeAlias, assert_never
 
@@ -29,6 +32,35 @@ class OnConflict(Enum):
     DO_UPDATE = auto()
 
 
+MIN_RECORDS_TO_COPY = 100
+"""
+The number of records at or above which `bulk_insert_on_conflict` uses COPY on PostgreSQL,
+below which the cost of the staging table outweighs the savings.
+"""
+
+MAX_BIND_PARAMETERS = 32_766
+"""
+The maximum number of bind parameters in a single statement, i.e. the lower of the limits
+of PostgreSQL (32,767) and of SQLite (32,766 by default since version 3.32).
+"""
+
+_T = TypeVar("_T")
+
+
+def chunk_by_parameters(
+    items: Iterable[_T],
+    parameters_per_item: int = 1,
+) -> Iterator[list[_T]]:
+    """
+    Splits `items` into chunks small enough to be bound in a single statement, e.g. as
+    the rows of a multi-row INSERT or the values of an IN clause.
+    """
+    items = list(items)
+    size = max(1, MAX_BIND_PARAMETERS // max(1, parameters_per_item))
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
 def insert_on_conflict(
     *records: Mapping[str, Any],
     table: type[Base],
@@ -41,26 +73,15 @@ def insert_on_conflict(
     Dialect specific insertion statement using ON CONFLICT DO syntax.
     """
     if on_conflict is OnConflict.DO_UPDATE:
-        # postegresql rejects duplicate updates for the same record
-        seen = set()
-        unique_records = []
-        for v in reversed(records):
-            if (k := tuple(v.get(name) for name in unique_by)) in seen:
-                continue
-            unique_records.append(v)
-            seen.add(k)
-        records = tuple(reversed(unique_records))
-    constraint = "_".join(("uq", table.__tablename__, *unique_by))
+        records = _dedup(records, unique_by)
     if dialect is SupportedSQLDialect.POSTGRESQL:
-        stmt_postgresql = insert_postgresql(table).values(records)
-        if on_conflict is OnConflict.DO_NOTHING:
-            return stmt_postgresql.on_conflict_do_nothing(constraint=constraint)
-        if on_conflict is OnConflict.DO_UPDATE:
-            return stmt_postgresql.on_conflict_do_update(
-                constraint=constraint,
-                set_=set_ if set_ else dict(_clean(stmt_postgresql.excluded.items())),
-            )
-        assert_never(on_conflict)
+        return _on_conflict_postgresql(
+            insert_postgresql(table).values(records),
+            table=table,
+            unique_by=unique_by,
+            on_conflict=on_conflict,
+            set_=set_,
+        )
     if dialect is SupportedSQLDialect.SQLITE:
         stmt_sqlite = insert_sqlite(table).values(records)
         if on_conflict is OnConflict.DO_NOTHING:
@@ -74,6 +95,153 @@ def insert_on_conflict(
     assert_never(dialect)
 
 
+async def bulk_insert_on_conflict(
+    session: AsyncSession,
+    *records: Mapping[str, Any],
+    table: type[Base],
+    unique_by: Sequence[str],
+    returning: InstrumentedAttribute[Any],
+    on_conflict: OnConflict = OnConflict.DO_UPDATE,
+    set_: Optional[Mapping[str, Any]] = None,
+) -> list[Any]:
+    """
+    Inserts the records with the same semantics as `insert_on_conflict`, returning the values
+    of the `returning` column for the inserted (or updated) rows, in no particular order.
+
+    On PostgreSQL, large batches are streamed via binary COPY into a temporary staging table
+    and then moved into the table by a single INSERT ... SELECT ... ON CONFLICT, which is
+    much faster than a multi-row INSERT. Otherwise, this falls back to `insert_on_conflict`.
+    """
+    if not records:
+        return []
+    dialect = SupportedSQLDialect(session.bind.dialect.name)
+    if dialect is not SupportedSQLDialect.POSTGRESQL or len(records) < MIN_RECORDS_TO_COPY:
+        if on_conflict is OnConflict.DO_UPDATE:
+            records = _dedup(records, unique_by)
+        values = []
+        for chunk in chunk_by_parameters(records, max(map(len, records))):
+            stmt = insert_on_conflict(
+                *chunk,
+                table=table,
+                dialect=dialect,
+                unique_by=unique_by,
+                on_conflict=on_conflict,
+                set_=set_,
+            ).returning(returning)
+            values.extend([v async for v in await session.stream_scalars(stmt)])
+        return values
+    if on_conflict is OnConflict.DO_UPDATE:
+        records = _dedup(records, unique_by)
+    # Records may omit different columns (e.g. the primary key), which would otherwise be
+    # copied as nulls instead of taking their defaults.
+    groups: dict[tuple[str, ...], list[Mapping[str, Any]]] = {}
+    for record in records:
+        groups.setdefault(tuple(record.keys()), []).append(record)
+    values: list[Any] = []
+    for keys, group in groups.items():
+        values.extend(
+            await _copy_on_conflict(
+                session,
+                keys,
+                group,
+                table=table,
+                unique_by=unique_by,
+                returning=returning,
+                on_conflict=on_conflict,
+                set_=set_,
+            )
+        )
+    return values
+
+
+_staging_table_ids = count()
+
+
+async def _copy_on_conflict(
+    session: AsyncSession,
+    keys: Sequence[str],
+    records: Sequence[Mapping[str, Any]],
+    *,
+    table: type[Base],
+    unique_by: Sequence[str],
+    returning: InstrumentedAttribute[Any],
+    on_conflict: OnConflict,
+    set_: Optional[Mapping[str, Any]],
+) -> list[Any]:
+    dialect = session.bind.dialect
+    columns = [inspect(table).columns[key] for key in keys]
+    bind_processors = [c.type.dialect_impl(dialect).bind_processor(dialect) for c in columns]
+    rows = [
+        tuple(
+            v if (process := bind_processors[i]) is None else process(v)
+            for i, v in enumerate(record[key] for key in keys)
+        )
+        for record in records
+    ]
+    preparer = dialect.identifier_preparer
+    staging_name = f"_copy_{table.__tablename__}_{next(_staging_table_ids)}"
+    # The DDL goes through the session so that the COPY below runs in its transaction.
+    await session.execute(
+        text(
+            f"CREATE TEMPORARY TABLE {preparer.quote(staging_name)} "
+            f"(LIKE {preparer.format_table(table.__table__)} INCLUDING DEFAULTS) "
+            "ON COMMIT DROP"
+        )
+    )
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        staging_name,
+        records=rows,
+        columns=[c.name for c in columns],
+    )
+    staging = table_clause(staging_name, *(column(c.name) for c in columns))
+    stmt = _on_conflict_postgresql(
+        insert_postgresql(table).from_select([c.name for c in columns], select(staging)),
+        table=table,
+        unique_by=unique_by,
+        on_conflict=on_conflict,
+        set_=set_,
+    ).returning(returning)
+    values = [v async for v in await session.stream_scalars(stmt)]
+    await session.execute(text(f"DROP TABLE {preparer.quote(staging_name)}"))
+    return values
+
+
+def _on_conflict_postgresql(
+    stmt: Any,
+    *,
+    table: type[Base],
+    unique_by: Sequence[str],
+    on_conflict: OnConflict,
+    set_: Optional[Mapping[str, Any]],
+) -> Insert:
+    constraint = "_".join(("uq", table.__tablename__, *unique_by))
+    if on_conflict is OnConflict.DO_NOTHING:
+        return stmt.on_conflict_do_nothing(constraint=constraint)  # type: ignore[no-any-return]
+    if on_conflict is OnConflict.DO_UPDATE:
+        return stmt.on_conflict_do_update(  # type: ignore[no-any-return]
+            constraint=constraint,
+            set_=set_ if set_ else dict(_clean(stmt.excluded.items())),
+        )
+    assert_never(on_conflict)
+
+
+def _dedup(
+    records: Sequence[Mapping[str, Any]],
+    unique_by: Sequence[str],
+) -> tuple[Mapping[str, Any], ...]:
+    # postegresql rejects duplicate updates for the same record
+    seen = set()
+    unique_records = []
+    for v in reversed(records):
+        if (k := tuple(v.get(name) for name in unique_by)) in seen:
+            continue
+        unique_records.append(v)
+        seen.add(k)
+    return tuple(reversed(unique_records))
+
+
 def _clean(
     kv: Iterable[tuple[str, KeyedColumnElement[Any]]],
 ) -> Iterator[tuple[str, KeyedColumnElement[Any]]]:
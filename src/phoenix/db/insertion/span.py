@@ -1,19 +1,40 @@
-from dataclasses import asdict
-from typing import NamedTuple, Optional, cast
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from hashlib import blake2b
+from typing import Any, NamedTuple, Optional, Union, cast
 
 from openinference.semconv.trace import SpanAttributes
-from sqlalchemy import func, insert, select, update
+from sqlalchemy import BigInteger, bindparam, case, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+from typing_extensions import assert_never
 
 from phoenix.db import models
-from phoenix.db.helpers import SupportedSQLDialect
-from phoenix.db.insertion.helpers import OnConflict, insert_on_conflict
+from phoenix.db.helpers import SupportedSQLDialect, dedup
+from phoenix.db.insertion.cache import CachedProjectSession, CachedTrace, RowIdCache
+from phoenix.db.insertion.helpers import (
+    OnConflict,
+    bulk_insert_on_conflict,
+    chunk_by_parameters,
+    insert_on_conflict,
+)
+from phoenix.db.rollups import RollupDeltas, get_span_latencies, get_span_rollups
 from phoenix.trace.attributes import get_attribute_value
 from phoenix.trace.schemas import Span, SpanStatusCode
 
 
 class SpanInsertionEvent(NamedTuple):
+    """
+    A newly inserted span. Besides the span's own start time, the start time of its trace
+    before the insertion is given if the trace already existed, because the insertion may
+    have moved the trace's start time or changed its latency.
+    """
+
     project_rowid: int
+    start_time: datetime
+    previous_trace_start_time: Optional[datetime] = None
 
 
 class ClearProjectSpansEvent(NamedTuple):
@@ -26,20 +47,29 @@ async def insert_span(
     project_name: str,
 ) -> Optional[SpanInsertionEvent]:
     dialect = SupportedSQLDialect(session.bind.dialect.name)
-    if (
-        project_rowid := await session.scalar(
-            select(models.Project.id).filter_by(name=project_name)
-        )
-    ) is None:
-        project_rowid = await session.scalar(
-            insert(models.Project).values(name=project_name).returning(models.Project.id)
+    await _lock_traces(session, dialect, (span.context.trace_id,))
+    project_rowid_stmt = select(models.Project.id).filter_by(name=project_name)
+    if (project_rowid := await session.scalar(project_rowid_stmt)) is None:
+        # Another writer may be creating the same project concurrently.
+        await session.execute(
+            insert_on_conflict(
+                dict(name=project_name),
+                dialect=dialect,
+                table=models.Project,
+                unique_by=("name",),
+                on_conflict=OnConflict.DO_NOTHING,
+            )
         )
+        project_rowid = await session.scalar(project_rowid_stmt)
     assert project_rowid is not None
 
     trace_id = span.context.trace_id
     trace: models.Trace = await session.scalar(
         select(models.Trace).filter_by(trace_id=trace_id)
     ) or models.Trace(trace_id=trace_id)
+    previous_trace_start_time = trace.start_time if trace.id is not None else None
+    previous_trace_end_time = trace.end_time if trace.id is not None else None
+    previous_trace_project_rowid = trace.project_rowid if trace.id is not None else None
 
     if trace.id is not None:
         # Trace record may need to be updated.
@@ -55,75 +85,64 @@ async def insert_span(
         trace.project_rowid = project_rowid
         session.add(trace)
 
-    session_id = get_attribute_value(span.attributes, SpanAttributes.SESSION_ID)
-    session_id = str(session_id).strip() if session_id is not None else ""
-    assert isinstance(session_id, str)
+    session_id = _session_id(span)
 
-    project_session: Optional[models.ProjectSession] = None
+    # ProjectSession records are shared by traces that other writers may be inserting
+    # concurrently, so their time bounds are only ever extended in place.
     if trace.project_session_rowid is not None:
-        # ProjectSession record already exists in database for this Trace record, so we fetch
-        # it because it may need to be updated. However, the session_id on the span, if exists,
-        # will be ignored at this point. Otherwise, if session_id is different, we will need
-        # to create a new ProjectSession record, as well as to determine whether the old record
+        # ProjectSession record already exists in database for this Trace record, and it
+        # may need to be updated. However, the session_id on the span, if exists, will be
+        # ignored at this point. Otherwise, if session_id is different, we will need to
+        # create a new ProjectSession record, as well as to determine whether the old record
         # needs to be deleted if this is the last Trace associated with it.
-        project_session = await session.scalar(
-            select(models.ProjectSession).filter_by(id=trace.project_session_rowid)
+        await session.execute(
+            update(models.ProjectSession)
+            .filter_by(id=trace.project_session_rowid)
+            .values(
+                _extend_time_bounds(
+                    dialect, models.ProjectSession, trace.start_time, trace.end_time
+                )
+            )
         )
     elif session_id:
-        project_session = await session.scalar(
-            select(models.ProjectSession).filter_by(session_id=session_id)
-        ) or models.ProjectSession(session_id=session_id)
-
-    if project_session is not None:
-        if project_session.id is None:
-            # ProjectSession record needs to be persisted for the first time.
-            project_session.start_time = trace.start_time
-            project_session.end_time = trace.end_time
-            project_session.project_id = project_rowid
-            session.add(project_session)
-            await session.flush()
-            assert project_session.id is not None
-            trace.project_session_rowid = project_session.id
-        else:
-            # ProjectSession record may need to be updated.
-            if trace.project_session_rowid is None:
-                trace.project_session_rowid = project_session.id
-            if trace.start_time < project_session.start_time:
-                project_session.start_time = trace.start_time
-            if project_session.end_time < trace.end_time:
-                project_session.end_time = trace.end_time
+        trace.project_session_rowid = await session.scalar(
+            insert_on_conflict(
+                dict(
+                    session_id=session_id,
+                    project_id=project_rowid,
+                    start_time=trace.start_time,
+                    end_time=trace.end_time,
+                ),
+                dialect=dialect,
+                table=models.ProjectSession,
+                unique_by=("session_id",),
+                set_=_extend_time_bounds(dialect, models.ProjectSession),
+            ).returning(models.ProjectSession.id)
+        )
 
     await session.flush()
     assert trace.id is not None
-    assert project_session is None or (
-        project_session.id is not None and project_session.id == trace.project_session_rowid
+    rollups = RollupDeltas()
+    await _add_trace_rollups(
+        session,
+        rollups,
+        [
+            _TraceBounds(
+                project_rowid=trace.project_rowid,
+                start_time=trace.start_time,
+                end_time=trace.end_time,
+                rowid=trace.id,
+                previous_start_time=previous_trace_start_time,
+                previous_end_time=previous_trace_end_time,
+                previous_project_rowid=previous_trace_project_rowid,
+            )
+        ],
     )
 
     cumulative_error_count = int(span.status_code is SpanStatusCode.ERROR)
-    try:
-        cumulative_llm_token_count_prompt = int(
-            get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_PROMPT) or 0
-        )
-    except BaseException:
-        cumulative_llm_token_count_prompt = 0
-    try:
-        cumulative_llm_token_count_completion = int(
-            get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_COMPLETION) or 0
-        )
-    except BaseException:
-        cumulative_llm_token_count_completion = 0
-    try:
-        llm_token_count_prompt = int(
-            get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_PROMPT) or 0
-        )
-    except BaseException:
-        llm_token_count_prompt = 0
-    try:
-        llm_token_count_completion = int(
-            get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_COMPLETION) or 0
-        )
-    except BaseException:
-        llm_token_count_completion = 0
+    llm_token_count_prompt, llm_token_count_completion = _llm_token_counts(span)
+    cumulative_llm_token_count_prompt = llm_token_count_prompt
+    cumulative_llm_token_count_completion = llm_token_count_completion
     if accumulation := (
         await session.execute(
             select(
@@ -136,12 +155,16 @@ async def insert_span(
         cumulative_error_count += cast(int, accumulation[0] or 0)
         cumulative_llm_token_count_prompt += cast(int, accumulation[1] or 0)
         cumulative_llm_token_count_completion += cast(int, accumulation[2] or 0)
+    is_root = span.parent_id is None or (
+        await session.scalar(select(models.Span.id).filter_by(span_id=span.parent_id)) is None
+    )
     span_rowid = await session.scalar(
         insert_on_conflict(
             dict(
                 span_id=span.context.span_id,
                 trace_rowid=trace.id,
                 parent_id=span.parent_id,
+                is_root=is_root,
                 span_kind=span.span_kind.value,
                 name=span.name,
                 start_time=span.start_time,
@@ -163,14 +186,662 @@ async def insert_span(
         ).returning(models.Span.id)
     )
     if span_rowid is None:
+        await rollups.apply(session)
         return None
+    await _demote_roots(session, (span.context.span_id,))
+    rollups.add_span(
+        trace.project_rowid,
+        span.start_time,
+        span.end_time,
+        error=span.status_code is SpanStatusCode.ERROR,
+        llm_token_count_prompt=llm_token_count_prompt,
+        llm_token_count_completion=llm_token_count_completion,
+    )
+    await rollups.apply(session)
     # Propagate cumulative values to ancestors. This is usually a no-op, since
     # the parent usually arrives after the child. But in the event that a
     # child arrives after its parent, we need to make sure that all the
     # ancestors' cumulative values are updated.
+    if span.parent_id is not None:
+        await _propagate_to_ancestors(
+            session,
+            span.parent_id,
+            cumulative_error_count,
+            cumulative_llm_token_count_prompt,
+            cumulative_llm_token_count_completion,
+        )
+    return SpanInsertionEvent(project_rowid, span.start_time, previous_trace_start_time)
+
+
+async def insert_spans(
+    session: AsyncSession,
+    *spans: tuple[Span, str],
+    cache: Optional[RowIdCache] = None,
+) -> list[SpanInsertionEvent]:
+    """
+    Set-based counterpart of `insert_span` for a batch of (span, project_name) pairs.
+
+    Projects, traces and project sessions are resolved with a handful of `IN (...)`
+    queries and upserted in bulk, and all spans are inserted with a single multi-row
+    INSERT. The outcome is the same as calling `insert_span` for each span in order.
+    Returns one event per span that was newly inserted.
+
+    If `cache` is given, it is consulted before querying projects, traces and project
+    sessions, and is updated with their latest values. Because the cache is written
+    before the transaction commits, the caller should clear it if the transaction fails.
+    """
+    spans = tuple(dedup(spans, lambda s: s[0].context.span_id))
+    if not spans:
+        return []
+    dialect = SupportedSQLDialect(session.bind.dialect.name)
+    await _lock_traces(session, dialect, {span.context.trace_id for span, _ in spans})
+    project_rowids = await _get_or_create_project_rowids(
+        session, dialect, {n for _, n in spans}, cache
+    )
+    traces = await _upsert_traces(session, dialect, spans, project_rowids, cache)
+    rollups = RollupDeltas()
+    await _add_trace_rollups(session, rollups, traces.values())
+
+    span_ids = [span.context.span_id for span, _ in spans]
+    existing_span_ids: set[str] = set()
+    for chunk in chunk_by_parameters(span_ids):
+        existing_span_ids.update(
+            await session.scalars(select(models.Span.span_id).where(models.Span.span_id.in_(chunk)))
+        )
+    new_spans = [s for s in spans if s[0].context.span_id not in existing_span_ids]
+    if not new_spans:
+        await rollups.apply(session)
+        return []
+    # Children that were persisted in earlier batches contribute to their parents'
+    # cumulative counts, same as the `SUM(...) WHERE parent_id = :span_id` in `insert_span`.
+    persisted: dict[str, _Counts] = {}
+    for chunk in chunk_by_parameters(s.context.span_id for s, _ in new_spans):
+        async for parent_id, errors, prompt, completion in await session.stream(
+            select(
+                models.Span.parent_id,
+                func.sum(models.Span.cumulative_error_count),
+                func.sum(models.Span.cumulative_llm_token_count_prompt),
+                func.sum(models.Span.cumulative_llm_token_count_completion),
+            )
+            .where(models.Span.parent_id.in_(chunk))
+            .group_by(models.Span.parent_id)
+        ):
+            persisted[parent_id] = _Counts(int(errors or 0), int(prompt or 0), int(completion or 0))
+    cumulative = _rollup((span for span, _ in new_spans), persisted)
+    batch_span_ids = {span.context.span_id for span, _ in new_spans}
+    # A span is a root if its parent is neither in the batch nor in the database.
+    parent_span_ids = {
+        parent_id
+        for span, _ in new_spans
+        if (parent_id := span.parent_id) is not None and parent_id not in batch_span_ids
+    }
+    persisted_parent_span_ids: set[str] = set()
+    for chunk in chunk_by_parameters(parent_span_ids):
+        persisted_parent_span_ids.update(
+            await session.scalars(select(models.Span.span_id).where(models.Span.span_id.in_(chunk)))
+        )
+    records = []
+    for span, _ in new_spans:
+        llm_token_count_prompt, llm_token_count_completion = _llm_token_counts(span)
+        counts = cumulative[span.context.span_id]
+        records.append(
+            dict(
+                span_id=span.context.span_id,
+                trace_rowid=traces[span.context.trace_id].rowid,
+                parent_id=span.parent_id,
+                is_root=span.parent_id is None
+                or (
+                    span.parent_id not in batch_span_ids
+                    and span.parent_id not in persisted_parent_span_ids
+                ),
+                span_kind=span.span_kind.value,
+                name=span.name,
+                start_time=span.start_time,
+                end_time=span.end_time,
+                attributes=span.attributes,
+                events=[asdict(event) for event in span.events],
+                status_code=span.status_code.value,
+                status_message=span.status_message,
+                cumulative_error_count=counts.errors,
+                cumulative_llm_token_count_prompt=counts.prompt,
+                cumulative_llm_token_count_completion=counts.completion,
+                llm_token_count_prompt=llm_token_count_prompt,
+                llm_token_count_completion=llm_token_count_completion,
+            )
+        )
+    inserted_span_ids = set(
+        await bulk_insert_on_conflict(
+            session,
+            *records,
+            table=models.Span,
+            unique_by=("span_id",),
+            returning=models.Span.span_id,
+            on_conflict=OnConflict.DO_NOTHING,
+        )
+    )
+    # Only the topmost spans of the batch, i.e. those whose parents are not in the
+    # batch, need to propagate their cumulative values, because they already include
+    # everything beneath them. Their contributions are aggregated per parent, so that
+    # each persisted ancestor receives a single update.
+    deltas: dict[str, _Counts] = {}
+    for span, _ in new_spans:
+        if (
+            (parent_id := span.parent_id) is None
+            or parent_id in batch_span_ids
+            or span.context.span_id not in inserted_span_ids
+        ):
+            continue
+        deltas[parent_id] = deltas.get(parent_id, _Counts()) + cumulative[span.context.span_id]
+    await _propagate_to_persisted_ancestors(session, deltas)
+    await _demote_roots(session, inserted_span_ids)
+    for span, _ in new_spans:
+        if span.context.span_id in inserted_span_ids:
+            llm_token_count_prompt, llm_token_count_completion = _llm_token_counts(span)
+            rollups.add_span(
+                traces[span.context.trace_id].project_rowid,
+                span.start_time,
+                span.end_time,
+                error=span.status_code is SpanStatusCode.ERROR,
+                llm_token_count_prompt=llm_token_count_prompt,
+                llm_token_count_completion=llm_token_count_completion,
+            )
+    await rollups.apply(session)
+    return [
+        SpanInsertionEvent(
+            project_rowids[project_name],
+            span.start_time,
+            traces[span.context.trace_id].previous_start_time,
+        )
+        for span, project_name in spans
+        if span.context.span_id in inserted_span_ids
+    ]
+
+
+@dataclass(frozen=True)
+class _Counts:
+    errors: int = 0
+    prompt: int = 0
+    completion: int = 0
+
+    def __add__(self, other: "_Counts") -> "_Counts":
+        return _Counts(
+            self.errors + other.errors,
+            self.prompt + other.prompt,
+            self.completion + other.completion,
+        )
+
+
+def _rollup(spans: Iterable[Span], persisted: Mapping[str, _Counts]) -> dict[str, _Counts]:
+    """
+    Computes the cumulative counts of each span from its own counts, the cumulative
+    counts of its persisted children, and the cumulative counts of its children in
+    `spans`. The parent/child graph is walked bottom-up in memory. Malformed traces whose
+    spans form a cycle, e.g. a span that is its own parent, are tolerated by ignoring the
+    edges that close the cycle.
+    """
+    own: dict[str, _Counts] = {}
+    children: dict[str, list[str]] = {}
+    for span in spans:
+        span_id = span.context.span_id
+        own[span_id] = _Counts(
+            int(span.status_code is SpanStatusCode.ERROR), *_llm_token_counts(span)
+        ) + persisted.get(span_id, _Counts())
+        if span.parent_id is not None and span.parent_id != span_id:
+            children.setdefault(span.parent_id, []).append(span_id)
+    cumulative: dict[str, _Counts] = {}
+    in_progress: set[str] = set()
+    for root in own:
+        if root in cumulative:
+            continue
+        # iterative post-order traversal, since agent traces can be very deep
+        stack = [(root, False)]
+        while stack:
+            span_id, expanded = stack.pop()
+            if span_id in cumulative:
+                continue
+            child_ids = [c for c in children.get(span_id, ()) if c in own]
+            if expanded:
+                in_progress.discard(span_id)
+                counts = own[span_id]
+                for child_id in child_ids:
+                    counts += cumulative.get(child_id, _Counts())
+                cumulative[span_id] = counts
+                continue
+            if span_id in in_progress:
+                continue
+            in_progress.add(span_id)
+            stack.append((span_id, True))
+            # children still in progress are ancestors of this span, i.e. back edges
+            stack.extend(
+                (c, False) for c in child_ids if c not in cumulative and c not in in_progress
+            )
+    return cumulative
+
+
+async def _propagate_to_persisted_ancestors(
+    session: AsyncSession,
+    deltas: Mapping[str, _Counts],
+) -> None:
+    """
+    Adds `deltas`, keyed by span_id, to the cumulative counts of those spans and of all
+    their ancestors, issuing a single UPDATE per affected ancestor.
+    """
+    if not deltas:
+        return
+    totals: dict[int, _Counts] = {}
+    for chunk in chunk_by_parameters(deltas):
+        ancestors = (
+            select(
+                models.Span.id,
+                models.Span.parent_id,
+                models.Span.span_id.label("origin"),
+            )
+            .where(models.Span.span_id.in_(chunk))
+            .cte(recursive=True)
+        )
+        child = ancestors.alias()
+        # UNION rather than UNION ALL, so that the recursion ends for spans in a cycle
+        ancestors = ancestors.union(
+            select(models.Span.id, models.Span.parent_id, child.c.origin).join(
+                child, models.Span.span_id == child.c.parent_id
+            )
+        )
+        async for id_, origin in await session.stream(select(ancestors.c.id, ancestors.c.origin)):
+            totals[id_] = totals.get(id_, _Counts()) + deltas[origin]
+    if not totals:
+        return
+    table = models.Span.__table__
+    await session.execute(
+        update(table)
+        .where(table.c.id == bindparam("_id"))
+        .values(
+            cumulative_error_count=table.c.cumulative_error_count + bindparam("_errors"),
+            cumulative_llm_token_count_prompt=table.c.cumulative_llm_token_count_prompt
+            + bindparam("_prompt"),
+            cumulative_llm_token_count_completion=table.c.cumulative_llm_token_count_completion
+            + bindparam("_completion"),
+        ),
+        [
+            dict(
+                _id=id_,
+                _errors=counts.errors,
+                _prompt=counts.prompt,
+                _completion=counts.completion,
+            )
+            for id_, counts in totals.items()
+        ],
+    )
+
+
+async def _demote_roots(session: AsyncSession, span_ids: Iterable[str]) -> None:
+    """
+    Spans persisted earlier whose parents are among `span_ids` are no longer roots, i.e.
+    when a parent arrives after its children.
+    """
+    for chunk in chunk_by_parameters(span_ids):
+        await session.execute(
+            update(models.Span)
+            .where(models.Span.parent_id.in_(chunk))
+            .where(models.Span.is_root)
+            .values(is_root=False)
+        )
+
+
+async def _get_or_create_project_rowids(
+    session: AsyncSession,
+    dialect: SupportedSQLDialect,
+    project_names: set[str],
+    cache: Optional[RowIdCache] = None,
+) -> dict[str, int]:
+    project_rowids: dict[str, int] = {}
+    if cache is not None:
+        for name in project_names:
+            if (id_ := cache.projects.get(name)) is not None:
+                project_rowids[name] = id_
+    if names := project_names.difference(project_rowids):
+        stmt = select(models.Project.name, models.Project.id).where(models.Project.name.in_(names))
+        project_rowids.update({name: id_ async for name, id_ in await session.stream(stmt)})
+        if missing := names.difference(project_rowids):
+            await session.execute(
+                insert_on_conflict(
+                    *(dict(name=name) for name in sorted(missing)),
+                    dialect=dialect,
+                    table=models.Project,
+                    unique_by=("name",),
+                    on_conflict=OnConflict.DO_NOTHING,
+                )
+            )
+            project_rowids.update({name: id_ async for name, id_ in await session.stream(stmt)})
+        if cache is not None:
+            for name in names:
+                cache.projects.set(name, project_rowids[name])
+    return project_rowids
+
+
+@dataclass
+class _TraceBounds:
+    project_rowid: int
+    start_time: datetime
+    end_time: datetime
+    project_session_rowid: Optional[int] = None
+    session_id: str = ""
+    session_project_rowid: Optional[int] = None
+    rowid: Optional[int] = None
+    changed: bool = False
+    previous_start_time: Optional[datetime] = None
+    """The start time of the trace before this batch, if the trace already existed."""
+    previous_end_time: Optional[datetime] = None
+    """The end time of the trace before this batch, if the trace already existed."""
+    previous_project_rowid: Optional[int] = None
+    """The project of the trace before this batch, if the trace already existed."""
+
+    def update(self, span: Span, project_rowid: int) -> None:
+        if self.end_time < span.end_time:
+            self.end_time = span.end_time
+            self.project_rowid = project_rowid
+            self.changed = True
+        if span.start_time < self.start_time:
+            self.start_time = span.start_time
+            self.changed = True
+
+
+async def _upsert_traces(
+    session: AsyncSession,
+    dialect: SupportedSQLDialect,
+    spans: Sequence[tuple[Span, str]],
+    project_rowids: Mapping[str, int],
+    cache: Optional[RowIdCache] = None,
+) -> dict[str, _TraceBounds]:
+    """
+    Creates or updates the traces (and their project sessions) referenced by `spans`,
+    and returns them by trace_id.
+    """
+    trace_ids = {span.context.trace_id for span, _ in spans}
+    traces: dict[str, _TraceBounds] = {}
+    # On PostgreSQL, other writers may have changed the traces since they were cached, so
+    # they are read from the database, under the advisory locks, in order for the rollups
+    # to move them out of the buckets they are actually in.
+    if cache is not None and dialect is SupportedSQLDialect.SQLITE:
+        for trace_id in trace_ids:
+            if (cached := cache.traces.get(trace_id)) is not None:
+                traces[trace_id] = _TraceBounds(
+                    project_rowid=cached.project_rowid,
+                    start_time=cached.start_time,
+                    end_time=cached.end_time,
+                    project_session_rowid=cached.project_session_rowid,
+                    rowid=cached.rowid,
+                    previous_start_time=cached.start_time,
+                    previous_end_time=cached.end_time,
+                    previous_project_rowid=cached.project_rowid,
+                )
+    for chunk in chunk_by_parameters(trace_ids.difference(traces)):
+        async for trace in await session.stream_scalars(
+            select(models.Trace).where(models.Trace.trace_id.in_(chunk))
+        ):
+            traces[trace.trace_id] = _TraceBounds(
+                project_rowid=trace.project_rowid,
+                start_time=trace.start_time,
+                end_time=trace.end_time,
+                project_session_rowid=trace.project_session_rowid,
+                rowid=trace.id,
+                previous_start_time=trace.start_time,
+                previous_end_time=trace.end_time,
+                previous_project_rowid=trace.project_rowid,
+            )
+    for span, project_name in spans:
+        project_rowid = project_rowids[project_name]
+        trace_id = span.context.trace_id
+        if (trace := traces.get(trace_id)) is None:
+            trace = traces[trace_id] = _TraceBounds(
+                project_rowid=project_rowid,
+                start_time=span.start_time,
+                end_time=span.end_time,
+            )
+        else:
+            trace.update(span, project_rowid)
+        # As in `insert_span`, the session_id on a span is ignored if the trace
+        # already belongs to a session.
+        if trace.project_session_rowid is None and not trace.session_id:
+            if session_id := _session_id(span):
+                trace.session_id = session_id
+                trace.session_project_rowid = project_rowid
+
+    project_sessions = await _upsert_project_sessions(session, dialect, traces.values(), cache)
+    for trace in traces.values():
+        if trace.session_id:
+            trace.project_session_rowid = project_sessions[trace.session_id]
+            trace.changed = True
+
+    # Other writers may have changed these traces since they were read (or cached), so
+    # they are upserted such that concurrent writes can only extend the bounds of a trace.
+    to_upsert = [
+        dict(
+            trace_id=trace_id,
+            project_rowid=trace.project_rowid,
+            start_time=trace.start_time,
+            end_time=trace.end_time,
+            project_session_rowid=trace.project_session_rowid,
+        )
+        for trace_id, trace in sorted(traces.items())
+        if trace.rowid is None or trace.changed
+    ]
+    table = models.Trace.__table__
+    excluded = table.alias("excluded")
+    for chunk in chunk_by_parameters(to_upsert, parameters_per_item=5):
+        async for trace_id, *values in await session.stream(
+            insert_on_conflict(
+                *chunk,
+                dialect=dialect,
+                table=models.Trace,
+                unique_by=("trace_id",),
+                set_=dict(
+                    project_rowid=case(
+                        (table.c.end_time < excluded.c.end_time, excluded.c.project_rowid),
+                        else_=table.c.project_rowid,
+                    ),
+                    project_session_rowid=func.coalesce(
+                        table.c.project_session_rowid, excluded.c.project_session_rowid
+                    ),
+                    **_extend_time_bounds(dialect, models.Trace),
+                ),
+            ).returning(
+                models.Trace.trace_id,
+                models.Trace.id,
+                models.Trace.project_rowid,
+                models.Trace.start_time,
+                models.Trace.end_time,
+                models.Trace.project_session_rowid,
+            )
+        ):
+            trace = traces[trace_id]
+            (
+                trace.rowid,
+                trace.project_rowid,
+                trace.start_time,
+                trace.end_time,
+                trace.project_session_rowid,
+            ) = values
+    if cache is not None:
+        for trace_id, trace in traces.items():
+            cache.traces.set(
+                trace_id,
+                CachedTrace(
+                    rowid=cast(int, trace.rowid),
+                    project_rowid=trace.project_rowid,
+                    start_time=trace.start_time,
+                    end_time=trace.end_time,
+                    project_session_rowid=trace.project_session_rowid,
+                ),
+            )
+    return traces
+
+
+async def _add_trace_rollups(
+    session: AsyncSession,
+    rollups: RollupDeltas,
+    traces: Iterable[_TraceBounds],
+) -> None:
+    """
+    Adds the new traces to `rollups`, and moves the existing ones whose start times,
+    latencies or projects have changed. The spans already persisted for a trace that has
+    changed projects are moved along with it, so this must be called before the new spans
+    are inserted.
+    """
+    moved: dict[int, tuple[int, int]] = {}
+    for trace in traces:
+        if (
+            trace.previous_start_time is None
+            or trace.previous_end_time is None
+            or trace.previous_project_rowid is None
+        ):
+            rollups.add_trace(trace.project_rowid, trace.start_time, trace.end_time)
+            continue
+        rollups.move_trace(
+            trace.previous_project_rowid,
+            trace.previous_start_time,
+            trace.previous_end_time,
+            trace.project_rowid,
+            trace.start_time,
+            trace.end_time,
+        )
+        if trace.previous_project_rowid != trace.project_rowid:
+            moved[cast(int, trace.rowid)] = (trace.previous_project_rowid, trace.project_rowid)
+    for chunk in chunk_by_parameters(moved):
+        async for trace_rowid, start_time, rollup in get_span_rollups(
+            session, models.Trace.id, models.Trace.id.in_(chunk)
+        ):
+            from_project_rowid, to_project_rowid = moved[trace_rowid]
+            rollups.add(from_project_rowid, start_time, -rollup)
+            rollups.add(to_project_rowid, start_time, rollup)
+        async for trace_rowid, start_time, latency_ms in get_span_latencies(
+            session, models.Trace.id, models.Trace.id.in_(chunk)
+        ):
+            from_project_rowid, to_project_rowid = moved[trace_rowid]
+            rollups.add_latency(from_project_rowid, start_time, "span", latency_ms, -1)
+            rollups.add_latency(to_project_rowid, start_time, "span", latency_ms)
+
+
+async def _upsert_project_sessions(
+    session: AsyncSession,
+    dialect: SupportedSQLDialect,
+    traces: Iterable[_TraceBounds],
+    cache: Optional[RowIdCache] = None,
+) -> dict[str, int]:
+    """
+    Creates the project sessions newly referenced by `traces`, extends the time bounds
+    of all the project sessions associated with `traces`, and returns the mapping of
+    session_id to project session rowid for the newly referenced ones.
+    """
+    traces = list(traces)
+    session_ids = {trace.session_id for trace in traces if trace.session_id}
+    session_rowids = {
+        trace.project_session_rowid for trace in traces if trace.project_session_rowid is not None
+    }
+    if not session_ids and not session_rowids:
+        return {}
+    existing: dict[int, CachedProjectSession] = {}
+    if cache is not None:
+        for session_id in session_ids:
+            if (rowid := cache.project_session_rowids.get(session_id)) is not None:
+                session_rowids.add(rowid)
+        for rowid in session_rowids:
+            if (cached := cache.project_sessions.get(rowid)) is not None:
+                existing[rowid] = cached
+        session_ids.difference_update(ps.session_id for ps in existing.values())
+        session_rowids.difference_update(existing)
+    for chunk in chunk_by_parameters([*session_ids, *session_rowids]):
+        async for project_session in await session.stream_scalars(
+            select(models.ProjectSession).where(
+                or_(
+                    models.ProjectSession.session_id.in_(
+                        [key for key in chunk if isinstance(key, str)]
+                    ),
+                    models.ProjectSession.id.in_([key for key in chunk if isinstance(key, int)]),
+                )
+            )
+        ):
+            existing[project_session.id] = CachedProjectSession(
+                rowid=project_session.id,
+                session_id=project_session.session_id,
+                project_rowid=project_session.project_id,
+                start_time=project_session.start_time,
+                end_time=project_session.end_time,
+            )
+    rowids_by_session_id = {ps.session_id: ps.rowid for ps in existing.values()}
+    bounds: dict[Union[int, str], tuple[datetime, datetime, int]] = {}
+    for trace in traces:
+        key: Union[int, str]
+        if trace.project_session_rowid is not None:
+            key = trace.project_session_rowid
+        elif trace.session_id:
+            key = rowids_by_session_id.get(trace.session_id, trace.session_id)
+        else:
+            continue
+        if (b := bounds.get(key)) is None:
+            project_rowid = trace.session_project_rowid or trace.project_rowid
+            bounds[key] = (trace.start_time, trace.end_time, project_rowid)
+        else:
+            bounds[key] = (min(b[0], trace.start_time), max(b[1], trace.end_time), b[2])
+    # The project sessions are upserted by session_id, so that concurrent writers neither
+    # duplicate a project session nor narrow its bounds.
+    to_upsert = []
+    for key, (start_time, end_time, project_rowid) in bounds.items():
+        if isinstance(key, str):
+            to_upsert.append(
+                dict(
+                    session_id=key,
+                    project_id=project_rowid,
+                    start_time=start_time,
+                    end_time=end_time,
+                )
+            )
+        elif (project_session := existing.get(key)) is not None and (
+            start_time < project_session.start_time or project_session.end_time < end_time
+        ):
+            to_upsert.append(
+                dict(
+                    session_id=project_session.session_id,
+                    project_id=project_session.project_rowid,
+                    start_time=start_time,
+                    end_time=end_time,
+                )
+            )
+    to_upsert.sort(key=lambda record: record["session_id"])
+    for chunk in chunk_by_parameters(to_upsert, parameters_per_item=4):
+        async for project_session in await session.stream(
+            insert_on_conflict(
+                *chunk,
+                dialect=dialect,
+                table=models.ProjectSession,
+                unique_by=("session_id",),
+                set_=_extend_time_bounds(dialect, models.ProjectSession),
+            ).returning(
+                models.ProjectSession.id,
+                models.ProjectSession.session_id,
+                models.ProjectSession.project_id,
+                models.ProjectSession.start_time,
+                models.ProjectSession.end_time,
+            )
+        ):
+            existing[project_session.id] = CachedProjectSession(*project_session)
+            rowids_by_session_id[project_session.session_id] = project_session.id
+    if cache is not None:
+        for rowid, project_session in existing.items():
+            cache.project_sessions.set(rowid, project_session)
+            cache.project_session_rowids.set(project_session.session_id, rowid)
+    return rowids_by_session_id
+
+
+async def _propagate_to_ancestors(
+    session: AsyncSession,
+    parent_id: str,
+    cumulative_error_count: int,
+    cumulative_llm_token_count_prompt: int,
+    cumulative_llm_token_count_completion: int,
+) -> None:
     ancestors = (
         select(models.Span.id, models.Span.parent_id)
-        .where(models.Span.span_id == span.parent_id)
+        .where(models.Span.span_id == parent_id)
         .cte(recursive=True)
     )
     child = ancestors.alias()
@@ -190,4 +861,90 @@ async def insert_span(
             + cumulative_llm_token_count_completion,
         )
     )
-    return SpanInsertionEvent(project_rowid)
+
+
+async def _lock_traces(
+    session: AsyncSession,
+    dialect: SupportedSQLDialect,
+    trace_ids: Iterable[str],
+) -> None:
+    """
+    On PostgreSQL, takes a transaction-level advisory lock on each trace, so that writers
+    sharing the database (e.g. several Phoenix replicas) insert the spans of any one trace
+    one transaction at a time. Otherwise, a parent and a child span inserted concurrently
+    could each miss the other when computing cumulative counts. The locks are taken in a
+    fixed order so that writers cannot deadlock on them.
+    """
+    if dialect is not SupportedSQLDialect.POSTGRESQL:
+        return
+    lock_keys = sorted({_lock_key(trace_id) for trace_id in trace_ids})
+    keys = func.unnest(bindparam("keys", lock_keys, ARRAY(BigInteger))).table_valued("key")
+    await session.execute(select(func.pg_advisory_xact_lock(keys.c.key)).select_from(keys))
+
+
+def _lock_key(trace_id: str) -> int:
+    return int.from_bytes(blake2b(trace_id.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+def _extend_time_bounds(
+    dialect: SupportedSQLDialect,
+    table: Union[type[models.Trace], type[models.ProjectSession]],
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+) -> dict[str, ColumnElement[Any]]:
+    """
+    Returns the SET clause that extends the time bounds of a row to cover the given ones,
+    or the ones of the conflicting row being inserted if not given.
+    """
+    excluded = table.__table__.alias("excluded")
+    return dict(
+        start_time=_least(
+            dialect,
+            table.start_time,
+            excluded.c.start_time
+            if start_time is None
+            else literal(start_time, table.start_time.type),
+        ),
+        end_time=_greatest(
+            dialect,
+            table.end_time,
+            excluded.c.end_time if end_time is None else literal(end_time, table.end_time.type),
+        ),
+    )
+
+
+def _least(dialect: SupportedSQLDialect, *values: Any) -> ColumnElement[Any]:
+    if dialect is SupportedSQLDialect.POSTGRESQL:
+        return func.least(*values)
+    if dialect is SupportedSQLDialect.SQLITE:
+        return func.min(*values)
+    assert_never(dialect)
+
+
+def _greatest(dialect: SupportedSQLDialect, *values: Any) -> ColumnElement[Any]:
+    if dialect is SupportedSQLDialect.POSTGRESQL:
+        return func.greatest(*values)
+    if dialect is SupportedSQLDialect.SQLITE:
+        return func.max(*values)
+    assert_never(dialect)
+
+
+def _session_id(span: Span) -> str:
+    session_id = get_attribute_value(span.attributes, SpanAttributes.SESSION_ID)
+    return str(session_id).strip() if session_id is not None else ""
+
+
+def _llm_token_counts(span: Span) -> tuple[int, int]:
+    try:
+        prompt = int(
+            get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_PROMPT) or 0
+        )
+    except BaseException:
+        prompt = 0
+    try:
+        completion = int(
+            get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_COMPLETION) or 0
+        )
+    except BaseException:
+        completion = 0
+    return prompt, completion
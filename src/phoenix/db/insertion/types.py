@@ -10,11 +10,10 @@ from datetime import datetime, timezone
 from typing import Any, Generic, Optional, Protocol, TypeVar, cast
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql.dml import Insert
 
 from phoenix.db import models
 from phoenix.db.insertion.constants import DEFAULT_RETRY_ALLOWANCE, DEFAULT_RETRY_DELAY_SEC
-from phoenix.db.insertion.helpers import insert_on_conflict
+from phoenix.db.insertion.helpers import bulk_insert_on_conflict
 from phoenix.server.dml_event import DmlEvent
 from phoenix.server.types import DbSessionFactory
 
@@ -104,12 +103,23 @@ class QueueInserter(ABC, Generic[_PrecursorT, _InsertableT, _RowT, _DmlEventT]):
             loop.call_later(self._retry_delay_sec, self._queue.extend, to_postpone)
         return events
 
-    def _insert_on_conflict(self, *records: Mapping[str, Any]) -> Insert:
-        return insert_on_conflict(
-            *records,
-            table=self.table,
-            unique_by=self.unique_by,
-            dialect=self._db.dialect,
+    async def _bulk_insert_on_conflict(
+        self,
+        session: AsyncSession,
+        *records: Mapping[str, Any],
+    ) -> tuple[int, ...]:
+        """
+        Upserts the records, using COPY for large batches on PostgreSQL, and returns the ids
+        of the affected rows.
+        """
+        return tuple(
+            await bulk_insert_on_conflict(
+                session,
+                *records,
+                table=self.table,
+                unique_by=self.unique_by,
+                returning=self.table.id,
+            )
         )
 
     @abstractmethod
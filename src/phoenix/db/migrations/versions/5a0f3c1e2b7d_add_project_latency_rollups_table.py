@@ -0,0 +1,118 @@
+"""add project_latency_rollups table
+
+Revision ID: 5a0f3c1e2b7d
+Revises: dbdce6192b44
+Create Date: 2026-10-18 14:03:27.518203
+
+"""
+
+import math
+from collections import defaultdict
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from typing import Any, Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import insert, select
+
+# revision identifiers, used by Alembic.
+revision: str = "5a0f3c1e2b7d"
+down_revision: Union[str, None] = "dbdce6192b44"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_traces = sa.table(
+    "traces",
+    sa.column("id", sa.Integer),
+    sa.column("project_rowid", sa.Integer),
+    sa.column("start_time", sa.TIMESTAMP(timezone=True)),
+    sa.column("end_time", sa.TIMESTAMP(timezone=True)),
+)
+_spans = sa.table(
+    "spans",
+    sa.column("trace_rowid", sa.Integer),
+    sa.column("start_time", sa.TIMESTAMP(timezone=True)),
+    sa.column("end_time", sa.TIMESTAMP(timezone=True)),
+)
+_project_latency_rollups = sa.table(
+    "project_latency_rollups",
+    sa.column("project_rowid", sa.Integer),
+    sa.column("bucket_start", sa.TIMESTAMP(timezone=True)),
+    sa.column("kind", sa.String),
+    sa.column("bin", sa.Integer),
+    sa.column("count", sa.Integer),
+)
+
+# Same bins as `phoenix.db.rollups.get_latency_bin` at the time of this migration.
+_GAMMA = (1 + 0.01) / (1 - 0.01)
+_MIN_LATENCY_MS = 1e-3
+_ZERO_BIN = math.ceil(math.log(_MIN_LATENCY_MS, _GAMMA)) - 1
+_BATCH_SIZE = 1000
+
+
+def _bin(start_time: datetime, end_time: datetime) -> int:
+    latency_ms = (end_time - start_time).total_seconds() * 1000
+    if latency_ms < _MIN_LATENCY_MS:
+        return _ZERO_BIN
+    return math.ceil(math.log(latency_ms, _GAMMA))
+
+
+def _bucket_start(time: datetime, naive: bool) -> datetime:
+    # SQLite returns the timestamps in UTC without a timezone, and they must be written
+    # back the same way.
+    if time.tzinfo is None:
+        time = time.replace(tzinfo=timezone.utc)
+    time = time.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    return time.replace(tzinfo=None) if naive else time
+
+
+def _batches(records: list[dict[str, Any]]) -> Iterator[list[dict[str, Any]]]:
+    for i in range(0, len(records), _BATCH_SIZE):
+        yield records[i : i + _BATCH_SIZE]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project_latency_rollups",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column(
+            "project_rowid",
+            sa.Integer,
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("bucket_start", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column(
+            "kind",
+            sa.String,
+            sa.CheckConstraint("kind IN ('span', 'trace')", name="valid_kind"),
+            nullable=False,
+        ),
+        sa.Column("bin", sa.Integer, nullable=False),
+        sa.Column("count", sa.Integer, nullable=False),
+        sa.UniqueConstraint("project_rowid", "bucket_start", "kind", "bin"),
+    )
+    conn = op.get_bind()
+    naive = conn.dialect.name == "sqlite"
+    counts: defaultdict[tuple[int, datetime, str, int], int] = defaultdict(int)
+    spans = select(_traces.c.project_rowid, _spans.c.start_time, _spans.c.end_time).join_from(
+        _traces, _spans, _traces.c.id == _spans.c.trace_rowid
+    )
+    for project_rowid, start_time, end_time in conn.execute(spans):
+        key = (project_rowid, _bucket_start(start_time, naive), "span", _bin(start_time, end_time))
+        counts[key] += 1
+    traces = select(_traces.c.project_rowid, _traces.c.start_time, _traces.c.end_time)
+    for project_rowid, start_time, end_time in conn.execute(traces):
+        key = (project_rowid, _bucket_start(start_time, naive), "trace", _bin(start_time, end_time))
+        counts[key] += 1
+    records = [
+        dict(project_rowid=project_rowid, bucket_start=start, kind=kind, bin=bin, count=count)
+        for (project_rowid, start, kind, bin), count in counts.items()
+    ]
+    for batch in _batches(records):
+        conn.execute(insert(_project_latency_rollups), batch)
+
+
+def downgrade() -> None:
+    op.drop_table("project_latency_rollups")
@@ -0,0 +1,54 @@
+"""add is_root column to spans table
+
+Revision ID: 8a3764fe7f1a
+Revises: 5a0f3c1e2b7d
+Create Date: 2026-10-18 16:41:09.302871
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import exists, select, update
+
+# revision identifiers, used by Alembic.
+revision: str = "8a3764fe7f1a"
+down_revision: Union[str, None] = "5a0f3c1e2b7d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_spans = sa.table(
+    "spans",
+    sa.column("span_id", sa.String),
+    sa.column("parent_id", sa.String),
+    sa.column("is_root", sa.Boolean),
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "spans",
+        sa.Column("is_root", sa.Boolean, nullable=False, server_default=sa.true()),
+    )
+    # A root span is any span whose parent span is missing in the database, even if its
+    # `parent_id` may not be NULL.
+    parent = _spans.alias("parent")
+    op.execute(
+        update(_spans)
+        .where(_spans.c.parent_id.is_not(None))
+        .where(exists(select(parent.c.span_id).where(parent.c.span_id == _spans.c.parent_id)))
+        .values(is_root=False)
+    )
+    op.create_index(
+        "ix_root_spans",
+        "spans",
+        ["trace_rowid", "start_time"],
+        postgresql_where=sa.text("is_root"),
+        sqlite_where=sa.text("is_root = 1"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_root_spans", table_name="spans")
+    op.drop_column("spans", "is_root")
@@ -0,0 +1,126 @@
+"""add project_rollups table
+
+Revision ID: dbdce6192b44
+Revises: bc8fea3c2bc8
+Create Date: 2026-10-18 09:12:41.305127
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import case, func, insert, literal_column, select, union_all
+
+# revision identifiers, used by Alembic.
+revision: str = "dbdce6192b44"
+down_revision: Union[str, None] = "bc8fea3c2bc8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_traces = sa.table(
+    "traces",
+    sa.column("id", sa.Integer),
+    sa.column("project_rowid", sa.Integer),
+    sa.column("start_time", sa.TIMESTAMP(timezone=True)),
+)
+_spans = sa.table(
+    "spans",
+    sa.column("trace_rowid", sa.Integer),
+    sa.column("start_time", sa.TIMESTAMP(timezone=True)),
+    sa.column("status_code", sa.String),
+    sa.column("llm_token_count_prompt", sa.Integer),
+    sa.column("llm_token_count_completion", sa.Integer),
+)
+_project_rollups = sa.table(
+    "project_rollups",
+    sa.column("project_rowid", sa.Integer),
+    sa.column("bucket_start", sa.TIMESTAMP(timezone=True)),
+    sa.column("span_count", sa.Integer),
+    sa.column("trace_count", sa.Integer),
+    sa.column("error_count", sa.Integer),
+    sa.column("llm_token_count_prompt", sa.Integer),
+    sa.column("llm_token_count_completion", sa.Integer),
+)
+_COUNTS = (
+    "span_count",
+    "trace_count",
+    "error_count",
+    "llm_token_count_prompt",
+    "llm_token_count_completion",
+)
+
+
+def _bucket_start(column: sa.ColumnElement[sa.DateTime]) -> sa.ColumnElement[sa.DateTime]:
+    # Truncates to the hour in UTC. On SQLite, the result is formatted the same way as the
+    # timestamps written by SQLAlchemy, so that it can be compared with them as text.
+    if op.get_bind().dialect.name == "postgresql":
+        utc = literal_column("'UTC'")
+        return func.timezone(
+            utc, func.date_trunc(literal_column("'hour'"), func.timezone(utc, column))
+        )
+    return func.strftime(literal_column("'%Y-%m-%d %H:00:00.000000'"), column)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project_rollups",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column(
+            "project_rowid",
+            sa.Integer,
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("bucket_start", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("span_count", sa.Integer, nullable=False),
+        sa.Column("trace_count", sa.Integer, nullable=False),
+        sa.Column("error_count", sa.Integer, nullable=False),
+        sa.Column("llm_token_count_prompt", sa.Integer, nullable=False),
+        sa.Column("llm_token_count_completion", sa.Integer, nullable=False),
+        sa.UniqueConstraint("project_rowid", "bucket_start"),
+    )
+    zero = literal_column("0")
+    span_bucket_start = _bucket_start(_spans.c.start_time)
+    spans = (
+        select(
+            _traces.c.project_rowid,
+            span_bucket_start.label("bucket_start"),
+            func.count().label("span_count"),
+            zero.label("trace_count"),
+            func.sum(case((_spans.c.status_code == "ERROR", 1), else_=0)).label("error_count"),
+            func.sum(func.coalesce(_spans.c.llm_token_count_prompt, 0)).label(
+                "llm_token_count_prompt"
+            ),
+            func.sum(func.coalesce(_spans.c.llm_token_count_completion, 0)).label(
+                "llm_token_count_completion"
+            ),
+        )
+        .join_from(_traces, _spans, _traces.c.id == _spans.c.trace_rowid)
+        .group_by(_traces.c.project_rowid, span_bucket_start)
+    )
+    trace_bucket_start = _bucket_start(_traces.c.start_time)
+    traces = select(
+        _traces.c.project_rowid,
+        trace_bucket_start.label("bucket_start"),
+        zero.label("span_count"),
+        func.count().label("trace_count"),
+        zero.label("error_count"),
+        zero.label("llm_token_count_prompt"),
+        zero.label("llm_token_count_completion"),
+    ).group_by(_traces.c.project_rowid, trace_bucket_start)
+    buckets = union_all(spans, traces).subquery()
+    op.execute(
+        insert(_project_rollups).from_select(
+            ["project_rowid", "bucket_start", *_COUNTS],
+            select(
+                buckets.c.project_rowid,
+                buckets.c.bucket_start,
+                *(func.sum(buckets.c[name]) for name in _COUNTS),
+            ).group_by(buckets.c.project_rowid, buckets.c.bucket_start),
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("project_rollups")
@@ -455,6 +455,12 @@ class Trace(Base):
     )
 
 
+def _is_root(context: Any) -> bool:
+    # Spans inserted without `is_root` are assumed to be roots when they have no parent_id.
+    # The span insertion functions instead check whether the parent has been persisted.
+    return context.get_current_parameters().get("parent_id") is None
+
+
 class Span(Base):
     __tablename__ = "spans"
     trace_rowid: Mapped[int] = mapped_column(
@@ -463,6 +469,11 @@ class Span(Base):
     )
     span_id: Mapped[str] = mapped_column(index=True)
     parent_id: Mapped[Optional[str]] = mapped_column(index=True)
+    is_root: Mapped[bool] = mapped_column(default=_is_root)
+    """
+    Whether the span's parent is missing in the database, even if its `parent_id` may not
+    be NULL. It is maintained by the span insertion functions as parents arrive.
+    """
     name: Mapped[str]
     span_kind: Mapped[str]
     start_time: Mapped[datetime] = mapped_column(UtcTimeStamp, index=True)
@@ -615,6 +626,69 @@ class Span(Base):
             "ix_cumulative_llm_token_count_total",
             text("(cumulative_llm_token_count_prompt + cumulative_llm_token_count_completion)"),
         ),
+        Index(
+            "ix_root_spans",
+            "trace_rowid",
+            "start_time",
+            postgresql_where=text("is_root"),
+            sqlite_where=text("is_root = 1"),
+        ),
+    )
+
+
+class ProjectRollup(Base):
+    """
+    Aggregates of the spans and traces of a project that start within an hour, i.e. the
+    bucket, maintained incrementally as spans are inserted and traces are deleted (see
+    `phoenix.db.rollups`).
+    """
+
+    __tablename__ = "project_rollups"
+    project_rowid: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    bucket_start: Mapped[datetime] = mapped_column(UtcTimeStamp, nullable=False)
+    span_count: Mapped[int] = mapped_column(nullable=False)
+    trace_count: Mapped[int] = mapped_column(nullable=False)
+    error_count: Mapped[int] = mapped_column(nullable=False)
+    llm_token_count_prompt: Mapped[int] = mapped_column(nullable=False)
+    llm_token_count_completion: Mapped[int] = mapped_column(nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "project_rowid",
+            "bucket_start",
+        ),
+    )
+
+
+class ProjectLatencyRollup(Base):
+    """
+    The number of spans or traces of a project that start within an hour, i.e. the bucket,
+    whose latencies fall into a bin of a mergeable latency sketch (see `phoenix.db.rollups`).
+    """
+
+    __tablename__ = "project_latency_rollups"
+    project_rowid: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    bucket_start: Mapped[datetime] = mapped_column(UtcTimeStamp, nullable=False)
+    kind: Mapped[str] = mapped_column(
+        CheckConstraint("kind IN ('span', 'trace')", name="valid_kind"),
+        nullable=False,
+    )
+    bin: Mapped[int] = mapped_column(nullable=False)
+    count: Mapped[int] = mapped_column(nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "project_rowid",
+            "bucket_start",
+            "kind",
+            "bin",
+        ),
     )
 
 
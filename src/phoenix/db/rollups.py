@@ -0,0 +1,419 @@
+"""
+Hourly rollups of the spans and traces of each project, i.e. `models.ProjectRollup`, from
+which project metrics over time ranges aligned to the hour are computed without scanning
+the spans and traces themselves.
+
+The rollups are kept in sync by the writers, in the same transactions as their changes to
+the spans and traces. Span insertion adds the new spans and traces, and moves the existing
+traces whose start times or projects change, and trace deletion subtracts the traces before
+deleting them. A trace is counted in the bucket of its start time, and a span in the bucket
+of its own start time, under the project of its trace.
+
+The latencies of the spans and traces in each bucket are kept as a `LatencySketch`, i.e. the
+number of latencies in each of its bins, in `models.ProjectLatencyRollup`. Sketches are merged
+by adding up the counts of their bins, so the sketch of any range of buckets is obtained with
+a `GROUP BY` on the bins, from which approximate latency quantiles are computed.
+"""
+
+import math
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterator, Mapping
+from dataclasses import astuple, dataclass, fields
+from datetime import datetime
+from typing import Literal, Optional, cast
+
+from sqlalchemy import case, delete, func, literal_column, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+from typing_extensions import TypeAlias, assert_never
+
+from phoenix.datetime_utils import normalize_datetime
+from phoenix.db import models
+from phoenix.db.helpers import SupportedSQLDialect
+from phoenix.db.insertion.helpers import chunk_by_parameters, insert_on_conflict
+
+LatencyKind: TypeAlias = Literal["span", "trace"]
+
+RELATIVE_ACCURACY = 0.01
+"""
+The relative error of the quantiles computed from a `LatencySketch`, with respect to the
+latencies of the order statistics they approximate.
+"""
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_MIN_LATENCY_MS = 1e-3
+_ZERO_BIN = math.ceil(math.log(_MIN_LATENCY_MS, _GAMMA)) - 1
+
+
+def get_latency_ms(start_time: datetime, end_time: datetime) -> float:
+    return (end_time - start_time).total_seconds() * 1000
+
+
+def get_latency_bin(latency_ms: float) -> int:
+    """
+    Returns the bin of a `LatencySketch` containing `latency_ms`. Bin `i` contains the
+    latencies in `(gamma**(i-1), gamma**i]`, except that latencies under a microsecond,
+    including negative ones, are all put in a bin of their own, whose latency is zero.
+    """
+    if latency_ms < _MIN_LATENCY_MS:
+        return _ZERO_BIN
+    return math.ceil(math.log(latency_ms, _GAMMA))
+
+
+def get_latency_bin_value(bin: int) -> float:
+    """
+    Returns the latency representing the bin, which is within `RELATIVE_ACCURACY` of every
+    latency in the bin.
+    """
+    if bin <= _ZERO_BIN:
+        return 0.0
+    return 2 * _GAMMA**bin / (_GAMMA + 1)
+
+
+class LatencySketch:
+    """
+    A DDSketch-style summary of latencies, i.e. the number of latencies in each of a fixed
+    set of logarithmically sized bins, which can be merged with other sketches and from which
+    quantiles are computed with a relative error of at most `RELATIVE_ACCURACY`.
+    """
+
+    def __init__(self, bins: Optional[Mapping[int, int]] = None) -> None:
+        self._bins: defaultdict[int, int] = defaultdict(int)
+        if bins:
+            self._bins.update(bins)
+
+    @property
+    def count(self) -> int:
+        return sum(self._bins.values())
+
+    @property
+    def bins(self) -> dict[int, int]:
+        return {bin: count for bin, count in self._bins.items() if count}
+
+    def add(self, latency_ms: float, count: int = 1) -> None:
+        self._bins[get_latency_bin(latency_ms)] += count
+
+    def merge(self, other: "LatencySketch") -> None:
+        for bin, count in other._bins.items():
+            self._bins[bin] += count
+
+    def quantile(self, probability: float) -> Optional[float]:
+        """
+        Returns the quantile interpolated between the closest order statistics, same as
+        `percentile_cont`, or None if the sketch is empty.
+        """
+        bins = sorted((bin, count) for bin, count in self._bins.items() if count > 0)
+        if not (n := sum(count for _, count in bins)):
+            return None
+        rank = min(max(probability, 0.0), 1.0) * (n - 1)
+        lower, upper = math.floor(rank), math.ceil(rank)
+        values: dict[int, float] = {}
+        cumulative = 0
+        for bin, count in bins:
+            cumulative += count
+            for order in (lower, upper):
+                if order not in values and order < cumulative:
+                    values[order] = get_latency_bin_value(bin)
+            if upper in values:
+                break
+        return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+
+def get_bucket_start(time: datetime) -> datetime:
+    """
+    Returns the start of the bucket containing `time`, in UTC.
+    """
+    return cast(datetime, normalize_datetime(time)).replace(minute=0, second=0, microsecond=0)
+
+
+def is_aligned(*times: Optional[datetime]) -> bool:
+    """
+    Whether each of `times` is either missing, i.e. unbounded, or a bucket boundary, so that
+    the rollups cover exactly the time range between them.
+    """
+    return all(t is None or get_bucket_start(t) == normalize_datetime(t) for t in times)
+
+
+def bucket_start(
+    dialect: SupportedSQLDialect,
+    column: ColumnElement[datetime],
+) -> ColumnElement[datetime]:
+    """
+    Returns the SQL expression for the start of the bucket containing the time in `column`,
+    in UTC, i.e. the counterpart of `get_bucket_start`.
+    """
+    if dialect is SupportedSQLDialect.POSTGRESQL:
+        utc = literal_column("'UTC'")
+        expr = func.timezone(
+            utc, func.date_trunc(literal_column("'hour'"), func.timezone(utc, column))
+        )
+    elif dialect is SupportedSQLDialect.SQLITE:
+        expr = func.strftime(literal_column("'%Y-%m-%d %H:00:00'"), column)
+    else:
+        assert_never(dialect)
+    return type_coerce(expr, models.UtcTimeStamp)
+
+
+@dataclass(frozen=True)
+class Rollup:
+    span_count: int = 0
+    trace_count: int = 0
+    error_count: int = 0
+    llm_token_count_prompt: int = 0
+    llm_token_count_completion: int = 0
+
+    def __add__(self, other: "Rollup") -> "Rollup":
+        return Rollup(*(a + b for a, b in zip(astuple(self), astuple(other))))
+
+    def __neg__(self) -> "Rollup":
+        return Rollup(*(-a for a in astuple(self)))
+
+    def __bool__(self) -> bool:
+        return any(astuple(self))
+
+
+_COLUMNS = tuple(f.name for f in fields(Rollup))
+
+
+class RollupDeltas:
+    """
+    Changes to the rollups, accumulated by project and bucket, and then added to the rows
+    of the buckets in the database, which are created as needed.
+    """
+
+    def __init__(self) -> None:
+        self._deltas: defaultdict[tuple[int, datetime], Rollup] = defaultdict(Rollup)
+        self._latencies: defaultdict[tuple[int, datetime, LatencyKind, int], int] = defaultdict(int)
+
+    def __iter__(self) -> Iterator[tuple[int, datetime, Rollup]]:
+        for (project_rowid, start), rollup in sorted(self._deltas.items()):
+            if rollup:
+                yield project_rowid, start, rollup
+
+    def add(self, project_rowid: int, start_time: datetime, rollup: Rollup) -> None:
+        key = (project_rowid, get_bucket_start(start_time))
+        self._deltas[key] = self._deltas[key] + rollup
+
+    def add_latency(
+        self,
+        project_rowid: int,
+        start_time: datetime,
+        kind: LatencyKind,
+        latency_ms: float,
+        count: int = 1,
+    ) -> None:
+        key = (project_rowid, get_bucket_start(start_time), kind, get_latency_bin(latency_ms))
+        self._latencies[key] += count
+
+    def add_span(
+        self,
+        project_rowid: int,
+        start_time: datetime,
+        end_time: datetime,
+        *,
+        error: bool,
+        llm_token_count_prompt: Optional[int],
+        llm_token_count_completion: Optional[int],
+    ) -> None:
+        self.add_latency(project_rowid, start_time, "span", get_latency_ms(start_time, end_time))
+        self.add(
+            project_rowid,
+            start_time,
+            Rollup(
+                span_count=1,
+                error_count=int(error),
+                llm_token_count_prompt=llm_token_count_prompt or 0,
+                llm_token_count_completion=llm_token_count_completion or 0,
+            ),
+        )
+
+    def add_trace(self, project_rowid: int, start_time: datetime, end_time: datetime) -> None:
+        self.add_latency(project_rowid, start_time, "trace", get_latency_ms(start_time, end_time))
+        self.add(project_rowid, start_time, Rollup(trace_count=1))
+
+    def move_trace(
+        self,
+        from_project_rowid: int,
+        from_start_time: datetime,
+        from_end_time: datetime,
+        to_project_rowid: int,
+        to_start_time: datetime,
+        to_end_time: datetime,
+    ) -> None:
+        self.add_latency(
+            from_project_rowid,
+            from_start_time,
+            "trace",
+            get_latency_ms(from_start_time, from_end_time),
+            -1,
+        )
+        self.add(from_project_rowid, from_start_time, Rollup(trace_count=-1))
+        self.add_trace(to_project_rowid, to_start_time, to_end_time)
+
+    async def apply(self, session: AsyncSession) -> None:
+        deltas = list(self)
+        self._deltas.clear()
+        latencies = sorted((key, count) for key, count in self._latencies.items() if count)
+        self._latencies.clear()
+        dialect = SupportedSQLDialect(session.bind.dialect.name)
+        if latencies:
+            await _apply_latencies(session, dialect, latencies)
+        if not deltas:
+            return
+        records = [
+            dict(zip(_COLUMNS, astuple(rollup)), project_rowid=project_rowid, bucket_start=start)
+            for project_rowid, start, rollup in deltas
+        ]
+        excluded = models.ProjectRollup.__table__.alias("excluded")
+        set_ = {c: getattr(models.ProjectRollup, c) + excluded.c[c] for c in _COLUMNS}
+        for chunk in chunk_by_parameters(records, parameters_per_item=2 + len(_COLUMNS)):
+            await session.execute(
+                insert_on_conflict(
+                    *chunk,
+                    dialect=dialect,
+                    table=models.ProjectRollup,
+                    unique_by=("project_rowid", "bucket_start"),
+                    set_=set_,
+                )
+            )
+        if any(value < 0 for _, _, rollup in deltas for value in astuple(rollup)):
+            # Buckets emptied by subtraction are removed.
+            await session.execute(
+                delete(models.ProjectRollup)
+                .where(models.ProjectRollup.project_rowid.in_({p for p, _, _ in deltas}))
+                .where(models.ProjectRollup.span_count == 0)
+                .where(models.ProjectRollup.trace_count == 0)
+            )
+
+
+async def _apply_latencies(
+    session: AsyncSession,
+    dialect: SupportedSQLDialect,
+    latencies: list[tuple[tuple[int, datetime, LatencyKind, int], int]],
+) -> None:
+    records = [
+        dict(project_rowid=project_rowid, bucket_start=start, kind=kind, bin=bin, count=count)
+        for (project_rowid, start, kind, bin), count in latencies
+    ]
+    count_column = models.ProjectLatencyRollup.count
+    excluded = models.ProjectLatencyRollup.__table__.alias("excluded")
+    for chunk in chunk_by_parameters(records, parameters_per_item=5):
+        await session.execute(
+            insert_on_conflict(
+                *chunk,
+                dialect=dialect,
+                table=models.ProjectLatencyRollup,
+                unique_by=("project_rowid", "bucket_start", "kind", "bin"),
+                set_=dict(count=count_column + excluded.c.count),
+            )
+        )
+    if any(count < 0 for _, count in latencies):
+        # Bins emptied by subtraction are removed.
+        await session.execute(
+            delete(models.ProjectLatencyRollup)
+            .where(models.ProjectLatencyRollup.project_rowid.in_({key[0] for key, _ in latencies}))
+            .where(count_column == 0)
+        )
+
+
+async def get_span_rollups(
+    session: AsyncSession,
+    key: ColumnElement[int],
+    *whereclause: ColumnElement[bool],
+) -> AsyncIterator[tuple[int, datetime, Rollup]]:
+    """
+    Aggregates the spans matching `whereclause`, which may refer to their traces, by `key`,
+    e.g. the project or trace row id, and bucket.
+    """
+    dialect = SupportedSQLDialect(session.bind.dialect.name)
+    start = bucket_start(dialect, models.Span.start_time).label("bucket_start")
+    stmt = (
+        select(
+            key,
+            start,
+            func.count(),
+            func.sum(case((models.Span.status_code == "ERROR", 1), else_=0)),
+            func.sum(func.coalesce(models.Span.llm_token_count_prompt, 0)),
+            func.sum(func.coalesce(models.Span.llm_token_count_completion, 0)),
+        )
+        .join_from(models.Trace, models.Span)
+        .where(*whereclause)
+        .group_by(key, start)
+    )
+    async for key_, start_time, count, errors, prompt, completion in await session.stream(stmt):
+        yield (
+            key_,
+            start_time,
+            Rollup(
+                span_count=count,
+                error_count=int(errors or 0),
+                llm_token_count_prompt=int(prompt or 0),
+                llm_token_count_completion=int(completion or 0),
+            ),
+        )
+
+
+async def get_span_latencies(
+    session: AsyncSession,
+    key: ColumnElement[int],
+    *whereclause: ColumnElement[bool],
+) -> AsyncIterator[tuple[int, datetime, float]]:
+    """
+    Yields `key` along with the start time and latency of each span matching `whereclause`.
+    The latencies are computed in Python, same as when the spans are added to the rollups,
+    so that they fall into the same bins when subtracted.
+    """
+    stmt = (
+        select(key, models.Span.start_time, models.Span.end_time)
+        .join_from(models.Trace, models.Span)
+        .where(*whereclause)
+    )
+    async for key_, start_time, end_time in await session.stream(stmt):
+        yield key_, start_time, get_latency_ms(start_time, end_time)
+
+
+async def subtract_traces(session: AsyncSession, *whereclause: ColumnElement[bool]) -> None:
+    """
+    Subtracts the traces matching `whereclause`, along with their spans, from the rollups.
+    This must be called before the traces are deleted, in the same transaction.
+    """
+    dialect = SupportedSQLDialect(session.bind.dialect.name)
+    deltas = RollupDeltas()
+    pid = models.Trace.project_rowid
+    async for project_rowid, start_time, rollup in get_span_rollups(session, pid, *whereclause):
+        deltas.add(project_rowid, start_time, -rollup)
+    start = bucket_start(dialect, models.Trace.start_time).label("bucket_start")
+    async for project_rowid, start_time, count in await session.stream(
+        select(pid, start, func.count()).where(*whereclause).group_by(pid, start)
+    ):
+        deltas.add(project_rowid, start_time, Rollup(trace_count=-count))
+    async for project_rowid, start_time, latency_ms in get_span_latencies(
+        session, pid, *whereclause
+    ):
+        deltas.add_latency(project_rowid, start_time, "span", latency_ms, -1)
+    async for project_rowid, start_time, end_time in await session.stream(
+        select(pid, models.Trace.start_time, models.Trace.end_time).where(*whereclause)
+    ):
+        deltas.add_latency(
+            project_rowid, start_time, "trace", get_latency_ms(start_time, end_time), -1
+        )
+    await deltas.apply(session)
+
+
+async def add_new_traces(session: AsyncSession, *spans: models.Span) -> None:
+    """
+    Adds spans persisted other than by span insertion, e.g. by the playground, along with
+    their traces, which must have been created together with them.
+    """
+    deltas = RollupDeltas()
+    for trace in {id(span.trace): span.trace for span in spans}.values():
+        deltas.add_trace(trace.project_rowid, trace.start_time, trace.end_time)
+    for span in spans:
+        deltas.add_span(
+            span.trace.project_rowid,
+            span.start_time,
+            span.end_time,
+            error=span.status_code == "ERROR",
+            llm_token_count_prompt=span.llm_token_count_prompt,
+            llm_token_count_completion=span.llm_token_count_completion,
+        )
+    await deltas.apply(session)
@@ -1,4 +1,4 @@
-from dataclasses import dataclass, field
+from dataclasses import InitVar, dataclass, field
 
 from .annotation_summaries import AnnotationSummaryCache, AnnotationSummaryDataLoader
 from .average_experiment_run_latency import AverageExperimentRunLatencyDataLoader
@@ -81,21 +81,21 @@ __all__ = [
 
 @dataclass(frozen=True)
 class CacheForDataLoaders:
-    document_evaluation_summary: DocumentEvaluationSummaryCache = field(
-        default_factory=DocumentEvaluationSummaryCache,
-    )
-    annotation_summary: AnnotationSummaryCache = field(
-        default_factory=AnnotationSummaryCache,
-    )
-    latency_ms_quantile: LatencyMsQuantileCache = field(
-        default_factory=LatencyMsQuantileCache,
-    )
-    min_start_or_max_end_time: MinStartOrMaxEndTimeCache = field(
-        default_factory=MinStartOrMaxEndTimeCache,
-    )
-    record_count: RecordCountCache = field(
-        default_factory=RecordCountCache,
-    )
-    token_count: TokenCountCache = field(
-        default_factory=TokenCountCache,
-    )
+    enable_prometheus: InitVar[bool] = False
+    document_evaluation_summary: DocumentEvaluationSummaryCache = field(init=False)
+    annotation_summary: AnnotationSummaryCache = field(init=False)
+    latency_ms_quantile: LatencyMsQuantileCache = field(init=False)
+    min_start_or_max_end_time: MinStartOrMaxEndTimeCache = field(init=False)
+    record_count: RecordCountCache = field(init=False)
+    token_count: TokenCountCache = field(init=False)
+
+    def __post_init__(self, enable_prometheus: bool) -> None:
+        for name, cache_factory in (
+            ("document_evaluation_summary", DocumentEvaluationSummaryCache),
+            ("annotation_summary", AnnotationSummaryCache),
+            ("latency_ms_quantile", LatencyMsQuantileCache),
+            ("min_start_or_max_end_time", MinStartOrMaxEndTimeCache),
+            ("record_count", RecordCountCache),
+            ("token_count", TokenCountCache),
+        ):
+            object.__setattr__(self, name, cache_factory(enable_prometheus=enable_prometheus))
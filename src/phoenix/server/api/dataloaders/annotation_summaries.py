@@ -46,8 +46,10 @@ _SubKey: TypeAlias = tuple[TimeInterval, FilterCondition]
 class AnnotationSummaryCache(
     TwoTierCache[Key, Result, _Section, _SubKey],
 ):
-    def __init__(self) -> None:
+    def __init__(self, enable_prometheus: bool = False) -> None:
         super().__init__(
+            name="annotation_summary",
+            enable_prometheus=enable_prometheus,
             # TTL=3600 (1-hour) because time intervals are always moving forward, but
             # interval endpoints are rounded down to the hour by the UI, so anything
             # older than an hour most likely won't be a cache-hit anyway.
@@ -89,7 +91,7 @@ class AnnotationSummaryDataLoader(DataLoader[Key, Result]):
             arguments[segment][param].append(position)
         for segment, params in arguments.items():
             stmt = _get_stmt(segment, *params.keys())
-            async with self._db() as session:
+            async with self._db.read() as session:
                 data = await session.stream(stmt)
                 async for annotation_name, group in groupby(data, lambda row: row.name):
                     summary = AnnotationSummary(pd.DataFrame(group))
@@ -5,15 +5,23 @@ but we need to invalidate subsets of keys, e.g. all those associated with a
 specific project, very frequently (i.e. essentially at each span insertion). In a
 single-tier system we would need to check all the keys to see if they are in the
 subset that we want to invalidate.
+
+Within a section, the entries whose sub keys cover a time interval can be invalidated
+selectively, e.g. only those overlapping the start times of newly inserted spans, so
+that the cached results for the other time intervals of the project remain valid.
 """
 
 from abc import ABC, abstractmethod
 from asyncio import Future
 from collections.abc import Callable
-from typing import Any, Generic, Optional, TypeVar
+from datetime import datetime
+from typing import Any, Generic, Literal, Optional, TypeVar
 
 from cachetools import Cache
 from strawberry.dataloader import AbstractCache
+from typing_extensions import TypeAlias
+
+from phoenix.datetime_utils import normalize_datetime
 
 _Key = TypeVar("_Key")
 _Result = TypeVar("_Result")
@@ -21,6 +29,9 @@ _Result = TypeVar("_Result")
 _Section = TypeVar("_Section")
 _SubKey = TypeVar("_SubKey")
 
+TimeInterval: TypeAlias = tuple[Optional[datetime], Optional[datetime]]
+EvictionReason: TypeAlias = Literal["capacity", "invalidation"]
+
 
 class TwoTierCache(
     AbstractCache[_Key, _Result],
@@ -32,29 +43,83 @@ class TwoTierCache(
         main_cache: "Cache[_Section, Cache[_SubKey, Future[_Result]]]",
         sub_cache_factory: Callable[[], "Cache[_SubKey, Future[_Result]]"],
         *args: Any,
+        name: str,
+        enable_prometheus: bool = False,
         **kwargs: Any,
     ) -> None:
+        """
+        :param main_cache: The cache of sub caches by section.
+        :param sub_cache_factory: Creates the sub cache of a section.
+        :param name: The name of the cache, used as the label of its metrics.
+        :param enable_prometheus: Whether Prometheus is enabled.
+        """
         super().__init__(*args, **kwargs)
         self._cache = main_cache
         self._sub_cache_factory = sub_cache_factory
+        self._name = name
+        self._enable_prometheus = enable_prometheus
 
     @abstractmethod
     def _cache_key(self, key: _Key) -> tuple[_Section, _SubKey]: ...
 
-    def invalidate(self, section: _Section) -> None:
-        if sub_cache := self._cache.get(section):
+    def _interval(self, sub_key: _SubKey) -> Optional[TimeInterval]:
+        """
+        Returns the time interval, if any, that the results at `sub_key` are computed
+        over, so that they can be invalidated selectively by `invalidate`.
+        """
+        return None
+
+    def invalidate(
+        self,
+        section: _Section,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> None:
+        """
+        Evicts the entries of `section`. If `start_time` or `end_time` is given, only
+        the entries whose time intervals overlap [start_time, end_time] are evicted, as
+        well as those without time intervals.
+        """
+        if not (sub_cache := self._cache.get(section)):
+            return
+        if start_time is None and end_time is None:
+            num_evictions = len(sub_cache)
             sub_cache.clear()
+        else:
+            sub_keys = [
+                sub_key
+                for sub_key in sub_cache.keys()
+                if _overlaps(self._interval(sub_key), start_time, end_time)
+            ]
+            for sub_key in sub_keys:
+                del sub_cache[sub_key]
+            num_evictions = len(sub_keys)
+        self._record_evictions(num_evictions, "invalidation")
 
     def get(self, key: _Key) -> Optional["Future[_Result]"]:
         section, sub_key = self._cache_key(key)
-        if not (sub_cache := self._cache.get(section)):
-            return None
-        return sub_cache.get(sub_key)
+        value = sub_cache.get(sub_key) if (sub_cache := self._cache.get(section)) else None
+        if self._enable_prometheus:
+            from phoenix.server.prometheus import (
+                DATALOADER_CACHE_HITS,
+                DATALOADER_CACHE_MISSES,
+            )
+
+            if value is None:
+                DATALOADER_CACHE_MISSES.labels(cache=self._name).inc()
+            else:
+                DATALOADER_CACHE_HITS.labels(cache=self._name).inc()
+        return value
 
     def set(self, key: _Key, value: "Future[_Result]") -> None:
         section, sub_key = self._cache_key(key)
         if (sub_cache := self._cache.get(section)) is None:
+            # Adding a section may evict another section along with all of its entries.
+            num_entries = self._num_entries()
             self._cache[section] = sub_cache = self._sub_cache_factory()
+            self._record_evictions(num_entries - self._num_entries(), "capacity")
+        elif sub_key not in sub_cache and sub_cache.currsize >= sub_cache.maxsize:
+            self._record_evictions(1, "capacity")
         sub_cache[sub_key] = value
 
     def delete(self, key: _Key) -> None:
@@ -66,3 +131,33 @@ class TwoTierCache(
 
     def clear(self) -> None:
         self._cache.clear()
+
+    def _num_entries(self) -> int:
+        if not self._enable_prometheus:
+            return 0
+        return sum(len(sub_cache) for sub_cache in self._cache.values())
+
+    def _record_evictions(self, num_evictions: int, reason: EvictionReason) -> None:
+        if self._enable_prometheus and num_evictions > 0:
+            from phoenix.server.prometheus import DATALOADER_CACHE_EVICTIONS
+
+            DATALOADER_CACHE_EVICTIONS.labels(cache=self._name, reason=reason).inc(num_evictions)
+
+
+def _overlaps(
+    interval: Optional[TimeInterval],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+) -> bool:
+    """
+    Whether the half-open `interval`, i.e. [start, end), overlaps the closed interval
+    [start_time, end_time]. A missing endpoint is unbounded, and a missing interval
+    overlaps everything.
+    """
+    if interval is None:
+        return True
+    start, end = (normalize_datetime(t) for t in interval)
+    start_time, end_time = normalize_datetime(start_time), normalize_datetime(end_time)
+    return (start is None or end_time is None or start <= end_time) and (
+        end is None or start_time is None or start_time < end
+    )
@@ -93,7 +93,7 @@ class DatasetExampleRevisionsDataLoader(DataLoader[Key, Result]):
             )
             .where(models.DatasetExampleRevision.revision_kind != "DELETE")
         )
-        async with self._db() as session:
+        async with self._db.read() as session:
             results = {
                 (example_id, version_id): DatasetExampleRevision.from_orm_revision(revision)
                 async for (
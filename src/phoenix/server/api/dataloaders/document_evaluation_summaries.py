@@ -47,8 +47,10 @@ _SubKey: TypeAlias = tuple[TimeInterval, FilterCondition]
 class DocumentEvaluationSummaryCache(
     TwoTierCache[Key, Result, _Section, _SubKey],
 ):
-    def __init__(self) -> None:
+    def __init__(self, enable_prometheus: bool = False) -> None:
         super().__init__(
+            name="document_evaluation_summary",
+            enable_prometheus=enable_prometheus,
             # TTL=3600 (1-hour) because time intervals are always moving forward, but
             # interval endpoints are rounded down to the hour by the UI, so anything
             # older than an hour most likely won't be a cache-hit anyway.
@@ -89,7 +91,7 @@ class DocumentEvaluationSummaryDataLoader(DataLoader[Key, Result]):
             segment, param = _cache_key_fn(key)
             arguments[segment][param].append(position)
         for segment, params in arguments.items():
-            async with self._db() as session:
+            async with self._db.read() as session:
                 dialect = SupportedSQLDialect(session.bind.dialect.name)
                 stmt = _get_stmt(dialect, segment, *params.keys())
                 data = await session.stream(stmt)
@@ -37,7 +37,7 @@ class ExperimentAnnotationSummaryDataLoader(DataLoader[Key, Result]):
     async def _load_fn(self, keys: list[Key]) -> list[Result]:
         experiment_ids = keys
         summaries: defaultdict[ExperimentID, Result] = defaultdict(list)
-        async with self._db() as session:
+        async with self._db.read() as session:
             async for (
                 experiment_id,
                 annotation_name,
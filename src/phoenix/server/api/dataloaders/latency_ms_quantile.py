@@ -23,6 +23,7 @@ from typing_extensions import TypeAlias, assert_never
 
 from phoenix.db import models
 from phoenix.db.helpers import SupportedSQLDialect
+from phoenix.db.rollups import LatencySketch, is_aligned
 from phoenix.server.api.dataloaders.cache import TwoTierCache
 from phoenix.server.api.input_types.TimeRange import TimeRange
 from phoenix.server.types import DbSessionFactory
@@ -34,11 +35,14 @@ TimeInterval: TypeAlias = tuple[Optional[datetime], Optional[datetime]]
 FilterCondition: TypeAlias = Optional[str]
 Probability: TypeAlias = float
 QuantileValue: TypeAlias = float
+Approximate: TypeAlias = bool
 
-Segment: TypeAlias = tuple[Kind, TimeInterval, FilterCondition]
+Segment: TypeAlias = tuple[Kind, TimeInterval, FilterCondition, Approximate]
 Param: TypeAlias = tuple[ProjectRowId, Probability]
 
-Key: TypeAlias = tuple[Kind, ProjectRowId, Optional[TimeRange], FilterCondition, Probability]
+Key: TypeAlias = tuple[
+    Kind, ProjectRowId, Optional[TimeRange], FilterCondition, Probability, Approximate
+]
 Result: TypeAlias = Optional[QuantileValue]
 ResultPosition: TypeAlias = int
 DEFAULT_VALUE: Result = None
@@ -47,32 +51,39 @@ FloatCol: TypeAlias = SQLColumnExpression[Float[float]]
 
 
 def _cache_key_fn(key: Key) -> tuple[Segment, Param]:
-    kind, project_rowid, time_range, filter_condition, probability = key
+    kind, project_rowid, time_range, filter_condition, probability, approximate = key
     interval = (
         (time_range.start, time_range.end) if isinstance(time_range, TimeRange) else (None, None)
     )
-    return (kind, interval, filter_condition), (project_rowid, probability)
+    return (kind, interval, filter_condition, approximate), (project_rowid, probability)
 
 
 _Section: TypeAlias = ProjectRowId
-_SubKey: TypeAlias = tuple[TimeInterval, FilterCondition, Kind, Probability]
+_SubKey: TypeAlias = tuple[TimeInterval, FilterCondition, Kind, Probability, Approximate]
 
 
 class LatencyMsQuantileCache(
     TwoTierCache[Key, Result, _Section, _SubKey],
 ):
-    def __init__(self) -> None:
+    def __init__(self, enable_prometheus: bool = False) -> None:
         super().__init__(
+            name="latency_ms_quantile",
+            enable_prometheus=enable_prometheus,
             # TTL=3600 (1-hour) because time intervals are always moving forward, but
             # interval endpoints are rounded down to the hour by the UI, so anything
             # older than an hour most likely won't be a cache-hit anyway.
             main_cache=TTLCache(maxsize=64, ttl=3600),
-            sub_cache_factory=lambda: LFUCache(maxsize=2 * 2 * 2 * 16),
+            sub_cache_factory=lambda: LFUCache(maxsize=2 * 2 * 2 * 2 * 16),
         )
 
     def _cache_key(self, key: Key) -> tuple[_Section, _SubKey]:
-        (kind, interval, filter_condition), (project_rowid, probability) = _cache_key_fn(key)
-        return project_rowid, (interval, filter_condition, kind, probability)
+        (kind, interval, filter_condition, approximate), (project_rowid, probability) = (
+            _cache_key_fn(key)
+        )
+        return project_rowid, (interval, filter_condition, kind, probability, approximate)
+
+    def _interval(self, sub_key: _SubKey) -> TimeInterval:
+        return sub_key[0]
 
 
 class LatencyMsQuantileDataLoader(DataLoader[Key, Result]):
@@ -97,7 +108,7 @@ class LatencyMsQuantileDataLoader(DataLoader[Key, Result]):
         for position, key in enumerate(keys):
             segment, param = _cache_key_fn(key)
             arguments[segment][param].append(position)
-        async with self._db() as session:
+        async with self._db.read() as session:
             dialect = SupportedSQLDialect(session.bind.dialect.name)
             for segment, params in arguments.items():
                 async for position, quantile_value in _get_results(
@@ -113,7 +124,11 @@ async def _get_results(
     segment: Segment,
     params: Mapping[Param, list[ResultPosition]],
 ) -> AsyncIterator[tuple[ResultPosition, QuantileValue]]:
-    kind, (start_time, end_time), filter_condition = segment
+    kind, (start_time, end_time), filter_condition, approximate = segment
+    if approximate and not filter_condition and is_aligned(start_time, end_time):
+        async for position, quantile_value in _get_approximate_results(session, segment, params):
+            yield position, quantile_value
+        return
     stmt = select(models.Trace.project_rowid)
     if kind == "trace":
         latency_column = cast(FloatCol, models.Trace.latency_ms)
@@ -141,6 +156,41 @@ async def _get_results(
         yield position, quantile_value
 
 
+async def _get_approximate_results(
+    session: AsyncSession,
+    segment: Segment,
+    params: Mapping[Param, list[ResultPosition]],
+) -> AsyncIterator[tuple[ResultPosition, QuantileValue]]:
+    """
+    Computes the quantiles from the latency sketches of the buckets in the time range, which
+    is aligned to the buckets, instead of sorting the latencies of the spans or traces.
+    """
+    kind, (start_time, end_time), _, _ = segment
+    pid = models.ProjectLatencyRollup.project_rowid
+    bucket_start = models.ProjectLatencyRollup.bucket_start
+    stmt = (
+        select(pid, models.ProjectLatencyRollup.bin, func.sum(models.ProjectLatencyRollup.count))
+        .where(models.ProjectLatencyRollup.kind == kind)
+        .where(pid.in_({project_rowid for project_rowid, _ in params}))
+        .group_by(pid, models.ProjectLatencyRollup.bin)
+    )
+    if start_time:
+        stmt = stmt.where(start_time <= bucket_start)
+    if end_time:
+        stmt = stmt.where(bucket_start < end_time)
+    bins: defaultdict[ProjectRowId, dict[int, int]] = defaultdict(dict)
+    async for project_rowid, bin, count in await session.stream(stmt):
+        bins[project_rowid][bin] = count
+    sketches = {project_rowid: LatencySketch(b) for project_rowid, b in bins.items()}
+    for (project_rowid, probability), positions in params.items():
+        if (sketch := sketches.get(project_rowid)) is None:
+            continue
+        if (quantile_value := sketch.quantile(probability)) is None:
+            continue
+        for position in positions:
+            yield position, quantile_value
+
+
 async def _get_results_sqlite(
     session: AsyncSession,
     base_stmt: Select[Any],
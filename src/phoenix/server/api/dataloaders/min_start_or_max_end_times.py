@@ -29,8 +29,10 @@ _SubKey = Kind
 class MinStartOrMaxEndTimeCache(
     TwoTierCache[Key, Result, _Section, _SubKey],
 ):
-    def __init__(self) -> None:
+    def __init__(self, enable_prometheus: bool = False) -> None:
         super().__init__(
+            name="min_start_or_max_end_time",
+            enable_prometheus=enable_prometheus,
             main_cache=LFUCache(maxsize=64),
             sub_cache_factory=lambda: LFUCache(maxsize=2),
         )
@@ -70,7 +72,7 @@ class MinStartOrMaxEndTimeDataLoader(DataLoader[Key, Result]):
             .where(pid.in_(arguments.keys()))
             .group_by(pid)
         )
-        async with self._db() as session:
+        async with self._db.read() as session:
             data = await session.stream(stmt)
             async for project_rowid, min_start, max_end in data:
                 for kind, positions in arguments[project_rowid].items():
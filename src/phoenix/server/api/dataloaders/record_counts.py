@@ -8,6 +8,7 @@ from strawberry.dataloader import AbstractCache, DataLoader
 from typing_extensions import TypeAlias, assert_never
 
 from phoenix.db import models
+from phoenix.db.rollups import is_aligned
 from phoenix.server.api.dataloaders.cache import TwoTierCache
 from phoenix.server.api.input_types.TimeRange import TimeRange
 from phoenix.server.types import DbSessionFactory
@@ -43,8 +44,10 @@ _SubKey: TypeAlias = tuple[TimeInterval, FilterCondition, Kind]
 class RecordCountCache(
     TwoTierCache[Key, Result, _Section, _SubKey],
 ):
-    def __init__(self) -> None:
+    def __init__(self, enable_prometheus: bool = False) -> None:
         super().__init__(
+            name="record_count",
+            enable_prometheus=enable_prometheus,
             # TTL=3600 (1-hour) because time intervals are always moving forward, but
             # interval endpoints are rounded down to the hour by the UI, so anything
             # older than an hour most likely won't be a cache-hit anyway.
@@ -56,6 +59,9 @@ class RecordCountCache(
         (kind, interval, filter_condition), project_rowid = _cache_key_fn(key)
         return project_rowid, (interval, filter_condition, kind)
 
+    def _interval(self, sub_key: _SubKey) -> TimeInterval:
+        return sub_key[0]
+
 
 class RecordCountDataLoader(DataLoader[Key, Result]):
     def __init__(
@@ -79,7 +85,7 @@ class RecordCountDataLoader(DataLoader[Key, Result]):
         for position, key in enumerate(keys):
             segment, param = _cache_key_fn(key)
             arguments[segment][param].append(position)
-        async with self._db() as session:
+        async with self._db.read() as session:
             for segment, params in arguments.items():
                 stmt = _get_stmt(segment, *params.keys())
                 data = await session.stream(stmt)
@@ -94,6 +100,8 @@ def _get_stmt(
     *project_rowids: Param,
 ) -> Select[Any]:
     kind, (start_time, end_time), filter_condition = segment
+    if not filter_condition and is_aligned(start_time, end_time):
+        return _get_rollup_stmt(segment, *project_rowids)
     pid = models.Trace.project_rowid
     stmt = select(pid)
     if kind == "span":
@@ -114,3 +122,25 @@ def _get_stmt(
     if end_time:
         stmt = stmt.where(time_column < end_time)
     return stmt
+
+
+def _get_rollup_stmt(
+    segment: Segment,
+    *project_rowids: Param,
+) -> Select[Any]:
+    kind, (start_time, end_time), _ = segment
+    if kind == "span":
+        count = models.ProjectRollup.span_count
+    elif kind == "trace":
+        count = models.ProjectRollup.trace_count
+    else:
+        assert_never(kind)
+    pid = models.ProjectRollup.project_rowid
+    stmt = select(pid, func.sum(count).label("count"))
+    stmt = stmt.where(pid.in_(project_rowids))
+    stmt = stmt.group_by(pid)
+    if start_time:
+        stmt = stmt.where(start_time <= models.ProjectRollup.bucket_start)
+    if end_time:
+        stmt = stmt.where(models.ProjectRollup.bucket_start < end_time)
+    return stmt
@@ -23,7 +23,7 @@ class SessionNumTracesDataLoader(DataLoader[Key, Result]):
             .group_by(models.Trace.project_session_rowid)
             .where(models.Trace.project_session_rowid.in_(keys))
         )
-        async with self._db() as session:
+        async with self._db.read() as session:
             result: dict[Key, int] = {
                 id_: value async for id_, value in await session.stream(stmt) if id_ is not None
             }
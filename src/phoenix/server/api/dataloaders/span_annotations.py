@@ -18,7 +18,7 @@ class SpanAnnotationsDataLoader(DataLoader[Key, Result]):
 
     async def _load_fn(self, keys: list[Key]) -> list[Result]:
         span_annotations_by_id: defaultdict[Key, Result] = defaultdict(list)
-        async with self._db() as session:
+        async with self._db.read() as session:
             async for span_annotation in await session.stream_scalars(
                 select(ORMSpanAnnotation).where(ORMSpanAnnotation.span_rowid.in_(keys))
             ):
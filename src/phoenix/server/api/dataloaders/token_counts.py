@@ -9,6 +9,7 @@ from strawberry.dataloader import AbstractCache, DataLoader
 from typing_extensions import TypeAlias
 
 from phoenix.db import models
+from phoenix.db.rollups import is_aligned
 from phoenix.server.api.dataloaders.cache import TwoTierCache
 from phoenix.server.api.input_types.TimeRange import TimeRange
 from phoenix.server.types import DbSessionFactory
@@ -44,8 +45,10 @@ _SubKey: TypeAlias = tuple[TimeInterval, FilterCondition, Kind]
 class TokenCountCache(
     TwoTierCache[Key, Result, _Section, _SubKey],
 ):
-    def __init__(self) -> None:
+    def __init__(self, enable_prometheus: bool = False) -> None:
         super().__init__(
+            name="token_count",
+            enable_prometheus=enable_prometheus,
             # TTL=3600 (1-hour) because time intervals are always moving forward, but
             # interval endpoints are rounded down to the hour by the UI, so anything
             # older than an hour most likely won't be a cache-hit anyway.
@@ -57,6 +60,9 @@ class TokenCountCache(
         (interval, filter_condition), (project_rowid, kind) = _cache_key_fn(key)
         return project_rowid, (interval, filter_condition, kind)
 
+    def _interval(self, sub_key: _SubKey) -> TimeInterval:
+        return sub_key[0]
+
 
 class TokenCountDataLoader(DataLoader[Key, Result]):
     def __init__(
@@ -80,7 +86,7 @@ class TokenCountDataLoader(DataLoader[Key, Result]):
         for position, key in enumerate(keys):
             segment, param = _cache_key_fn(key)
             arguments[segment][param].append(position)
-        async with self._db() as session:
+        async with self._db.read() as session:
             for segment, params in arguments.items():
                 stmt = _get_stmt(segment, *params.keys())
                 data = await session.stream(stmt)
@@ -99,6 +105,8 @@ def _get_stmt(
     *params: Param,
 ) -> Select[Any]:
     (start_time, end_time), filter_condition = segment
+    if not filter_condition and is_aligned(start_time, end_time):
+        return _get_rollup_stmt(segment, *params)
     prompt = coalesce(func.sum(models.Span.llm_token_count_prompt), 0)
     completion = coalesce(func.sum(models.Span.llm_token_count_completion), 0)
     total = prompt + completion
@@ -122,3 +130,25 @@ def _get_stmt(
         stmt = sf(stmt)
     stmt = stmt.where(pid.in_([rowid for rowid, _ in params]))
     return stmt
+
+
+def _get_rollup_stmt(
+    segment: Segment,
+    *params: Param,
+) -> Select[Any]:
+    (start_time, end_time), _ = segment
+    prompt = func.sum(models.ProjectRollup.llm_token_count_prompt)
+    completion = func.sum(models.ProjectRollup.llm_token_count_completion)
+    pid = models.ProjectRollup.project_rowid
+    stmt: Select[Any] = select(
+        pid,
+        prompt.label("prompt"),
+        completion.label("completion"),
+        (prompt + completion).label("total"),
+    ).group_by(pid)
+    if start_time:
+        stmt = stmt.where(start_time <= models.ProjectRollup.bucket_start)
+    if end_time:
+        stmt = stmt.where(models.ProjectRollup.bucket_start < end_time)
+    stmt = stmt.where(pid.in_([rowid for rowid, _ in params]))
+    return stmt
@@ -23,7 +23,7 @@ class UsersDataLoader(DataLoader[Key, Result]):
     async def _load_fn(self, keys: list[Key]) -> list[Result]:
         user_ids = list(set(keys))
         users_by_id: defaultdict[Key, Result] = defaultdict(None)
-        async with self._db() as session:
+        async with self._db.read() as session:
             data = await session.stream_scalars(
                 select(models.User).where(models.User.id.in_(user_ids))
             )
@@ -376,8 +376,8 @@ class DatasetMutationMixin:
             if not (dataset := await session.scalar(stmt)):
                 raise NotFound(f"Unknown dataset: {input.dataset_id}")
         await asyncio.gather(
-            delete_projects(info.context.db, *project_names),
-            delete_traces(info.context.db, *eval_trace_ids),
+            delete_projects(info.context.db, *project_names, event_queue=info.context.event_queue),
+            delete_traces(info.context.db, *eval_trace_ids, event_queue=info.context.event_queue),
             return_exceptions=True,
         )
         info.context.event_queue.put(DatasetDeleteEvent((dataset.id,)))
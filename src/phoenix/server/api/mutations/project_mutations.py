@@ -6,6 +6,7 @@ from strawberry.types import Info
 
 from phoenix.config import DEFAULT_PROJECT_NAME
 from phoenix.db import models
+from phoenix.db.rollups import subtract_traces
 from phoenix.server.api.auth import IsNotReadOnly
 from phoenix.server.api.context import Context
 from phoenix.server.api.input_types.ClearProjectInput import ClearProjectInput
@@ -38,14 +39,18 @@ class ProjectMutationMixin:
         project_id = from_global_id_with_expected_type(
             global_id=input.id, expected_type_name="Project"
         )
+        conditions = [models.Trace.project_rowid == project_id]
+        if input.end_time:
+            conditions.append(models.Trace.start_time < input.end_time)
         delete_statement = (
-            delete(models.Trace)
-            .where(models.Trace.project_rowid == project_id)
-            .returning(models.Trace.project_session_rowid)
+            delete(models.Trace).where(*conditions).returning(models.Trace.project_session_rowid)
         )
-        if input.end_time:
-            delete_statement = delete_statement.where(models.Trace.start_time < input.end_time)
         async with info.context.db() as session:
+            if input.end_time:
+                await subtract_traces(session, *conditions)
+            else:
+                for table in (models.ProjectRollup, models.ProjectLatencyRollup):
+                    await session.execute(delete(table).where(table.project_rowid == project_id))
             deleted_trace_project_session_ids = await session.scalars(delete_statement)
             if deleted_trace_project_session_ids:
                 await session.execute(
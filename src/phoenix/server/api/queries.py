@@ -158,7 +158,7 @@ class Query:
             .order_by(models.User.email)
             .options(joinedload(models.User.role))
         )
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             users = await session.stream_scalars(stmt)
             data = [to_gql_user(user) async for user in users]
         return connection_from_list(data=data, args=args)
@@ -168,7 +168,7 @@ class Query:
         self,
         info: Info[Context, None],
     ) -> list[UserRole]:
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             roles = await session.scalars(
                 select(models.UserRole).where(models.UserRole.name != enums.UserRole.SYSTEM.value)
             )
@@ -188,7 +188,7 @@ class Query:
             .join(models.UserRole)
             .where(models.UserRole.name != enums.UserRole.SYSTEM.value)
         )
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             api_keys = await session.scalars(stmt)
         return [to_gql_api_key(api_key) for api_key in api_keys]
 
@@ -200,7 +200,7 @@ class Query:
             .join(models.UserRole)
             .where(models.UserRole.name == enums.UserRole.SYSTEM.value)
         )
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             api_keys = await session.scalars(stmt)
         return [
             SystemApiKey(
@@ -240,7 +240,7 @@ class Query:
             .where(models.Experiment.project_name.is_(None))
             .order_by(models.Project.id)
         )
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             projects = await session.stream_scalars(stmt)
             data = [
                 Project(
@@ -275,7 +275,7 @@ class Query:
         if sort:
             sort_col = getattr(models.Dataset, sort.col.value)
             stmt = stmt.order_by(sort_col.desc() if sort.dir is SortDir.desc else sort_col.asc())
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             datasets = await session.scalars(stmt)
         return connection_from_list(
             data=[to_gql_dataset(dataset) for dataset in datasets], args=args
@@ -299,7 +299,7 @@ class Query:
         if len(set(experiment_ids_)) != len(experiment_ids_):
             raise ValueError("Experiment IDs must be unique.")
 
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             validation_result = (
                 await session.execute(
                     select(
@@ -433,7 +433,7 @@ class Query:
     @strawberry.field
     async def functionality(self, info: Info[Context, None]) -> "Functionality":
         has_model_inferences = not info.context.model.is_empty
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             has_traces = (await session.scalar(select(models.Trace).limit(1))) is not None
         return Functionality(
             model_inferences=has_model_inferences,
@@ -455,7 +455,7 @@ class Query:
             return to_gql_embedding_dimension(node_id, embedding_dimension)
         elif type_name == "Project":
             project_stmt = select(models.Project).filter_by(id=node_id)
-            async with info.context.db() as session:
+            async with info.context.db.read() as session:
                 project = await session.scalar(project_stmt)
             if project is None:
                 raise NotFound(f"Unknown project: {id}")
@@ -465,7 +465,7 @@ class Query:
             )
         elif type_name == "Trace":
             trace_stmt = select(models.Trace).filter_by(id=node_id)
-            async with info.context.db() as session:
+            async with info.context.db.read() as session:
                 trace = await session.scalar(trace_stmt)
             if trace is None:
                 raise NotFound(f"Unknown trace: {id}")
@@ -478,14 +478,14 @@ class Query:
                 )
                 .where(models.Span.id == node_id)
             )
-            async with info.context.db() as session:
+            async with info.context.db.read() as session:
                 span = await session.scalar(span_stmt)
             if span is None:
                 raise NotFound(f"Unknown span: {id}")
             return Span(span_rowid=span.id, db_span=span)
         elif type_name == Dataset.__name__:
             dataset_stmt = select(models.Dataset).where(models.Dataset.id == node_id)
-            async with info.context.db() as session:
+            async with info.context.db.read() as session:
                 if (dataset := await session.scalar(dataset_stmt)) is None:
                     raise NotFound(f"Unknown dataset: {id}")
             return to_gql_dataset(dataset)
@@ -496,7 +496,7 @@ class Query:
                 .where(models.DatasetExampleRevision.dataset_example_id == example_id)
                 .scalar_subquery()
             )
-            async with info.context.db() as session:
+            async with info.context.db.read() as session:
                 example = await session.scalar(
                     select(models.DatasetExample)
                     .join(
@@ -519,7 +519,7 @@ class Query:
                 created_at=example.created_at,
             )
         elif type_name == Experiment.__name__:
-            async with info.context.db() as session:
+            async with info.context.db.read() as session:
                 experiment = await session.scalar(
                     select(models.Experiment).where(models.Experiment.id == node_id)
                 )
@@ -535,7 +535,7 @@ class Query:
                 metadata=experiment.metadata_,
             )
         elif type_name == ExperimentRun.__name__:
-            async with info.context.db() as session:
+            async with info.context.db.read() as session:
                 if not (
                     run := await session.scalar(
                         select(models.ExperimentRun)
@@ -550,7 +550,7 @@ class Query:
         elif type_name == User.__name__:
             if int((user := info.context.user).identity) != node_id and not user.is_admin:
                 raise Unauthorized(MSG_ADMIN_ONLY)
-            async with info.context.db() as session:
+            async with info.context.db.read() as session:
                 if not (
                     user := await session.scalar(
                         select(models.User).where(models.User.id == node_id)
@@ -559,7 +559,7 @@ class Query:
                     raise NotFound(f"Unknown user: {id}")
             return to_gql_user(user)
         elif type_name == ProjectSession.__name__:
-            async with info.context.db() as session:
+            async with info.context.db.read() as session:
                 if not (
                     project_session := await session.scalar(
                         select(models.ProjectSession).filter_by(id=node_id)
@@ -568,7 +568,7 @@ class Query:
                     raise NotFound(f"Unknown user: {id}")
             return to_gql_project_session(project_session)
         elif type_name == Prompt.__name__:
-            async with info.context.db() as session:
+            async with info.context.db.read() as session:
                 if orm_prompt := await session.scalar(
                     select(models.Prompt).where(models.Prompt.id == node_id)
                 ):
@@ -576,7 +576,7 @@ class Query:
                 else:
                     raise NotFound(f"Unknown prompt: {id}")
         elif type_name == PromptVersion.__name__:
-            async with info.context.db() as session:
+            async with info.context.db.read() as session:
                 if orm_prompt_version := await session.scalar(
                     select(models.PromptVersion).where(models.PromptVersion.id == node_id)
                 ):
@@ -584,7 +584,7 @@ class Query:
                 else:
                     raise NotFound(f"Unknown prompt version: {id}")
         elif type_name == PromptLabel.__name__:
-            async with info.context.db() as session:
+            async with info.context.db.read() as session:
                 if not (
                     prompt_label := await session.scalar(
                         select(models.PromptLabel).where(models.PromptLabel.id == node_id)
@@ -603,7 +603,7 @@ class Query:
             return None
         if isinstance(user, UnauthenticatedUser):
             return None
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             if (
                 user := await session.scalar(
                     select(models.User)
@@ -630,7 +630,7 @@ class Query:
             before=before if isinstance(before, CursorString) else None,
         )
         stmt = select(models.Prompt)
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             orm_prompts = await session.stream_scalars(stmt)
             data = [to_gql_prompt_from_orm(orm_prompt) async for orm_prompt in orm_prompts]
             return connection_from_list(
@@ -653,7 +653,7 @@ class Query:
             last=last,
             before=before if isinstance(before, CursorString) else None,
         )
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             prompt_labels = await session.stream_scalars(select(models.PromptLabel))
             data = [to_gql_prompt_label(prompt_label) async for prompt_label in prompt_labels]
             return connection_from_list(
@@ -797,7 +797,7 @@ class Query:
         if info.context.db.dialect is SupportedSQLDialect.SQLITE:
             stmt = text("SELECT name, sum(pgsize) FROM dbstat group by name;")
             try:
-                async with info.context.db() as session:
+                async with info.context.db.read() as session:
                     stats = cast(Iterable[tuple[str, int]], await session.execute(stmt))
                 stats = _consolidate_sqlite_db_table_stats(stats)
             except Exception:
@@ -812,7 +812,7 @@ class Query:
                 AND n.nspname = '{getenv(ENV_PHOENIX_SQL_DATABASE_SCHEMA) or "public"}';
             """)
             try:
-                async with info.context.db() as session:
+                async with info.context.db.read() as session:
                     stats = cast(Iterable[tuple[str, int]], await session.execute(stmt))
             except Exception:
                 # TODO: temporary workaround until we can reproduce the error
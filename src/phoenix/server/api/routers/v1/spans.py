@@ -1,5 +1,6 @@
+import json
 from asyncio import get_running_loop
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Sequence
 from datetime import datetime, timezone
 from secrets import token_urlsafe
 from typing import Any, Literal, Optional
@@ -19,8 +20,9 @@ from phoenix.db import models
 from phoenix.db.helpers import SupportedSQLDialect
 from phoenix.db.insertion.helpers import as_kv, insert_on_conflict
 from phoenix.db.insertion.types import Precursors
-from phoenix.server.api.routers.utils import df_to_bytes
+from phoenix.server.api.routers.utils import df_to_bytes, table_to_bytes
 from phoenix.server.dml_event import SpanAnnotationInsertEvent
+from phoenix.server.types import DbSessionFactory
 from phoenix.trace.dsl import SpanQuery as SpanQuery_
 from phoenix.utilities.json import encode_df_as_json_string
 
@@ -28,6 +30,8 @@ from .models import V1RoutesBaseModel
 from .utils import RequestBody, ResponseBody, add_errors_to_responses
 
 DEFAULT_SPAN_LIMIT = 1000
+DEFAULT_CHUNK_SIZE = 1000
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
 
 router = APIRouter(tags=["spans"])
 
@@ -45,8 +49,16 @@ class QuerySpansRequestBody(V1RoutesBaseModel):
     queries: list[SpanQuery]
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
-    limit: int = DEFAULT_SPAN_LIMIT
+    limit: Optional[int] = DEFAULT_SPAN_LIMIT
     root_spans_only: Optional[bool] = None
+    chunk_size: int = Field(
+        default=DEFAULT_CHUNK_SIZE,
+        gt=0,
+        description=(
+            "The number of spans in each chunk when the results are streamed as "
+            "newline-delimited JSON, i.e. when the accept header is application/x-ndjson."
+        ),
+    )
     project_name: Optional[str] = Field(
         default=None,
         description=(
@@ -99,21 +111,52 @@ async def query_spans_handler(
             detail=f"Invalid query: {e}",
             status_code=HTTP_422_UNPROCESSABLE_ENTITY,
         )
-    async with request.app.state.db() as session:
+    start_time = normalize_datetime(request_body.start_time, timezone.utc)
+    end_time = normalize_datetime(end_time, timezone.utc)
+    if accept == "application/x-ndjson":
+        return StreamingResponse(
+            content=_ndjson_chunks(
+                request.app.state.db,
+                span_queries,
+                limit=request_body.limit,
+                chunk_size=request_body.chunk_size,
+                project_name=project_name,
+                start_time=start_time,
+                end_time=end_time,
+                root_spans_only=request_body.root_spans_only,
+            ),
+            media_type="application/x-ndjson",
+        )
+    if accept == ARROW_STREAM_MEDIA_TYPE:
+        async with request.app.state.db.read() as session:
+            tables = [
+                await session.run_sync(
+                    query.to_arrow,
+                    project_name=project_name,
+                    start_time=start_time,
+                    end_time=end_time,
+                    limit=request_body.limit,
+                    root_spans_only=request_body.root_spans_only,
+                )
+                for query in span_queries
+            ]
+        if not tables:
+            raise HTTPException(status_code=HTTP_404_NOT_FOUND)
+
+        async def arrow_content() -> AsyncIterator[bytes]:
+            for table in tables:
+                yield table_to_bytes(table)
+
+        return StreamingResponse(content=arrow_content(), media_type=ARROW_STREAM_MEDIA_TYPE)
+    async with request.app.state.db.read() as session:
         results = []
         for query in span_queries:
             results.append(
                 await session.run_sync(
                     query,
                     project_name=project_name,
-                    start_time=normalize_datetime(
-                        request_body.start_time,
-                        timezone.utc,
-                    ),
-                    end_time=normalize_datetime(
-                        end_time,
-                        timezone.utc,
-                    ),
+                    start_time=start_time,
+                    end_time=end_time,
                     limit=request_body.limit,
                     root_spans_only=request_body.root_spans_only,
                 )
@@ -150,6 +193,48 @@ async def _json_multipart(
     yield f"--{boundary_token}--\r\n"
 
 
+async def _ndjson_chunks(
+    db: DbSessionFactory,
+    span_queries: Sequence[SpanQuery_],
+    *,
+    limit: Optional[int],
+    chunk_size: int,
+    project_name: str,
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    root_spans_only: Optional[bool],
+) -> AsyncIterator[str]:
+    """
+    Walks the spans of each query by row id in chunks of at most `chunk_size` spans,
+    yielding one line per non-empty chunk as soon as it is ready. Each chunk is read in
+    its own short transaction, so the export holds neither a connection nor the full
+    result for its duration.
+    """
+    loop = get_running_loop()
+    for i, query in enumerate(span_queries):
+        cursor: Optional[int] = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            async with db.read() as session:
+                df, cursor = await session.run_sync(
+                    query.next_chunk,
+                    cursor,
+                    size,
+                    project_name=project_name,
+                    start_time=start_time,
+                    end_time=end_time,
+                    root_spans_only=root_spans_only,
+                )
+            if len(df):
+                data = await loop.run_in_executor(None, encode_df_as_json_string, df)
+                yield json.dumps({"query": i, "data": data}) + "\n"
+            if cursor is None:
+                break
+            if remaining is not None:
+                remaining -= size
+
+
 @router.get("/spans", include_in_schema=False, deprecated=True)
 async def get_spans_handler(
     request: Request,
@@ -1,5 +1,6 @@
 import gzip
 import zlib
+from collections.abc import Callable
 from typing import Any, Literal, Optional
 
 from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Query
@@ -19,6 +20,7 @@ from starlette.status import (
     HTTP_404_NOT_FOUND,
     HTTP_415_UNSUPPORTED_MEDIA_TYPE,
     HTTP_422_UNPROCESSABLE_ENTITY,
+    HTTP_503_SERVICE_UNAVAILABLE,
 )
 from strawberry.relay import GlobalID
 
@@ -27,14 +29,19 @@ from phoenix.db.helpers import SupportedSQLDialect
 from phoenix.db.insertion.helpers import as_kv, insert_on_conflict
 from phoenix.db.insertion.types import Precursors
 from phoenix.server.dml_event import TraceAnnotationInsertEvent
-from phoenix.trace.otel import decode_otlp_span
-from phoenix.utilities.project import get_project_name
+from phoenix.server.span_decoder import count_spans
+from phoenix.trace.schemas import Span
 
 from .models import V1RoutesBaseModel
 from .utils import RequestBody, ResponseBody, add_errors_to_responses
 
 router = APIRouter(tags=["traces"])
 
+SPAN_QUEUE_RETRY_AFTER_SECONDS = 5
+"""
+How long clients are asked to wait before retrying when the span buffer is full.
+"""
+
 
 @router.post(
     "/traces",
@@ -49,6 +56,10 @@ router = APIRouter(tags=["traces"])
                 ),
             },
             {"status_code": HTTP_422_UNPROCESSABLE_ENTITY, "description": "Invalid request body"},
+            {
+                "status_code": HTTP_503_SERVICE_UNAVAILABLE,
+                "description": "Too many spans are awaiting insertion, retry later",
+            },
         ]
     ),
     openapi_extra={
@@ -77,6 +88,16 @@ async def post_traces(
             detail=f"Unsupported content encoding: {content_encoding}",
             status_code=HTTP_415_UNSUPPORTED_MEDIA_TYPE,
         )
+    if request.state.span_queue_is_full():
+        if request.app.state.enable_prometheus:
+            from phoenix.server.prometheus import BULK_LOADER_SPAN_REJECTIONS
+
+            BULK_LOADER_SPAN_REJECTIONS.labels(protocol="http").inc()
+        raise HTTPException(
+            detail="Server is at capacity, too many spans are awaiting insertion",
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(SPAN_QUEUE_RETRY_AFTER_SECONDS)},
+        )
     body = await request.body()
     if content_encoding == "gzip":
         body = await run_in_threadpool(gzip.decompress, body)
@@ -90,7 +111,15 @@ async def post_traces(
             detail="Request body is invalid ExportTraceServiceRequest",
             status_code=HTTP_422_UNPROCESSABLE_ENTITY,
         )
-    background_tasks.add_task(_add_spans, req, request.state)
+    release_admitted_spans = request.state.admit_spans(count_spans(req))
+    spool_segment = None
+    try:
+        if (span_spool := request.state.span_spool) is not None:
+            spool_segment = await span_spool.append(body)
+    except BaseException:
+        release_admitted_spans()
+        raise
+    background_tasks.add_task(_add_spans, req, request.state, release_admitted_spans, spool_segment)
     return JSONResponse(MessageToJson(ExportTraceServiceResponse()))
 
 
@@ -199,10 +228,20 @@ async def annotate_traces(
     )
 
 
-async def _add_spans(req: ExportTraceServiceRequest, state: State) -> None:
-    for resource_spans in req.resource_spans:
-        project_name = get_project_name(resource_spans.resource.attributes)
-        for scope_span in resource_spans.scope_spans:
-            for otlp_span in scope_span.spans:
-                span = await run_in_threadpool(decode_otlp_span, otlp_span)
-                await state.queue_span_for_bulk_insert(span, project_name)
+async def _add_spans(
+    req: ExportTraceServiceRequest,
+    state: State,
+    release_admitted_spans: Callable[[], None],
+    spool_segment: Optional[int] = None,
+) -> None:
+    spans: list[tuple[Span, str]] = []
+    try:
+        try:
+            spans = await state.decode_spans(req)
+        finally:
+            if spool_segment is not None:
+                state.span_spool.assign(spool_segment, spans)
+        for span, project_name in spans:
+            await state.queue_span_for_bulk_insert(span, project_name)
+    finally:
+        release_admitted_spans()
@@ -25,6 +25,7 @@ from typing_extensions import TypeAlias, assert_never
 
 from phoenix.datetime_utils import local_now, normalize_datetime
 from phoenix.db import models
+from phoenix.db.rollups import add_new_traces
 from phoenix.server.api.auth import IsLocked, IsNotReadOnly
 from phoenix.server.api.context import Context
 from phoenix.server.api.exceptions import BadRequest, CustomGraphQLError, NotFound
@@ -164,6 +165,7 @@ class Subscription:
             db_span = get_db_span(span, db_trace)
             session.add(db_span)
             await session.flush()
+            await add_new_traces(session, db_span)
         info.context.event_queue.put(SpanInsertEvent(ids=(playground_project_id,)))
         yield ChatCompletionSubscriptionResult(span=Span(span_rowid=db_span.id, db_span=db_span))
 
@@ -455,6 +457,7 @@ async def _chat_completion_result_payloads(
                 session.add(span)
             session.add(run)
         await session.flush()
+        await add_new_traces(session, *(span for _, span, _ in results if span))
     for example_id, span, run in results:
         yield ChatCompletionSubscriptionResult(
             span=Span(span_rowid=span.id, db_span=span) if span else None,
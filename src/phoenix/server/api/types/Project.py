@@ -169,6 +169,7 @@ class Project(Node):
         info: Info[Context, None],
         probability: float,
         time_range: Optional[TimeRange] = UNSET,
+        approximate: Optional[bool] = UNSET,
     ) -> Optional[float]:
         return await info.context.data_loaders.latency_ms_quantile.load(
             (
@@ -177,6 +178,7 @@ class Project(Node):
                 time_range,
                 None,
                 probability,
+                bool(approximate),
             ),
         )
 
@@ -187,6 +189,7 @@ class Project(Node):
         probability: float,
         time_range: Optional[TimeRange] = UNSET,
         filter_condition: Optional[str] = UNSET,
+        approximate: Optional[bool] = UNSET,
     ) -> Optional[float]:
         return await info.context.data_loaders.latency_ms_quantile.load(
             (
@@ -195,6 +198,7 @@ class Project(Node):
                 time_range,
                 filter_condition,
                 probability,
+                bool(approximate),
             ),
         )
 
@@ -205,7 +209,7 @@ class Project(Node):
             .where(models.Trace.trace_id == str(trace_id))
             .where(models.Trace.project_rowid == self.project_rowid)
         )
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             if (trace := await session.scalar(stmt)) is None:
                 return None
         return Trace(trace_rowid=trace.id, db_trace=trace)
@@ -236,11 +240,7 @@ class Project(Node):
         if root_spans_only:
             # A root span is any span whose parent span is missing in the
             # database, even if its `parent_span_id` may not be NULL.
-            parent = select(models.Span.span_id).alias()
-            stmt = stmt.outerjoin(
-                parent,
-                models.Span.parent_id == parent.c.span_id,
-            ).where(parent.c.span_id.is_(None))
+            stmt = stmt.where(models.Span.is_root)
         if filter_condition:
             span_filter = SpanFilter(condition=filter_condition)
             stmt = span_filter(stmt)
@@ -270,7 +270,7 @@ class Project(Node):
             )
         stmt = stmt.order_by(cursor_rowid_column)
         cursors_and_nodes = []
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             span_records = await session.stream(stmt)
             async for span_record in islice(span_records, first):
                 span_rowid: int = span_record[0]
@@ -389,7 +389,7 @@ class Project(Node):
                 first + 1  # over-fetch by one to determine whether there's a next page
             )
         cursors_and_nodes = []
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             records = await session.stream(stmt)
             async for record in islice(records, first):
                 project_session = record[0]
@@ -425,7 +425,7 @@ class Project(Node):
             .join(models.Trace)
             .where(models.Trace.project_rowid == self.project_rowid)
         )
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             return list(await session.scalars(stmt))
 
     @strawberry.field(
@@ -442,7 +442,7 @@ class Project(Node):
             .join(models.Trace, models.Span.trace_rowid == models.Trace.id)
             .where(models.Trace.project_rowid == self.project_rowid)
         )
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             return list(await session.scalars(stmt))
 
     @strawberry.field(
@@ -462,7 +462,7 @@ class Project(Node):
         )
         if span_id:
             stmt = stmt.where(models.Span.span_id == str(span_id))
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             return list(await session.scalars(stmt))
 
     @strawberry.field
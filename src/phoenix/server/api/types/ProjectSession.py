@@ -107,7 +107,7 @@ class ProjectSession(Node):
             .order_by(models.Trace.start_time)
             .limit(first)
         )
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             traces = await session.stream_scalars(stmt)
             data = [Trace(trace_rowid=trace.id, db_trace=trace) async for trace in traces]
         return connection_from_list(data=data, args=args)
@@ -19,7 +19,7 @@ class PromptLabel(Node):
 
     @strawberry.field
     async def prompts(self, info: Info[Context, None]) -> list[Prompt]:
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             statement = (
                 select(models.Prompt)
                 .join(
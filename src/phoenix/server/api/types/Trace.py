@@ -155,7 +155,7 @@ class Trace(Node):
         from phoenix.server.api.types.ProjectSession import to_gql_project_session
 
         stmt = select(models.ProjectSession).filter_by(id=project_session_rowid)
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             project_session = await session.scalar(stmt)
         if project_session is None:
             return None
@@ -202,7 +202,7 @@ class Trace(Node):
             .order_by(desc(models.Span.id))
             .limit(first)
         )
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             span_rowids = await session.stream_scalars(stmt)
             data = [Span(span_rowid=span_rowid) async for span_rowid in span_rowids]
         return connection_from_list(data=data, args=args)
@@ -213,7 +213,7 @@ class Trace(Node):
         info: Info[Context, None],
         sort: Optional[TraceAnnotationSort] = None,
     ) -> list[TraceAnnotation]:
-        async with info.context.db() as session:
+        async with info.context.db.read() as session:
             stmt = select(models.TraceAnnotation).filter_by(span_rowid=self.trace_rowid)
             if sort:
                 sort_col = getattr(models.TraceAnnotation, sort.col.value)
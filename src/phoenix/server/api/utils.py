@@ -1,12 +1,15 @@
 from sqlalchemy import delete
 
 from phoenix.db import models
-from phoenix.server.types import DbSessionFactory
+from phoenix.db.rollups import subtract_traces
+from phoenix.server.dml_event import DmlEvent, ProjectDeleteEvent, SpanDeleteEvent
+from phoenix.server.types import CanPutItem, DbSessionFactory
 
 
 async def delete_projects(
     db: DbSessionFactory,
     *project_names: str,
+    event_queue: CanPutItem[DmlEvent],
 ) -> list[int]:
     if not project_names:
         return []
@@ -16,19 +19,26 @@ async def delete_projects(
         .returning(models.Project.id)
     )
     async with db() as session:
-        return list(await session.scalars(stmt))
+        project_ids = list(await session.scalars(stmt))
+    if project_ids:
+        event_queue.put(ProjectDeleteEvent(tuple(project_ids)))
+    return project_ids
 
 
 async def delete_traces(
     db: DbSessionFactory,
     *trace_ids: str,
+    event_queue: CanPutItem[DmlEvent],
 ) -> list[int]:
     if not trace_ids:
         return []
+    condition = models.Trace.trace_id.in_(set(trace_ids))
     stmt = (
-        delete(models.Trace)
-        .where(models.Trace.trace_id.in_(set(trace_ids)))
-        .returning(models.Trace.id)
+        delete(models.Trace).where(condition).returning(models.Trace.id, models.Trace.project_rowid)
     )
     async with db() as session:
-        return list(await session.scalars(stmt))
+        await subtract_traces(session, condition)
+        rows = (await session.execute(stmt)).all()
+    if rows:
+        event_queue.put(SpanDeleteEvent(tuple({project_rowid for _, project_rowid in rows})))
+    return [id_ for id_, _ in rows]
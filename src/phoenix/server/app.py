@@ -48,6 +48,7 @@ from typing_extensions import TypeAlias
 
 import phoenix.trace.v1 as pb
 from phoenix.config import (
+    DEFAULT_MAX_SPANS_QUEUE_SIZE,
     DEFAULT_PROJECT_NAME,
     ENV_PHOENIX_CSRF_TRUSTED_ORIGINS,
     SERVER_DIR,
@@ -66,6 +67,7 @@ from phoenix.db.bulk_inserter import BulkInserter
 from phoenix.db.engines import create_engine
 from phoenix.db.facilitator import Facilitator
 from phoenix.db.helpers import SupportedSQLDialect
+from phoenix.db.insertion.cache import RowIdCache
 from phoenix.exceptions import PhoenixMigrationError
 from phoenix.pointcloud.umap_parameters import UMAPParameters
 from phoenix.server.api.context import Context, DataLoaders
@@ -122,6 +124,8 @@ from phoenix.server.email.types import EmailSender
 from phoenix.server.grpc_server import GrpcServer
 from phoenix.server.jwt_store import JwtStore
 from phoenix.server.oauth2 import OAuth2Clients
+from phoenix.server.span_decoder import SpanDecoder
+from phoenix.server.span_spool import SpanSpool
 from phoenix.server.telemetry import initialize_opentelemetry_tracer_provider
 from phoenix.server.types import (
     CanGetLastUpdatedAt,
@@ -475,6 +479,8 @@ def _lifespan(
     db: DbSessionFactory,
     bulk_inserter: BulkInserter,
     dml_event_handler: DmlEventHandler,
+    span_decoder: SpanDecoder,
+    span_spool: Optional[SpanSpool] = None,
     token_store: Optional[TokenStore] = None,
     tracer_provider: Optional["TracerProvider"] = None,
     enable_prometheus: bool = False,
@@ -491,14 +497,23 @@ def _lifespan(
         global DB_MUTEX
         DB_MUTEX = asyncio.Lock() if db.dialect is SupportedSQLDialect.SQLITE else None
         async with AsyncExitStack() as stack:
+            if span_spool is not None:
+                await stack.enter_async_context(span_spool)
             (
                 enqueue,
                 queue_span,
                 queue_evaluation,
                 enqueue_operation,
             ) = await stack.enter_async_context(bulk_inserter)
+            await stack.enter_async_context(span_decoder)
+            if span_spool is not None:
+                await span_spool.replay(span_decoder.decode, queue_span)
             grpc_server = GrpcServer(
                 queue_span,
+                span_queue_is_full=bulk_inserter.span_queue_is_full,
+                admit_spans=bulk_inserter.admit_spans,
+                span_decoder=span_decoder,
+                span_spool=span_spool,
                 disabled=read_only,
                 tracer_provider=tracer_provider,
                 enable_prometheus=enable_prometheus,
@@ -520,6 +535,10 @@ def _lifespan(
                 "event_queue": dml_event_handler,
                 "enqueue": enqueue,
                 "queue_span_for_bulk_insert": queue_span,
+                "span_queue_is_full": bulk_inserter.span_queue_is_full,
+                "admit_spans": bulk_inserter.admit_spans,
+                "decode_spans": span_decoder.decode,
+                "span_spool": span_spool,
                 "queue_evaluation_for_bulk_insert": queue_evaluation,
                 "enqueue_operation": enqueue_operation,
             }
@@ -760,6 +779,9 @@ def create_app(
     email_sender: Optional[EmailSender] = None,
     oauth2_client_configs: Optional[list[OAuth2ClientConfig]] = None,
     bulk_inserter_factory: Optional[Callable[..., BulkInserter]] = None,
+    max_spans_queue_size: int = DEFAULT_MAX_SPANS_QUEUE_SIZE,
+    span_decoder_processes: int = 0,
+    span_spool_dir: Optional[Path] = None,
 ) -> FastAPI:
     if model.embedding_dimensions:
         try:
@@ -785,7 +807,9 @@ def create_app(
     )
     initial_batch_of_evaluations = () if initial_evaluations is None else initial_evaluations
     cache_for_dataloaders = (
-        CacheForDataLoaders() if db.dialect is SupportedSQLDialect.SQLITE else None
+        CacheForDataLoaders(enable_prometheus=enable_prometheus)
+        if db.dialect is SupportedSQLDialect.SQLITE
+        else None
     )
     last_updated_at = LastUpdatedAt()
     middlewares: list[Middleware] = [Middleware(HeadersMiddleware)]
@@ -815,10 +839,13 @@ def create_app(
         )
     else:
         token_store = None
+    rowid_cache = RowIdCache(enable_prometheus=enable_prometheus)
+    span_spool = None if span_spool_dir is None else SpanSpool(span_spool_dir)
     dml_event_handler = DmlEventHandler(
         db=db,
         cache_for_dataloaders=cache_for_dataloaders,
         last_updated_at=last_updated_at,
+        rowid_cache=rowid_cache,
     )
     bulk_inserter = bulk_inserter_factory(
         db,
@@ -826,6 +853,13 @@ def create_app(
         event_queue=dml_event_handler,
         initial_batch_of_spans=initial_batch_of_spans,
         initial_batch_of_evaluations=initial_batch_of_evaluations,
+        max_spans_queue_size=max_spans_queue_size,
+        rowid_cache=rowid_cache,
+        span_spool=span_spool,
+    )
+    span_decoder = SpanDecoder(
+        max_workers=span_decoder_processes,
+        enable_prometheus=enable_prometheus,
     )
     tracer_provider = None
     graphql_schema_extensions: list[Union[type[SchemaExtension], SchemaExtension]] = []
@@ -876,6 +910,8 @@ def create_app(
             read_only=read_only,
             bulk_inserter=bulk_inserter,
             dml_event_handler=dml_event_handler,
+            span_decoder=span_decoder,
+            span_spool=span_spool,
             token_store=token_store,
             tracer_provider=tracer_provider,
             enable_prometheus=enable_prometheus,
@@ -935,6 +971,7 @@ def create_app(
     app.state.oauth2_clients = OAuth2Clients.from_configs(oauth2_client_configs or [])
     app.state.db = db
     app.state.email_sender = email_sender
+    app.state.enable_prometheus = enable_prometheus
     app = _add_get_secret_method(app=app, secret=secret)
     app = _add_get_token_store_method(app=app, token_store=token_store)
     if tracer_provider:
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from abc import ABC
 from dataclasses import dataclass, field
-from typing import ClassVar
+from datetime import datetime
+from typing import ClassVar, Optional
 
 from phoenix.db import models
 
@@ -38,7 +39,11 @@ class SpanDmlEvent(ProjectDmlEvent): ...
 
 
 @dataclass(frozen=True)
-class SpanInsertEvent(SpanDmlEvent): ...
+class SpanInsertEvent(SpanDmlEvent):
+    min_start_time: Optional[datetime] = None
+    """The earliest start time of the inserted spans and of the traces they extend."""
+    max_start_time: Optional[datetime] = None
+    """The latest start time of the inserted spans and of the traces they extend."""
 
 
 @dataclass(frozen=True)
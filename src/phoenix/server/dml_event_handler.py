@@ -10,6 +10,7 @@ from typing import Any, Generic, Optional, TypedDict, TypeVar, Union, cast
 from sqlalchemy import Select, select
 from typing_extensions import TypeAlias, Unpack
 
+from phoenix.db.insertion.cache import RowIdCache
 from phoenix.db.models import (
     Base,
     DocumentAnnotation,
@@ -23,9 +24,12 @@ from phoenix.server.api.dataloaders import CacheForDataLoaders
 from phoenix.server.dml_event import (
     DmlEvent,
     DocumentAnnotationDmlEvent,
+    ProjectDeleteEvent,
+    ProjectDmlEvent,
     SpanAnnotationDmlEvent,
     SpanDeleteEvent,
     SpanDmlEvent,
+    SpanInsertEvent,
     TraceAnnotationDmlEvent,
 )
 from phoenix.server.types import (
@@ -113,24 +117,47 @@ class _GenericDmlEventHandler(_DmlEventHandler[DmlEvent]):
 class _SpanDmlEventHandler(_DmlEventHandler[SpanDmlEvent]):
     async def __call__(self) -> None:
         if cache := self._cache_for_dataloaders:
-            for id_ in set(chain.from_iterable(e.ids for e in self._batch)):
-                self._clear(cache, id_)
+            for e in self._batch:
+                for id_ in e.ids:
+                    self._clear(cache, id_, e)
 
     @staticmethod
-    def _clear(cache: CacheForDataLoaders, project_id: int) -> None:
-        cache.latency_ms_quantile.invalidate(project_id)
-        cache.token_count.invalidate(project_id)
-        cache.record_count.invalidate(project_id)
+    def _clear(cache: CacheForDataLoaders, project_id: int, event: SpanDmlEvent) -> None:
+        # When the start times of the inserted spans are known, only the results for the
+        # time intervals overlapping them are evicted. The min start and max end times are
+        # single values per project, so they are always evicted.
+        start_time, end_time = (
+            (event.min_start_time, event.max_start_time)
+            if isinstance(event, SpanInsertEvent)
+            else (None, None)
+        )
+        cache.latency_ms_quantile.invalidate(project_id, start_time, end_time)
+        cache.token_count.invalidate(project_id, start_time, end_time)
+        cache.record_count.invalidate(project_id, start_time, end_time)
         cache.min_start_or_max_end_time.invalidate(project_id)
 
 
 class _SpanDeleteEventHandler(_SpanDmlEventHandler):
     @staticmethod
-    def _clear(cache: CacheForDataLoaders, project_id: int) -> None:
+    def _clear(cache: CacheForDataLoaders, project_id: int, event: SpanDmlEvent) -> None:
         cache.annotation_summary.invalidate_project(project_id)
         cache.document_evaluation_summary.invalidate_project(project_id)
 
 
+class _RowIdCacheEventHandler(_DmlEventHandler[ProjectDmlEvent]):
+    """
+    Evicts the projects whose traces have been deleted from the row id cache used
+    for span insertion.
+    """
+
+    def __init__(self, *, rowid_cache: RowIdCache, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._rowid_cache = rowid_cache
+
+    async def __call__(self) -> None:
+        self._rowid_cache.invalidate_project(*chain.from_iterable(e.ids for e in self._batch))
+
+
 _AnnotationTable: TypeAlias = Union[
     type[SpanAnnotation],
     type[TraceAnnotation],
@@ -220,6 +247,7 @@ class DmlEventHandler:
         db: DbSessionFactory,
         last_updated_at: CanSetLastUpdatedAt,
         cache_for_dataloaders: Optional[CacheForDataLoaders] = None,
+        rowid_cache: Optional[RowIdCache] = None,
         sleep_seconds: float = 0.1,
     ) -> None:
         kwargs = _HandlerParams(
@@ -236,6 +264,13 @@ class DmlEventHandler:
             TraceAnnotationDmlEvent: [_TraceAnnotationDmlEventHandler(**kwargs)],
             DocumentAnnotationDmlEvent: [_DocumentAnnotationDmlEventHandler(**kwargs)],
         }
+        if rowid_cache is not None:
+            rowid_cache_handler = _RowIdCacheEventHandler(rowid_cache=rowid_cache, **kwargs)
+            self._handlers = {
+                **self._handlers,
+                ProjectDeleteEvent: [rowid_cache_handler],
+                SpanDeleteEvent: [*self._handlers[SpanDeleteEvent], rowid_cache_handler],
+            }
         self._all_handlers = frozenset(chain.from_iterable(self._handlers.values()))
 
     async def __aenter__(self) -> None:
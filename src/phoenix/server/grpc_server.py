@@ -2,7 +2,7 @@ from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING, Any, Optional
 
 import grpc
-from grpc.aio import RpcContext, Server, ServerInterceptor
+from grpc.aio import Server, ServerInterceptor, ServicerContext
 from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
     ExportTraceServiceRequest,
     ExportTraceServiceResponse,
@@ -11,14 +11,15 @@ from opentelemetry.proto.collector.trace.v1.trace_service_pb2_grpc import (
     TraceServiceServicer,
     add_TraceServiceServicer_to_server,
 )
+from starlette.concurrency import run_in_threadpool
 from typing_extensions import TypeAlias
 
 from phoenix.auth import CanReadToken
 from phoenix.config import get_env_grpc_port
 from phoenix.server.bearer_auth import ApiKeyInterceptor
-from phoenix.trace.otel import decode_otlp_span
+from phoenix.server.span_decoder import SpanDecoder, count_spans
+from phoenix.server.span_spool import SpanSpool
 from phoenix.trace.schemas import Span
-from phoenix.utilities.project import get_project_name
 
 if TYPE_CHECKING:
     from opentelemetry.trace import TracerProvider
@@ -30,21 +31,53 @@ class Servicer(TraceServiceServicer):  # type: ignore[misc,unused-ignore]
     def __init__(
         self,
         callback: Callable[[Span, ProjectName], Awaitable[None]],
+        span_queue_is_full: Optional[Callable[[], bool]] = None,
+        admit_spans: Optional[Callable[[int], Callable[[], None]]] = None,
+        span_decoder: Optional[SpanDecoder] = None,
+        span_spool: Optional[SpanSpool] = None,
+        enable_prometheus: bool = False,
     ) -> None:
         super().__init__()
         self._callback = callback
+        self._admit_spans = admit_spans
+        self._span_decoder = span_decoder or SpanDecoder(enable_prometheus=enable_prometheus)
+        self._span_spool = span_spool
+        self._span_queue_is_full = span_queue_is_full
+        self._enable_prometheus = enable_prometheus
 
     async def Export(
         self,
         request: ExportTraceServiceRequest,
-        context: RpcContext,
+        context: ServicerContext,  # type: ignore[type-arg]
     ) -> ExportTraceServiceResponse:
-        for resource_spans in request.resource_spans:
-            project_name = get_project_name(resource_spans.resource.attributes)
-            for scope_span in resource_spans.scope_spans:
-                for otlp_span in scope_span.spans:
-                    span = decode_otlp_span(otlp_span)
-                    await self._callback(span, project_name)
+        if self._span_queue_is_full is not None and self._span_queue_is_full():
+            if self._enable_prometheus:
+                from phoenix.server.prometheus import BULK_LOADER_SPAN_REJECTIONS
+
+                BULK_LOADER_SPAN_REJECTIONS.labels(protocol="grpc").inc()
+            await context.abort(
+                grpc.StatusCode.RESOURCE_EXHAUSTED,
+                "Server is at capacity, too many spans are awaiting insertion",
+            )
+        release_admitted_spans = (
+            self._admit_spans(count_spans(request)) if self._admit_spans is not None else None
+        )
+        try:
+            if self._span_spool is None:
+                spans = await self._span_decoder.decode(request)
+            else:
+                payload = await run_in_threadpool(request.SerializeToString)
+                segment = await self._span_spool.append(payload)
+                spans: list[tuple[Span, ProjectName]] = []
+                try:
+                    spans = await self._span_decoder.decode(request)
+                finally:
+                    self._span_spool.assign(segment, spans)
+            for span, project_name in spans:
+                await self._callback(span, project_name)
+        finally:
+            if release_admitted_spans is not None:
+                release_admitted_spans()
         return ExportTraceServiceResponse()
 
 
@@ -52,6 +85,10 @@ class GrpcServer:
     def __init__(
         self,
         callback: Callable[[Span, ProjectName], Awaitable[None]],
+        span_queue_is_full: Optional[Callable[[], bool]] = None,
+        admit_spans: Optional[Callable[[int], Callable[[], None]]] = None,
+        span_decoder: Optional[SpanDecoder] = None,
+        span_spool: Optional[SpanSpool] = None,
         tracer_provider: Optional["TracerProvider"] = None,
         enable_prometheus: bool = False,
         disabled: bool = False,
@@ -59,6 +96,10 @@ class GrpcServer:
         interceptors: list[ServerInterceptor] = [],
     ) -> None:
         self._callback = callback
+        self._span_queue_is_full = span_queue_is_full
+        self._admit_spans = admit_spans
+        self._span_decoder = span_decoder
+        self._span_spool = span_spool
         self._server: Optional[Server] = None
         self._tracer_provider = tracer_provider
         self._enable_prometheus = enable_prometheus
@@ -87,7 +128,15 @@ class GrpcServer:
             interceptors=interceptors,
         )
         server.add_insecure_port(f"[::]:{get_env_grpc_port()}")
-        add_TraceServiceServicer_to_server(Servicer(self._callback), server)  # type: ignore[no-untyped-call,unused-ignore]
+        servicer = Servicer(
+            self._callback,
+            span_queue_is_full=self._span_queue_is_full,
+            admit_spans=self._admit_spans,
+            span_decoder=self._span_decoder,
+            span_spool=self._span_spool,
+            enable_prometheus=self._enable_prometheus,
+        )
+        add_TraceServiceServicer_to_server(servicer, server)  # type: ignore[no-untyped-call,unused-ignore]
         await server.start()
         self._server = server
 
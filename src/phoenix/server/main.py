@@ -3,10 +3,11 @@ import codecs
 import os
 import sys
 from argparse import SUPPRESS, ArgumentParser
+from collections.abc import Callable
 from pathlib import Path
 from threading import Thread
 from time import sleep, time
-from typing import Optional
+from typing import Any, Optional
 from urllib.parse import urljoin
 
 from jinja2 import BaseLoader, Environment
@@ -28,6 +29,7 @@ from phoenix.config import (
     get_env_log_migrations,
     get_env_logging_level,
     get_env_logging_mode,
+    get_env_max_spans_queue_size,
     get_env_oauth2_settings,
     get_env_password_reset_token_expiry,
     get_env_port,
@@ -38,10 +40,14 @@ from phoenix.config import (
     get_env_smtp_port,
     get_env_smtp_username,
     get_env_smtp_validate_certs,
+    get_env_span_decoder_processes,
+    get_env_span_spool_dir,
+    get_env_sqlite_read_pool_size,
     get_pids_path,
 )
 from phoenix.core.model_schema_adapter import create_model_from_inferences
 from phoenix.db import get_printable_db_url
+from phoenix.db.engines import create_read_engine
 from phoenix.inferences.fixtures import FIXTURES, get_inferences
 from phoenix.inferences.inferences import EMPTY_INFERENCES, Inferences
 from phoenix.logging import setup_logging
@@ -345,8 +351,18 @@ def main() -> None:
         start_prometheus()
 
     engine = create_engine_and_run_migrations(db_connection_str)
-    instrumentation_cleanups = instrument_engine_if_enabled(engine)
-    factory = DbSessionFactory(db=_db(engine), dialect=engine.dialect.name)
+    shutdown_callbacks: list[Callable[[], Any]] = []
+    shutdown_callbacks.extend(instrument_engine_if_enabled(engine))
+    read_engine = create_read_engine(db_connection_str, get_env_sqlite_read_pool_size())
+    if read_engine is not None:
+        shutdown_callbacks.extend(instrument_engine_if_enabled(read_engine))
+        shutdown_callbacks.append(read_engine.dispose)
+    factory = DbSessionFactory(
+        db=_db(engine),
+        dialect=engine.dialect.name,
+        # Reads on their own connections do not contend for the lock guarding the writer.
+        read_db=None if read_engine is None else _db(read_engine, bypass_lock=True),
+    )
     corpus_model = (
         None if corpus_inferences is None else create_model_from_inferences(corpus_inferences)
     )
@@ -407,10 +423,13 @@ def main() -> None:
         serve_ui=not args.no_ui,
         read_only=read_only,
         enable_prometheus=enable_prometheus,
+        max_spans_queue_size=get_env_max_spans_queue_size(),
+        span_decoder_processes=get_env_span_decoder_processes(),
+        span_spool_dir=get_env_span_spool_dir(),
         initial_spans=fixture_spans,
         initial_evaluations=fixture_evals,
         startup_callbacks=[lambda: print(msg)],
-        shutdown_callbacks=instrumentation_cleanups,
+        shutdown_callbacks=shutdown_callbacks,
         secret=secret,
         password_reset_token_expiry=get_env_password_reset_token_expiry(),
         access_token_expiry=get_env_access_token_expiry(),
@@ -9,6 +9,7 @@ import psutil
 from prometheus_client import (
     Counter,
     Gauge,
+    Histogram,
     Summary,
     start_http_server,
 )
@@ -17,6 +18,8 @@ from starlette.requests import Request
 from starlette.responses import Response
 from starlette.routing import Match
 
+from phoenix.trace.dsl.filter import get_span_filter_cache_info
+
 REQUESTS_PROCESSING_TIME = Summary(
     name="starlette_requests_processing_time_seconds_summary",
     documentation="Summary of requests processing time by method and path (in seconds)",
@@ -52,6 +55,82 @@ BULK_LOADER_EXCEPTIONS = Counter(
     name="bulk_loader_exceptions_total",
     documentation="Total count of bulk loader exceptions",
 )
+BULK_LOADER_SPAN_QUEUE_SIZE = Gauge(
+    name="bulk_loader_span_queue_size",
+    documentation="Current number of spans buffered for insertion by the bulk loader",
+)
+BULK_LOADER_SPAN_REJECTIONS = Counter(
+    name="bulk_loader_span_rejections_total",
+    documentation="Total count of span export requests rejected because the buffer is full",
+    labelnames=["protocol"],
+)
+BULK_LOADER_SPAN_QUEUE_WAIT_TIME = Histogram(
+    name="bulk_loader_span_queue_wait_time_seconds",
+    documentation="Histogram of the time the oldest buffered span waited before a flush (seconds)",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+BULK_LOADER_SPAN_TRANSACTION_SIZE = Histogram(
+    name="bulk_loader_span_transaction_size",
+    documentation="Histogram of the number of spans inserted per transaction",
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+)
+BULK_LOADER_SPAN_TRANSACTION_TIME = Histogram(
+    name="bulk_loader_span_transaction_time_seconds",
+    documentation="Histogram of span insertion transaction time, including commit (seconds)",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+BULK_LOADER_SPANS_PER_TRANSACTION = Gauge(
+    name="bulk_loader_spans_per_transaction",
+    documentation="Current target number of spans per insertion transaction",
+)
+SPAN_DECODER_SPANS = Counter(
+    name="span_decoder_spans_total",
+    documentation="Total count of spans decoded from OTLP export requests",
+)
+SPAN_DECODER_TIME = Summary(
+    name="span_decoder_time_seconds_summary",
+    documentation="Summary of time spent decoding OTLP export requests (seconds)",
+)
+SPAN_INSERTION_CACHE_HITS = Counter(
+    name="span_insertion_cache_hits_total",
+    documentation="Total count of span insertion row id cache hits by cache",
+    labelnames=["cache"],
+)
+SPAN_INSERTION_CACHE_MISSES = Counter(
+    name="span_insertion_cache_misses_total",
+    documentation="Total count of span insertion row id cache misses by cache",
+    labelnames=["cache"],
+)
+DATALOADER_CACHE_HITS = Counter(
+    name="dataloader_cache_hits_total",
+    documentation="Total count of GraphQL dataloader cache hits by cache",
+    labelnames=["cache"],
+)
+DATALOADER_CACHE_MISSES = Counter(
+    name="dataloader_cache_misses_total",
+    documentation="Total count of GraphQL dataloader cache misses by cache",
+    labelnames=["cache"],
+)
+DATALOADER_CACHE_EVICTIONS = Counter(
+    name="dataloader_cache_evictions_total",
+    documentation=(
+        "Total count of GraphQL dataloader cache entries evicted by cache and reason, "
+        "i.e. capacity (including expiry) or invalidation"
+    ),
+    labelnames=["cache", "reason"],
+)
+SPAN_FILTER_CACHE_HITS = Gauge(
+    name="span_filter_cache_hits",
+    documentation="Total count of span filter conditions found already compiled",
+)
+SPAN_FILTER_CACHE_MISSES = Gauge(
+    name="span_filter_cache_misses",
+    documentation="Total count of span filter conditions compiled",
+)
+SPAN_FILTER_CACHE_SIZE = Gauge(
+    name="span_filter_cache_size",
+    documentation="Current number of compiled span filter conditions",
+)
 
 RATE_LIMITER_CACHE_SIZE = Gauge(
     name="rate_limiter_cache_size",
@@ -108,6 +187,10 @@ def gather_system_data() -> None:
         RAM_METRIC.labels(type="swap").set(estimate_swap_usage_bytes())
         if cpu_metric := estimate_cpu_usage_percent():
             CPU_METRIC.set(cpu_metric)
+        span_filter_cache_info = get_span_filter_cache_info()
+        SPAN_FILTER_CACHE_HITS.set(span_filter_cache_info.hits)
+        SPAN_FILTER_CACHE_MISSES.set(span_filter_cache_info.misses)
+        SPAN_FILTER_CACHE_SIZE.set(span_filter_cache_info.currsize)
 
 
 def estimate_memory_usage_bytes() -> int:
@@ -0,0 +1,150 @@
+import asyncio
+import multiprocessing
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from time import perf_counter
+from types import TracebackType
+from typing import Optional
+
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+from opentelemetry.proto.trace.v1.trace_pb2 import ResourceSpans, ScopeSpans
+from starlette.concurrency import run_in_threadpool
+from typing_extensions import Self, TypeAlias
+
+from phoenix.trace.otel import decode_otlp_span
+from phoenix.trace.schemas import Span
+from phoenix.utilities.project import get_project_name
+
+ProjectName: TypeAlias = str
+
+
+def decode_otlp_request(request: ExportTraceServiceRequest) -> list[tuple[Span, ProjectName]]:
+    """
+    Decodes all the spans in an OTLP export request along with their project names.
+    """
+    decoded_spans: list[tuple[Span, ProjectName]] = []
+    for resource_spans in request.resource_spans:
+        project_name = get_project_name(resource_spans.resource.attributes)
+        for scope_span in resource_spans.scope_spans:
+            for otlp_span in scope_span.spans:
+                decoded_spans.append((decode_otlp_span(otlp_span), project_name))
+    return decoded_spans
+
+
+def _decode_serialized_otlp_request(payload: bytes) -> list[tuple[Span, ProjectName]]:
+    request = ExportTraceServiceRequest()
+    request.ParseFromString(payload)
+    return decode_otlp_request(request)
+
+
+class SpanDecoder:
+    def __init__(
+        self,
+        *,
+        max_workers: int = 0,
+        chunk_size: int = 1000,
+        enable_prometheus: bool = False,
+    ) -> None:
+        """
+        :param max_workers: The number of worker processes used to decode large export
+        requests in parallel. If zero, each request is decoded in one call on the threadpool.
+        :param chunk_size: The number of spans per chunk handed to a worker process.
+        Requests with no more spans than this are always decoded on the threadpool.
+        :param enable_prometheus: Whether Prometheus is enabled.
+        """
+        self._max_workers = max_workers
+        self._chunk_size = chunk_size
+        self._enable_prometheus = enable_prometheus
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def __aenter__(self) -> Self:
+        if self._max_workers > 0:
+            # Forking a process with a running event loop (and its threads) is unsafe.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def decode(self, request: ExportTraceServiceRequest) -> list[tuple[Span, ProjectName]]:
+        start_time = perf_counter()
+        if (executor := self._executor) is not None and count_spans(request) > self._chunk_size:
+            loop = asyncio.get_running_loop()
+            payloads = await run_in_threadpool(_split_and_serialize, request, self._chunk_size)
+            decoded_chunks = await asyncio.gather(
+                *(
+                    loop.run_in_executor(executor, _decode_serialized_otlp_request, payload)
+                    for payload in payloads
+                )
+            )
+            decoded_spans = list(chain.from_iterable(decoded_chunks))
+        else:
+            decoded_spans = await run_in_threadpool(decode_otlp_request, request)
+        if self._enable_prometheus:
+            from phoenix.server.prometheus import SPAN_DECODER_SPANS, SPAN_DECODER_TIME
+
+            SPAN_DECODER_SPANS.inc(len(decoded_spans))
+            SPAN_DECODER_TIME.observe(perf_counter() - start_time)
+        return decoded_spans
+
+
+def count_spans(request: ExportTraceServiceRequest) -> int:
+    """
+    Counts the spans in an OTLP export request without decoding them.
+    """
+    return sum(
+        len(scope_span.spans)
+        for resource_spans in request.resource_spans
+        for scope_span in resource_spans.scope_spans
+    )
+
+
+def _split_and_serialize(request: ExportTraceServiceRequest, chunk_size: int) -> list[bytes]:
+    return [chunk.SerializeToString() for chunk in _split(request, chunk_size)]
+
+
+def _split(
+    request: ExportTraceServiceRequest, chunk_size: int
+) -> Iterator[ExportTraceServiceRequest]:
+    """
+    Splits an export request into smaller requests of at most `chunk_size` spans each,
+    keeping each span's resource (and therefore its project) and scope.
+    """
+    chunk, size = ExportTraceServiceRequest(), 0
+    for resource_spans in request.resource_spans:
+        for scope_span in resource_spans.scope_spans:
+            spans = scope_span.spans
+            start = 0
+            while start < len(spans):
+                end = min(len(spans), start + chunk_size - size)
+                chunk.resource_spans.append(
+                    ResourceSpans(
+                        resource=resource_spans.resource,
+                        schema_url=resource_spans.schema_url,
+                        scope_spans=[
+                            ScopeSpans(
+                                scope=scope_span.scope,
+                                schema_url=scope_span.schema_url,
+                                spans=spans[start:end],
+                            )
+                        ],
+                    )
+                )
+                size += end - start
+                start = end
+                if size >= chunk_size:
+                    yield chunk
+                    chunk, size = ExportTraceServiceRequest(), 0
+    if size:
+        yield chunk
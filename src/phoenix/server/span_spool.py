@@ -0,0 +1,188 @@
+"""
+Append-only, on-disk spool of OTLP export requests, written before a request is
+acknowledged so that spans buffered for insertion survive a restart.
+
+The spool is a directory of numbered segment files, each holding a sequence of
+length-prefixed (4-byte big-endian) serialized `ExportTraceServiceRequest`s. The spans
+decoded from a record are assigned to the record's segment, and the segment is
+released span by span as the bulk inserter commits them. Once nothing in a segment is
+outstanding, it is deleted (or truncated, if it is still being appended to). Segments
+left behind by a previous process are replayed on startup; spans that were already
+inserted before the restart are skipped by the span insertion path.
+"""
+
+import logging
+import os
+import struct
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from pathlib import Path
+from threading import Lock
+from types import TracebackType
+from typing import BinaryIO, Optional
+
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+from starlette.concurrency import run_in_threadpool
+from typing_extensions import Self, TypeAlias
+
+from phoenix.trace.schemas import Span
+
+logger = logging.getLogger(__name__)
+
+ProjectName: TypeAlias = str
+SegmentId: TypeAlias = int
+SpanId: TypeAlias = str
+
+_HEADER = struct.Struct(">I")
+_SUFFIX = ".spool"
+
+
+class SpanSpool:
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_segment_bytes: int = 16 * 1024 * 1024,
+        fsync: bool = True,
+    ) -> None:
+        """
+        :param directory: The directory holding the segment files. It is created if needed.
+        :param max_segment_bytes: The size above which the active segment is sealed and a
+        new one is started.
+        :param fsync: Whether to fsync each record before it is acknowledged.
+        """
+        self._directory = directory
+        self._max_segment_bytes = max_segment_bytes
+        self._fsync = fsync
+        self._lock = Lock()
+        self._file: Optional[BinaryIO] = None
+        self._active: SegmentId = 0
+        self._outstanding: defaultdict[SegmentId, int] = defaultdict(int)
+        self._span_segments: defaultdict[SpanId, list[SegmentId]] = defaultdict(list)
+        self._leftover: list[SegmentId] = []
+
+    async def __aenter__(self) -> Self:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._leftover = sorted(
+            int(path.stem) for path in self._directory.glob(f"*{_SUFFIX}") if path.stem.isdigit()
+        )
+        self._active = (self._leftover[-1] + 1) if self._leftover else 0
+        self._file = open(self._path(self._active), "ab")
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if not self._outstanding[self._active]:
+                self._path(self._active).unlink(missing_ok=True)
+
+    async def append(self, payload: bytes) -> SegmentId:
+        """
+        Durably appends a serialized export request, returning the segment it was written
+        to. The caller must follow up with `assign` once the request has been decoded.
+        """
+        return await run_in_threadpool(self._append, payload)
+
+    def assign(self, segment: SegmentId, spans: Iterable[tuple[Span, ProjectName]]) -> None:
+        """
+        Assigns the spans decoded from a record to the record's segment, so that the segment
+        is retained until all of them are released.
+        """
+        with self._lock:
+            for span, _ in spans:
+                self._span_segments[span.context.span_id].append(segment)
+                self._outstanding[segment] += 1
+            self._decrement(segment)
+
+    def release(self, spans: Iterable[tuple[Span, ProjectName]]) -> None:
+        """
+        Releases spans that have been committed to the database. Spans that were not
+        spooled are ignored.
+        """
+        with self._lock:
+            for span, _ in spans:
+                span_id = span.context.span_id
+                if not (segments := self._span_segments.get(span_id)):
+                    continue
+                segment = segments.pop(0)
+                if not segments:
+                    del self._span_segments[span_id]
+                self._decrement(segment)
+
+    async def replay(
+        self,
+        decode: Callable[[ExportTraceServiceRequest], Awaitable[list[tuple[Span, ProjectName]]]],
+        queue_span: Callable[[Span, ProjectName], Awaitable[None]],
+    ) -> None:
+        """
+        Decodes and queues the spans of the segments left behind by a previous process.
+        """
+        leftover, self._leftover = self._leftover, []
+        for segment in leftover:
+            count = 0
+            with self._lock:
+                self._outstanding[segment] += 1
+            for payload in _read_segment(self._path(segment)):
+                request = ExportTraceServiceRequest()
+                try:
+                    request.ParseFromString(payload)
+                except Exception:
+                    logger.exception(f"Skipping unreadable record in span spool segment {segment}")
+                    continue
+                with self._lock:
+                    self._outstanding[segment] += 1
+                spans = await decode(request)
+                self.assign(segment, spans)
+                for span, project_name in spans:
+                    await queue_span(span, project_name)
+                count += len(spans)
+            logger.info(f"Replayed {count} spans from span spool segment {segment}")
+            with self._lock:
+                self._decrement(segment)
+
+    def _append(self, payload: bytes) -> SegmentId:
+        with self._lock:
+            assert self._file is not None, "span spool is not open"
+            if self._file.tell() >= self._max_segment_bytes:
+                self._file.close()
+                if not self._outstanding[self._active]:
+                    self._path(self._active).unlink(missing_ok=True)
+                self._active += 1
+                self._file = open(self._path(self._active), "ab")
+            self._file.write(_HEADER.pack(len(payload)))
+            self._file.write(payload)
+            self._file.flush()
+            if self._fsync:
+                os.fsync(self._file.fileno())
+            self._outstanding[self._active] += 1
+            return self._active
+
+    def _decrement(self, segment: SegmentId) -> None:
+        self._outstanding[segment] -= 1
+        if self._outstanding[segment] > 0:
+            return
+        del self._outstanding[segment]
+        if segment != self._active:
+            self._path(segment).unlink(missing_ok=True)
+        elif self._file is not None:
+            self._file.truncate(0)
+            self._file.seek(0)
+
+    def _path(self, segment: SegmentId) -> Path:
+        return self._directory / f"{segment:020d}{_SUFFIX}"
+
+
+def _read_segment(path: Path) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while len(header := f.read(_HEADER.size)) == _HEADER.size:
+            (size,) = _HEADER.unpack(header)
+            if len(payload := f.read(size)) < size:
+                break  # a record torn by a crash
+            yield payload
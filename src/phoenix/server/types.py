@@ -30,13 +30,27 @@ class DbSessionFactory:
         self,
         db: Callable[[], AbstractAsyncContextManager[AsyncSession]],
         dialect: str,
+        read_db: Optional[Callable[[], AbstractAsyncContextManager[AsyncSession]]] = None,
     ):
+        """
+        :param db: The factory of sessions for writes (and reads that must see them).
+        :param dialect: The SQL dialect of the database.
+        :param read_db: The factory of sessions for read-only queries, which may be served
+        by separate connections from the ones for writes. Defaults to `db`.
+        """
         self._db = db
+        self._read_db = read_db or db
         self.dialect = SupportedSQLDialect(dialect)
 
     def __call__(self) -> AbstractAsyncContextManager[AsyncSession]:
         return self._db()
 
+    def read(self) -> AbstractAsyncContextManager[AsyncSession]:
+        """
+        Returns a session for read-only queries.
+        """
+        return self._read_db()
+
 
 _AnyT = TypeVar("_AnyT")
 _ItemT_contra = TypeVar("_ItemT_contra", contravariant=True)
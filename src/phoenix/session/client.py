@@ -1,13 +1,14 @@
 import csv
 import gzip
+import json
 import logging
 import re
 from collections import Counter
-from collections.abc import Iterable, Mapping, Sequence
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
-from typing import Any, BinaryIO, Literal, Optional, Union, cast
+from typing import Any, BinaryIO, Literal, Optional, Union, cast, overload
 from urllib.parse import quote, urljoin
 
 import httpx
@@ -40,6 +41,8 @@ from phoenix.utilities.json import decode_df_from_json_string
 logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT_IN_SECONDS = 5
+DEFAULT_SPAN_CHUNK_SIZE = 1000
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
 
 DatasetAction: TypeAlias = Literal["create", "append"]
 
@@ -111,6 +114,7 @@ class Client(TraceDataExtractor):
             return session.url
         return str(self._client.base_url)
 
+    @overload
     def query_spans(
         self,
         *queries: SpanQuery,
@@ -122,7 +126,37 @@ class Client(TraceDataExtractor):
         # Deprecated
         stop_time: Optional[datetime] = None,
         timeout: Optional[int] = DEFAULT_TIMEOUT_IN_SECONDS,
-    ) -> Optional[Union[pd.DataFrame, list[pd.DataFrame]]]:
+        format: Literal["pandas"] = "pandas",
+    ) -> Optional[Union[pd.DataFrame, list[pd.DataFrame]]]: ...
+
+    @overload
+    def query_spans(
+        self,
+        *queries: SpanQuery,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: Optional[int] = DEFAULT_SPAN_LIMIT,
+        root_spans_only: Optional[bool] = None,
+        project_name: Optional[str] = None,
+        # Deprecated
+        stop_time: Optional[datetime] = None,
+        timeout: Optional[int] = DEFAULT_TIMEOUT_IN_SECONDS,
+        format: Literal["arrow"],
+    ) -> Optional[Union[pa.Table, list[pa.Table]]]: ...
+
+    def query_spans(
+        self,
+        *queries: SpanQuery,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: Optional[int] = DEFAULT_SPAN_LIMIT,
+        root_spans_only: Optional[bool] = None,
+        project_name: Optional[str] = None,
+        # Deprecated
+        stop_time: Optional[datetime] = None,
+        timeout: Optional[int] = DEFAULT_TIMEOUT_IN_SECONDS,
+        format: Literal["pandas", "arrow"] = "pandas",
+    ) -> Optional[Union[pd.DataFrame, list[pd.DataFrame], pa.Table, list[pa.Table]]]:
         """
         Queries spans from the Phoenix server or active session based on specified criteria.
 
@@ -134,11 +168,15 @@ class Client(TraceDataExtractor):
             project_name (str, optional): The project name to query spans for. This can be set
                 using environment variables. If not provided, falls back to the default project.
            timeout (int, optional): The number of seconds to wait for the server to respond.
+            format (str, optional): "pandas" for DataFrames, or "arrow" for pyarrow Tables,
+                which are built by the server without going through pandas, and whose first
+                column is the index. Default "pandas".
 
         Returns:
             Union[pd.DataFrame, list[pd.DataFrame]]:
                 A pandas DataFrame or a list of pandas.
                 DataFrames containing the queried span data, or None if no spans are found.
+                With format="arrow", pyarrow Tables instead.
         """
         project_name = project_name or get_env_project_name()
         if not queries:
@@ -151,7 +189,9 @@ class Client(TraceDataExtractor):
             end_time = end_time or stop_time
         try:
             response = self._client.post(
-                headers={"accept": "application/json"},
+                headers={
+                    "accept": (ARROW_STREAM_MEDIA_TYPE if format == "arrow" else "application/json")
+                },
                 url="v1/spans",
                 params={
                     "project_name": project_name,
@@ -167,26 +207,19 @@ class Client(TraceDataExtractor):
                 timeout=timeout,
             )
         except httpx.TimeoutException as error:
-            error_message = (
-                (
-                    f"The request timed out after {timeout} seconds. The timeout can be increased "
-                    "by passing a larger value to the `timeout` parameter "
-                    "and can be disabled altogether by passing `None`."
-                )
-                if timeout is not None
-                else (
-                    "The request timed out. The timeout can be adjusted by "
-                    "passing a number of seconds to the `timeout` parameter "
-                    "and can be disabled altogether by passing `None`."
-                )
-            )
-            raise TimeoutError(error_message) from error
+            raise TimeoutError(_timeout_error_message(timeout)) from error
         if response.status_code == 404:
             logger.info("No spans found.")
             return None
         elif response.status_code == 422:
             raise ValueError(response.content.decode())
         response.raise_for_status()
+        if format == "arrow":
+            tables = _read_arrow_streams(response.content)
+            if len(tables) == 1:
+                table = tables[0]
+                return None if table.shape == (0, 0) else table
+            return tables
         results = []
         content_type = response.headers.get("Content-Type")
         if isinstance(content_type, str) and "multipart/mixed" in content_type:
@@ -218,6 +251,65 @@ class Client(TraceDataExtractor):
             return None if df.shape == (0, 0) else df
         return results
 
+    def query_spans_in_chunks(
+        self,
+        query: Optional[SpanQuery] = None,
+        *,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        root_spans_only: Optional[bool] = None,
+        project_name: Optional[str] = None,
+        chunk_size: int = DEFAULT_SPAN_CHUNK_SIZE,
+        timeout: Optional[int] = DEFAULT_TIMEOUT_IN_SECONDS,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Queries spans like `query_spans`, but streams the results from the server in chunks,
+        so that large exports don't have to be held in memory all at once.
+
+        Args:
+            query (SpanQuery, optional): The SpanQuery object defining the query criteria.
+            start_time (datetime, optional): The start time for the query range. Default None.
+            end_time (datetime, optional): The end time for the query range. Default None.
+            limit (int, optional): The maximum number of spans to query. Default None, i.e.
+                all of the matching spans.
+            root_spans_only (bool, optional): If True, only root spans are returned. Default None.
+            project_name (str, optional): The project name to query spans for. This can be set
+                using environment variables. If not provided, falls back to the default project.
+            chunk_size (int, optional): The number of spans in each chunk. Rows produced by
+                exploding a span are always in the same chunk as the span.
+            timeout (int, optional): The number of seconds to wait for each chunk.
+
+        Returns:
+            Iterator[pd.DataFrame]: The non-empty chunks of the result, in the order of the
+                spans' insertion.
+        """
+        project_name = project_name or get_env_project_name()
+        try:
+            with self._client.stream(
+                "POST",
+                headers={"accept": "application/x-ndjson"},
+                url="v1/spans",
+                params={"project_name": project_name},
+                json={
+                    "queries": [(query or SpanQuery()).to_dict()],
+                    "start_time": _to_iso_format(normalize_datetime(start_time)),
+                    "end_time": _to_iso_format(normalize_datetime(end_time)),
+                    "limit": limit,
+                    "root_spans_only": root_spans_only,
+                    "chunk_size": chunk_size,
+                },
+                timeout=timeout,
+            ) as response:
+                if response.status_code == 422:
+                    raise ValueError(response.read().decode())
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if line:
+                        yield decode_df_from_json_string(json.loads(line)["data"])
+        except httpx.TimeoutException as error:
+            raise TimeoutError(_timeout_error_message(timeout)) from error
+
     def get_evaluations(
         self,
         project_name: Optional[str] = None,
@@ -867,6 +959,32 @@ def _to_iso_format(value: Optional[datetime]) -> Optional[str]:
     return value.isoformat() if value else None
 
 
+def _read_arrow_streams(content: bytes) -> list[pa.Table]:
+    tables = []
+    source = BytesIO(content)
+    while True:
+        try:
+            with pa.ipc.open_stream(source) as reader:
+                tables.append(reader.read_all())
+        except ArrowInvalid:
+            break
+    return tables
+
+
+def _timeout_error_message(timeout: Optional[int]) -> str:
+    if timeout is not None:
+        return (
+            f"The request timed out after {timeout} seconds. The timeout can be increased "
+            "by passing a larger value to the `timeout` parameter "
+            "and can be disabled altogether by passing `None`."
+        )
+    return (
+        "The request timed out. The timeout can be adjusted by "
+        "passing a number of seconds to the `timeout` parameter "
+        "and can be disabled altogether by passing `None`."
+    )
+
+
 def _is_all_dict(seq: Sequence[Any]) -> bool:
     return all(map(lambda obj: isinstance(obj, dict), seq))
 
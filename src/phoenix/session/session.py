@@ -5,7 +5,7 @@ import shutil
 import warnings
 from abc import ABC, abstractmethod
 from collections import UserList
-from collections.abc import Iterable, Mapping
+from collections.abc import Callable, Iterable, Mapping
 from datetime import datetime
 from enum import Enum
 from importlib.util import find_spec
@@ -27,11 +27,13 @@ from phoenix.config import (
     get_env_enable_websockets,
     get_env_host,
     get_env_port,
+    get_env_sqlite_read_pool_size,
     get_exported_files,
     get_working_dir,
 )
 from phoenix.core.model_schema_adapter import create_model_from_inferences
 from phoenix.db import get_printable_db_url
+from phoenix.db.engines import create_read_engine
 from phoenix.inferences.inferences import EMPTY_INFERENCES, Inferences
 from phoenix.pointcloud.umap_parameters import get_umap_parameters
 from phoenix.server.app import (
@@ -373,8 +375,18 @@ class ThreadSession(Session):
         )
         # Initialize an app service that keeps the server running
         engine = create_engine_and_run_migrations(database_url)
-        instrumentation_cleanups = instrument_engine_if_enabled(engine)
-        factory = DbSessionFactory(db=_db(engine), dialect=engine.dialect.name)
+        shutdown_callbacks: list[Callable[[], Any]] = []
+        shutdown_callbacks.extend(instrument_engine_if_enabled(engine))
+        read_engine = create_read_engine(database_url, get_env_sqlite_read_pool_size())
+        if read_engine is not None:
+            shutdown_callbacks.extend(instrument_engine_if_enabled(read_engine))
+            shutdown_callbacks.append(read_engine.dispose)
+        factory = DbSessionFactory(
+            db=_db(engine),
+            dialect=engine.dialect.name,
+            # Reads on their own connections do not contend for the lock guarding the writer.
+            read_db=None if read_engine is None else _db(read_engine, bypass_lock=True),
+        )
         self.app = create_app(
             db=factory,
             export_path=self.export_path,
@@ -389,7 +401,7 @@ class ThreadSession(Session):
                 if (trace_dataset and (initial_evaluations := trace_dataset.evaluations))
                 else None
             ),
-            shutdown_callbacks=instrumentation_cleanups,
+            shutdown_callbacks=shutdown_callbacks,
         )
         self.server = ThreadServer(
             app=self.app,
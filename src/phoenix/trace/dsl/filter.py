@@ -4,6 +4,7 @@ import sys
 import typing
 from dataclasses import dataclass, field
 from difflib import SequenceMatcher
+from functools import _CacheInfo, lru_cache
 from itertools import chain
 from types import MappingProxyType
 from uuid import uuid4
@@ -136,14 +137,68 @@ _BACKWARD_COMPATIBILITY_REPLACEMENTS: typing.Mapping[str, str] = MappingProxyTyp
 )
 
 
+@dataclass(frozen=True)
+class _CompiledCondition:
+    translated: ast.Expression
+    compiled: typing.Any
+    aliased_annotation_relations: tuple[AliasedAnnotationRelation, ...]
+    aliased_annotation_attributes: typing.Mapping[str, Mapped[typing.Any]]
+
+
+# The same conditions tend to be used over and over, e.g. by the dashboards, and by several
+# resolvers and dataloaders within a GraphQL request, so they are compiled once per process.
+@lru_cache(maxsize=1024)
+def _compile(
+    condition: str,
+    valid_eval_names: typing.Optional[tuple[str, ...]],
+) -> _CompiledCondition:
+    root = ast.parse(condition, mode="eval")
+    _validate_expression(root, valid_eval_names=valid_eval_names)
+    source, aliased_annotation_relations = _apply_eval_aliasing(condition)
+    root = ast.parse(source, mode="eval")
+    translated = _FilterTranslator(
+        reserved_keywords=(
+            alias
+            for aliased_annotation in aliased_annotation_relations
+            for alias, _ in aliased_annotation.attributes
+        ),
+    ).visit(root)
+    ast.fix_missing_locations(translated)
+    compiled = compile(translated, filename="", mode="eval")
+    aliased_annotation_attributes = MappingProxyType(
+        {
+            alias: attribute
+            for aliased_annotation in aliased_annotation_relations
+            for alias, attribute in aliased_annotation.attributes
+        }
+    )
+    return _CompiledCondition(
+        translated=translated,
+        compiled=compiled,
+        aliased_annotation_relations=aliased_annotation_relations,
+        aliased_annotation_attributes=aliased_annotation_attributes,
+    )
+
+
+def get_span_filter_cache_info() -> _CacheInfo:
+    """
+    Returns the hits, misses and size of the cache of compiled filter conditions.
+    """
+    return _compile.cache_info()
+
+
 @dataclass(frozen=True)
 class SpanFilter:
     condition: str = ""
     valid_eval_names: typing.Optional[typing.Sequence[str]] = None
     translated: ast.Expression = field(init=False, repr=False)
     compiled: typing.Any = field(init=False, repr=False)
-    _aliased_annotation_relations: tuple[AliasedAnnotationRelation] = field(init=False, repr=False)
-    _aliased_annotation_attributes: dict[str, Mapped[typing.Any]] = field(init=False, repr=False)
+    _aliased_annotation_relations: tuple[AliasedAnnotationRelation, ...] = field(
+        init=False, repr=False
+    )
+    _aliased_annotation_attributes: typing.Mapping[str, Mapped[typing.Any]] = field(
+        init=False, repr=False
+    )
 
     def __bool__(self) -> bool:
         return bool(self.condition)
@@ -151,28 +206,18 @@ class SpanFilter:
     def __post_init__(self) -> None:
         if not (source := self.condition):
             return
-        root = ast.parse(source, mode="eval")
-        _validate_expression(root, valid_eval_names=self.valid_eval_names)
-        source, aliased_annotation_relations = _apply_eval_aliasing(source)
-        root = ast.parse(source, mode="eval")
-        translated = _FilterTranslator(
-            reserved_keywords=(
-                alias
-                for aliased_annotation in aliased_annotation_relations
-                for alias, _ in aliased_annotation.attributes
-            ),
-        ).visit(root)
-        ast.fix_missing_locations(translated)
-        compiled = compile(translated, filename="", mode="eval")
-        aliased_annotation_attributes = {
-            alias: attribute
-            for aliased_annotation in aliased_annotation_relations
-            for alias, attribute in aliased_annotation.attributes
-        }
-        object.__setattr__(self, "translated", translated)
-        object.__setattr__(self, "compiled", compiled)
-        object.__setattr__(self, "_aliased_annotation_relations", aliased_annotation_relations)
-        object.__setattr__(self, "_aliased_annotation_attributes", aliased_annotation_attributes)
+        valid_eval_names = self.valid_eval_names
+        compiled = _compile(
+            source, tuple(valid_eval_names) if valid_eval_names is not None else None
+        )
+        object.__setattr__(self, "translated", compiled.translated)
+        object.__setattr__(self, "compiled", compiled.compiled)
+        object.__setattr__(
+            self, "_aliased_annotation_relations", compiled.aliased_annotation_relations
+        )
+        object.__setattr__(
+            self, "_aliased_annotation_attributes", compiled.aliased_annotation_attributes
+        )
 
     def __call__(self, select: Select[typing.Any]) -> Select[typing.Any]:
         if not self.condition:
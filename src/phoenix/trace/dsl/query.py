@@ -1,3 +1,4 @@
+import json
 import warnings
 from collections import defaultdict
 from collections.abc import Iterable, Mapping, Sequence
@@ -5,15 +6,27 @@ from dataclasses import dataclass, field, replace
 from datetime import datetime
 from functools import cached_property
 from itertools import chain
+from operator import itemgetter
 from random import randint, random
 from types import MappingProxyType
 from typing import Any, Optional, cast
 
 import pandas as pd
+import pyarrow as pa
 from openinference.semconv.trace import SpanAttributes
-from sqlalchemy import JSON, Column, Label, Select, SQLColumnExpression, and_, func, select
+from sqlalchemy import (
+    JSON,
+    Column,
+    Integer,
+    Label,
+    Select,
+    SQLColumnExpression,
+    and_,
+    func,
+    select,
+)
 from sqlalchemy.dialects.postgresql import aggregate_order_by
-from sqlalchemy.orm import Session, aliased
+from sqlalchemy.orm import Session
 from typing_extensions import assert_never
 
 from phoenix.config import DEFAULT_PROJECT_NAME
@@ -23,7 +36,6 @@ from phoenix.trace.attributes import (
     JSON_STRING_ATTRIBUTES,
     SEMANTIC_CONVENTIONS,
     flatten,
-    get_attribute_value,
     load_json_strings,
     unflatten,
 )
@@ -143,13 +155,26 @@ class Explosion(_HasTmpSuffix, Projection):
     ) -> Select[Any]:
         array = self()
         if dialect is SupportedSQLDialect.SQLITE:
-            # Because sqlite doesn't support `WITH ORDINALITY`, the order of
-            # the returned (table) values is not guaranteed. So we resort to
-            # post hoc processing using pandas.
-            stmt = stmt.where(
-                func.json_type(array) == "array",
-            ).add_columns(
-                array.label(self._array_tmp_col_label),
+            # The `key` of an element of an array is its zero-based index.
+            element = func.json_each(array).table_valued(
+                Column("key", Integer),
+                Column("value", JSON),
+                "type",
+                joins_implicitly=True,
+            )
+            obj = element.c.value
+            position_label = element.c.key.label(f"{self._position_prefix}position")
+            if self.kwargs:
+                columns: Iterable[Label[Any]] = (
+                    obj[key.split(".")].label(self._add_tmp_suffix(name))
+                    for name, key in self.kwargs.items()
+                )
+            else:
+                columns = (obj.label(self._array_tmp_col_label),)
+            stmt = (
+                stmt.where(func.json_type(array) == "array")
+                .where(element.c.type == "object")
+                .add_columns(position_label, *columns)
             )
             return stmt
         elif dialect is SupportedSQLDialect.POSTGRESQL:
@@ -166,7 +191,7 @@ class Explosion(_HasTmpSuffix, Projection):
             # Use zero-based indexing for backward-compatibility.
             position_label = (position - 1).label(f"{self._position_prefix}position")
             if self.kwargs:
-                columns: Iterable[Label[Any]] = (
+                columns = (
                     obj[key.split(".")].label(self._add_tmp_suffix(name))
                     for name, key in self.kwargs.items()
                 )
@@ -186,6 +211,17 @@ class Explosion(_HasTmpSuffix, Projection):
         df: pd.DataFrame,
         dialect: SupportedSQLDialect,
     ) -> pd.DataFrame:
+        if self.kwargs and not df.empty:
+            exploded = [self._add_tmp_suffix(name) for name in self.kwargs]
+            # A concatenation with the same label takes precedence.
+            df = df.drop(
+                [name for name in exploded if name[: -len(self._tmp_suffix)] in df], axis=1
+            )
+            if df.loc[:, self.index_keys[1]].isna().all():
+                # Nothing was exploded, but there are concatenated values to keep.
+                df = df.drop([self.index_keys[1], *exploded], axis=1, errors="ignore")
+                df = df.rename(self._remove_tmp_suffix, axis=1)
+                return df.set_index(self.index_keys[0])
         df = df.rename(self._remove_tmp_suffix, axis=1)
         if df.empty:
             columns = list(
@@ -199,56 +235,18 @@ class Explosion(_HasTmpSuffix, Projection):
             )
             df = pd.DataFrame(columns=columns).set_index(self.index_keys)
             return df
-        if dialect != SupportedSQLDialect.SQLITE and self.kwargs:
+        if self.kwargs:
             df = df.set_index(self.index_keys)
             return df
-        if dialect is SupportedSQLDialect.SQLITE:
-            # Because sqlite doesn't support `WITH ORDINALITY`, the order of
-            # the returned (table) values is not guaranteed. So we resort to
-            # post hoc processing using pandas.
-            def _extract_values(array: list[Any]) -> list[dict[str, Any]]:
-                if not isinstance(array, Iterable):
-                    return []
-                if not self.kwargs:
-                    return [
-                        {
-                            **dict(flatten(obj)),
-                            f"{self._position_prefix}position": i,
-                        }
-                        for i, obj in enumerate(array)
-                        if isinstance(obj, Mapping)
-                    ]
-                res: list[dict[str, Any]] = []
-                for i, obj in enumerate(array):
-                    if not isinstance(obj, Mapping):
-                        continue
-                    values: dict[str, Any] = {f"{self._position_prefix}position": i}
-                    for name, key in self.kwargs.items():
-                        if (value := get_attribute_value(obj, key)) is not None:
-                            values[name] = value
-                    res.append(values)
-                return res
-
-            records = df.loc[:, self._array_tmp_col_label].dropna().map(_extract_values).explode()
-        elif dialect is SupportedSQLDialect.POSTGRESQL:
-            records = df.loc[:, self._array_tmp_col_label].dropna().map(flatten).map(dict)
-        else:
-            assert_never(dialect)
+        # Without kwargs, the objects are flattened into columns here, because
+        # their keys aren't known in advance.
+        records = df.loc[:, self._array_tmp_col_label].dropna().map(flatten).map(dict)
         df = df.drop(self._array_tmp_col_label, axis=1)
         if records.empty:
             df = df.set_index(self.index_keys[0])
             return df
-        not_na = records.notna()
-        df_explode = pd.DataFrame.from_records(
-            records.loc[not_na].to_list(),
-            index=records.index[not_na],
-        )
-        if dialect is SupportedSQLDialect.SQLITE:
-            df = _outer_join(df, df_explode)
-        elif dialect is SupportedSQLDialect.POSTGRESQL:
-            df = pd.concat([df, df_explode], axis=1)
-        else:
-            assert_never(dialect)
+        df_explode = pd.DataFrame.from_records(records.to_list(), index=records.index)
+        df = pd.concat([df, df_explode], axis=1)
         df = df.set_index(self.index_keys)
         return df
 
@@ -302,13 +300,31 @@ class Concatenation(_HasTmpSuffix, Projection):
     ) -> Select[Any]:
         array = self()
         if dialect is SupportedSQLDialect.SQLITE:
-            # Because SQLite doesn't support `WITH ORDINALITY`, the order of
-            # the returned table-values is not guaranteed. So we resort to
-            # post hoc processing using pandas.
-            stmt = stmt.where(
-                func.json_type(array) == "array",
-            ).add_columns(
-                array.label(self._array_tmp_col_label),
+            # Only the projected values leave the database, but because SQLite
+            # can't order the values of an aggregate (before version 3.44), they
+            # are aggregated along with their positions, and joined in pandas.
+            element = func.json_each(array).table_valued(
+                Column("key", Integer),
+                Column("value", JSON),
+                "type",
+                joins_implicitly=True,
+            )
+            obj = element.c.value
+            values = [obj[key.split(".")] for key in self.kwargs.values()] if self.kwargs else [obj]
+            stmt = (
+                stmt.where(
+                    and_(
+                        func.json_type(array) == "array",
+                        *((element.c.type == "object",) if self.kwargs else ()),
+                    )
+                )
+                .add_columns(
+                    func.json_group_array(
+                        func.json_array(element.c.key, *values),
+                        type_=JSON,
+                    ).label(self._array_tmp_col_label)
+                )
+                .group_by(*stmt.columns.keys())
             )
             return stmt
         elif dialect is SupportedSQLDialect.POSTGRESQL:
@@ -372,20 +388,15 @@ class Concatenation(_HasTmpSuffix, Projection):
             )
             return pd.DataFrame(columns=columns, index=df.index)
         if dialect is SupportedSQLDialect.SQLITE:
-            # Because SQLite doesn't support `WITH ORDINALITY`, the order of
-            # the returned table-values is not guaranteed. So we resort to
-            # post hoc processing using pandas.
-            def _concat_values(array: list[Any]) -> dict[str, Any]:
-                if not isinstance(array, Iterable):
+            labels = list(self.kwargs) if self.kwargs else [self.key]
+
+            def _concat_values(rows: list[list[Any]]) -> dict[str, Any]:
+                if not isinstance(rows, Iterable):
                     return {}
-                if not self.kwargs:
-                    return {self.key: self.separator.join(str(obj) for obj in array)}
                 values: defaultdict[str, list[str]] = defaultdict(list)
-                for i, obj in enumerate(array):
-                    if not isinstance(obj, Mapping):
-                        continue
-                    for label, key in self.kwargs.items():
-                        if (value := get_attribute_value(obj, key)) is not None:
+                for _, *objs in sorted(rows, key=itemgetter(0)):
+                    for label, value in zip(labels, objs):
+                        if value is not None:
                             values[label].append(str(value))
                 return {label: self.separator.join(vs) for label, vs in values.items()}
 
@@ -508,6 +519,8 @@ class SpanQuery(_HasTmpSuffix):
         root_spans_only: Optional[bool] = None,
         # Deprecated
         stop_time: Optional[datetime] = None,
+        *,
+        rowid_range: Optional[tuple[int, int]] = None,
     ) -> pd.DataFrame:
         if not project_name:
             project_name = DEFAULT_PROJECT_NAME
@@ -527,6 +540,7 @@ class SpanQuery(_HasTmpSuffix):
                 end_time=end_time,
                 limit=limit,
                 root_spans_only=root_spans_only,
+                rowid_range=rowid_range,
             )
         assert session.bind is not None
         dialect = SupportedSQLDialect(session.bind.dialect.name)
@@ -543,14 +557,12 @@ class SpanQuery(_HasTmpSuffix):
             stmt = stmt.where(start_time <= models.Span.start_time)
         if end_time:
             stmt = stmt.where(models.Span.start_time < end_time)
+        if rowid_range:
+            stmt = _restrict_rowids(stmt, *rowid_range)
         if limit is not None:
             stmt = stmt.limit(limit)
         if root_spans_only:
-            parent = aliased(models.Span)
-            stmt = stmt.outerjoin(
-                parent,
-                models.Span.parent_id == parent.span_id,
-            ).where(parent.span_id == None)  # noqa E711
+            stmt = stmt.where(models.Span.is_root)
         stmt0_orig: Select[Any] = stmt
         stmt1_filter: Optional[Select[Any]] = None
         if self._filter:
@@ -610,6 +622,111 @@ class SpanQuery(_HasTmpSuffix):
         df = df.rename(self._rename, axis=1, errors="ignore")
         return df
 
+    def next_chunk(
+        self,
+        session: Session,
+        cursor: Optional[int] = None,
+        chunk_size: int = DEFAULT_SPAN_LIMIT,
+        project_name: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        root_spans_only: Optional[bool] = None,
+    ) -> tuple[pd.DataFrame, Optional[int]]:
+        """
+        Runs the query on the next `chunk_size` matching spans in the order of their row
+        ids, starting after the row id `cursor` (or from the beginning if it is None), so
+        that a large result can be walked in chunks without offsets. Explosions and
+        concatenations are applied to each chunk as a whole, so a span is never split
+        across chunks. Returns the chunk and the cursor for the next chunk, which is None
+        when there are no more spans.
+        """
+        assert chunk_size > 0, "The chunk size must be a positive integer."
+        if not project_name:
+            project_name = DEFAULT_PROJECT_NAME
+        stmt: Select[Any] = (
+            select(models.Span.id)
+            .join(models.Trace)
+            .join(models.Project)
+            .where(models.Project.name == project_name)
+        )
+        if cursor is not None:
+            stmt = stmt.where(cursor < models.Span.id)
+        if start_time:
+            stmt = stmt.where(start_time <= models.Span.start_time)
+        if end_time:
+            stmt = stmt.where(models.Span.start_time < end_time)
+        if root_spans_only:
+            stmt = stmt.where(models.Span.is_root)
+        if self._filter:
+            stmt = self._filter(stmt)
+        rowids = session.scalars(stmt.order_by(models.Span.id).limit(chunk_size)).all()
+        after = cursor if cursor is not None else 0
+        df = self(
+            session,
+            project_name=project_name,
+            start_time=start_time,
+            end_time=end_time,
+            limit=None,
+            root_spans_only=root_spans_only,
+            rowid_range=(after, rowids[-1] if rowids else after),
+        )
+        return df, (rowids[-1] if len(rowids) == chunk_size else None)
+
+    def to_arrow(
+        self,
+        session: Session,
+        project_name: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: Optional[int] = DEFAULT_SPAN_LIMIT,
+        root_spans_only: Optional[bool] = None,
+    ) -> pa.Table:
+        """
+        Runs the query like calling it does, but builds an Arrow table directly from the
+        columns of the result set instead of a DataFrame. The projections are extracted
+        from the attributes in SQL, and the index is the first column of the table.
+        Queries with explosions or concatenations still go through pandas, because those
+        are partly done in pandas on SQLite.
+        """
+        if not project_name:
+            project_name = DEFAULT_PROJECT_NAME
+        if self._explode or self._concat:
+            df = self(session, project_name, start_time, end_time, limit, root_spans_only)
+            return pa.Table.from_pandas(df)
+        if not self._select:
+            return _get_spans_table(
+                session,
+                project_name,
+                span_filter=self._filter,
+                start_time=start_time,
+                end_time=end_time,
+                limit=limit,
+                root_spans_only=root_spans_only,
+            )
+        names = [self._index.key, *(name for name in self._select if name != self._index.key)]
+        projections = [self._index, *(self._select[name] for name in names[1:])]
+        stmt = _filter_spans(
+            select(models.Span.id).join(models.Trace).join(models.Project),
+            project_name,
+            span_filter=self._filter,
+            start_time=start_time,
+            end_time=end_time,
+            limit=limit,
+            root_spans_only=root_spans_only,
+        ).add_columns(
+            *(proj().label(self._add_tmp_suffix(str(i))) for i, proj in enumerate(projections))
+        )
+        rows = session.execute(stmt).all()
+        columns = list(zip(*rows))[1:] if rows else [()] * len(names)
+        return pa.table(
+            {
+                self._rename.get(name, name): _to_arrow_array(values)
+                for name, values in zip(
+                    [names[0], *(_ALIASES.get(name, name) for name in names[1:])], columns
+                )
+            }
+        )
+
     def to_dict(self) -> dict[str, Any]:
         return {
             **(
@@ -688,6 +805,7 @@ def _get_spans_dataframe(
     end_time: Optional[datetime] = None,
     limit: Optional[int] = DEFAULT_SPAN_LIMIT,
     root_spans_only: Optional[bool] = None,
+    rowid_range: Optional[tuple[int, int]] = None,
     # Deprecated
     stop_time: Optional[datetime] = None,
 ) -> pd.DataFrame:
@@ -725,14 +843,12 @@ def _get_spans_dataframe(
         stmt = stmt.where(start_time <= models.Span.start_time)
     if end_time:
         stmt = stmt.where(models.Span.start_time < end_time)
+    if rowid_range:
+        stmt = _restrict_rowids(stmt, *rowid_range)
     if limit is not None:
         stmt = stmt.limit(limit)
     if root_spans_only:
-        parent = aliased(models.Span)
-        stmt = stmt.outerjoin(
-            parent,
-            models.Span.parent_id == parent.span_id,
-        ).where(parent.span_id == None)  # noqa E711
+        stmt = stmt.where(models.Span.is_root)
     conn = session.connection()
     # set `drop=False` for backward-compatibility
     df = pd.read_sql_query(stmt, conn).set_index(span_id_label, drop=False)
@@ -751,6 +867,88 @@ def _get_spans_dataframe(
     return df
 
 
+def _get_spans_table(
+    session: Session,
+    project_name: str,
+    /,
+    *,
+    span_filter: Optional[SpanFilter] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    limit: Optional[int] = DEFAULT_SPAN_LIMIT,
+    root_spans_only: Optional[bool] = None,
+) -> pa.Table:
+    # Same columns as `_get_spans_dataframe`, except for the index.
+    stmt = _filter_spans(
+        select(
+            models.Span.name,
+            models.Span.span_kind,
+            models.Span.parent_id,
+            models.Span.start_time,
+            models.Span.end_time,
+            models.Span.status_code,
+            models.Span.status_message,
+            models.Span.events,
+            models.Span.span_id.label("context.span_id"),
+            models.Trace.trace_id.label("context.trace_id"),
+            models.Span.attributes,
+        )
+        .join(models.Trace)
+        .join(models.Project),
+        project_name,
+        span_filter=span_filter,
+        start_time=start_time,
+        end_time=end_time,
+        limit=limit,
+        root_spans_only=root_spans_only,
+    )
+    result = session.execute(stmt)
+    names = list(result.keys())
+    rows = result.all()
+    columns: dict[str, pa.Array] = {}
+    for name, values in zip(names, zip(*rows) if rows else [()] * len(names)):
+        if name != "attributes":
+            columns[name] = _to_arrow_array(values)
+            continue
+        attributes = list(map(_flatten_semantic_conventions, values))
+        for key in dict.fromkeys(chain.from_iterable(attributes)):
+            columns[f"attributes.{key}"] = _to_arrow_array([v.get(key) for v in attributes])
+    return pa.table(columns)
+
+
+def _to_arrow_array(values: Sequence[Any]) -> pa.Array:
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Values of different types, e.g. a string in one span and an object in another,
+        # can't share an Arrow type, so they are sent as JSON strings instead.
+        return pa.array([None if value is None else json.dumps(value) for value in values])
+
+
+def _filter_spans(
+    stmt: Select[Any],
+    project_name: str,
+    *,
+    span_filter: Optional[SpanFilter],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    limit: Optional[int],
+    root_spans_only: Optional[bool],
+) -> Select[Any]:
+    stmt = stmt.where(models.Project.name == project_name)
+    if span_filter:
+        stmt = span_filter(stmt)
+    if start_time:
+        stmt = stmt.where(start_time <= models.Span.start_time)
+    if end_time:
+        stmt = stmt.where(models.Span.start_time < end_time)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    if root_spans_only:
+        stmt = stmt.where(models.Span.is_root)
+    return stmt
+
+
 def _outer_join(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
     if (columns_intersection := left.columns.intersection(right.columns)).empty:
         df = left.join(right, how="outer")
@@ -776,3 +974,7 @@ def _flatten_semantic_conventions(attributes: Mapping[str, Any]) -> dict[str, An
         prefix_exclusions=SEMANTIC_CONVENTIONS,
     )
     return ans
+
+
+def _restrict_rowids(stmt: Select[Any], after: int, until: int) -> Select[Any]:
+    return stmt.where(after < models.Span.id).where(models.Span.id <= until)
@@ -0,0 +1,220 @@
+"""
+Synthetic OpenInference traces for benchmarking span ingestion.
+
+A trace is generated once per `TraceShape` as a template, and each trace in a payload
+is a copy of it with fresh IDs and timestamps, as done for the example traces in
+`phoenix.trace.fixtures`.
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from itertools import count
+from random import Random
+from typing import Any, Optional
+
+from openinference.semconv.resource import ResourceAttributes
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+from opentelemetry.proto.common.v1.common_pb2 import AnyValue, KeyValue
+from opentelemetry.proto.resource.v1.resource_pb2 import Resource
+from opentelemetry.proto.trace.v1.trace_pb2 import ResourceSpans, ScopeSpans
+
+from phoenix.trace.fixtures import reset_fixture_span_ids_and_timestamps
+from phoenix.trace.otel import encode_span_to_otlp
+from phoenix.trace.schemas import Span, SpanContext, SpanKind, SpanStatusCode
+
+
+@dataclass(frozen=True)
+class TraceShape:
+    depth: int = 2
+    """The number of levels of spans below the root span."""
+    fan_out: int = 3
+    """The number of children of each span above the leaves."""
+    attribute_size: int = 1_000
+    """The number of characters of each input and output value."""
+    embedding_dim: int = 0
+    """The length of the embedding vectors on retrieved documents, or zero for none."""
+    documents_per_retrieval: int = 3
+    """The number of documents on each retriever span."""
+    error_rate: float = 0.05
+    """The fraction of spans with an error status."""
+    traces_per_session: int = 5
+    """The number of consecutive traces sharing a session."""
+
+    @property
+    def spans_per_trace(self) -> int:
+        return sum(self.fan_out**level for level in range(self.depth + 1))
+
+    def __str__(self) -> str:
+        return (
+            f"depth={self.depth},fan_out={self.fan_out},"
+            f"attribute_size={self.attribute_size},embedding_dim={self.embedding_dim}"
+        )
+
+
+def generate_trace(shape: TraceShape, seed: int = 0) -> list[Span]:
+    """
+    Generates a trace with the given shape: a chain at the root, agents and chains in
+    between, and LLM, retriever and embedding spans at the leaves.
+    """
+    rng = Random(seed)
+    span_ids = count(1)
+    spans: list[Span] = []
+
+    def add(parent_id: Optional[str], level: int, index: int, start_time: datetime) -> datetime:
+        span_id = f"{next(span_ids):016x}"
+        if level == shape.depth:
+            span_kind = (SpanKind.LLM, SpanKind.RETRIEVER, SpanKind.EMBEDDING)[index % 3]
+        elif level == 0:
+            span_kind = SpanKind.CHAIN
+        else:
+            span_kind = (SpanKind.AGENT, SpanKind.CHAIN)[index % 2]
+        end_time = start_time + timedelta(milliseconds=rng.randint(1, 50))
+        if level < shape.depth:
+            for i in range(shape.fan_out):
+                end_time = add(span_id, level + 1, i, end_time)
+        spans.append(_span(shape, rng, span_kind, span_id, parent_id, start_time, end_time))
+        return end_time
+
+    add(None, 0, 0, datetime.now(timezone.utc))
+    return spans
+
+
+def generate_requests(
+    shape: TraceShape,
+    *,
+    num_traces: int,
+    traces_per_request: int = 10,
+    project_name: str = "benchmark",
+) -> Iterator[ExportTraceServiceRequest]:
+    """
+    Generates OTLP export requests for `num_traces` traces of the given shape, each a copy
+    of the same template trace with fresh IDs and timestamps.
+    """
+    template = generate_trace(shape)
+    resource = Resource(
+        attributes=[
+            KeyValue(
+                key=ResourceAttributes.PROJECT_NAME,
+                value=AnyValue(string_value=project_name),
+            )
+        ]
+    )
+    for i in range(0, num_traces, traces_per_request):
+        spans = []
+        for j in range(i, min(i + traces_per_request, num_traces)):
+            session = {"id": f"session-{j // shape.traces_per_session}"}
+            spans.extend(
+                replace(span, attributes={**span.attributes, "session": session})
+                if span.parent_id is None
+                else span
+                for span in reset_fixture_span_ids_and_timestamps(template)[0]
+            )
+        yield ExportTraceServiceRequest(
+            resource_spans=[
+                ResourceSpans(
+                    resource=resource,
+                    scope_spans=[ScopeSpans(spans=map(encode_span_to_otlp, spans))],
+                )
+            ]
+        )
+
+
+def _span(
+    shape: TraceShape,
+    rng: Random,
+    span_kind: SpanKind,
+    span_id: str,
+    parent_id: Optional[str],
+    start_time: datetime,
+    end_time: datetime,
+) -> Span:
+    error = rng.random() < shape.error_rate
+    return Span(
+        name=f"{span_kind.value.lower()}-{span_id}",
+        context=SpanContext(trace_id=f"{1:032x}", span_id=span_id),
+        span_kind=span_kind,
+        parent_id=parent_id,
+        start_time=start_time,
+        end_time=end_time,
+        status_code=SpanStatusCode.ERROR if error else SpanStatusCode.OK,
+        status_message="synthetic error" if error else "",
+        attributes=_attributes(shape, rng, span_kind),
+        events=[],
+        conversation=None,
+    )
+
+
+def _attributes(shape: TraceShape, rng: Random, span_kind: SpanKind) -> dict[str, Any]:
+    attributes: dict[str, Any] = {
+        "input": {"value": _text(rng, shape.attribute_size), "mime_type": "text/plain"},
+        "output": {"value": _text(rng, shape.attribute_size), "mime_type": "text/plain"},
+        "metadata": {"benchmark": True},
+    }
+    if span_kind is SpanKind.LLM:
+        attributes["llm"] = {
+            "model_name": "gpt-4o-mini",
+            "input_messages": [
+                {"message": {"role": "system", "content": _text(rng, shape.attribute_size)}},
+                {"message": {"role": "user", "content": _text(rng, shape.attribute_size)}},
+            ],
+            "output_messages": [
+                {"message": {"role": "assistant", "content": _text(rng, shape.attribute_size)}},
+            ],
+            "token_count": {
+                "prompt": (prompt := rng.randint(10, 1000)),
+                "completion": (completion := rng.randint(10, 1000)),
+                "total": prompt + completion,
+            },
+        }
+    elif span_kind is SpanKind.RETRIEVER:
+        attributes["retrieval"] = {
+            "documents": [
+                {
+                    "document": {
+                        "id": str(i),
+                        "content": _text(rng, shape.attribute_size),
+                        "score": rng.random(),
+                        **(
+                            {"embedding": _vector(rng, shape.embedding_dim)}
+                            if shape.embedding_dim
+                            else {}
+                        ),
+                    }
+                }
+                for i in range(shape.documents_per_retrieval)
+            ]
+        }
+    elif span_kind is SpanKind.EMBEDDING:
+        attributes["embedding"] = {
+            "model_name": "text-embedding-3-small",
+            "embeddings": [
+                {
+                    "embedding": {
+                        "text": _text(rng, shape.attribute_size),
+                        **(
+                            {"vector": _vector(rng, shape.embedding_dim)}
+                            if shape.embedding_dim
+                            else {}
+                        ),
+                    }
+                }
+            ],
+        }
+    return attributes
+
+
+_WORDS = "the quick brown fox jumps over lazy dog and then some more words follow".split()
+
+
+def _text(rng: Random, size: int) -> str:
+    words: list[str] = []
+    length = 0
+    while length < size:
+        words.append(word := rng.choice(_WORDS))
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def _vector(rng: Random, dim: int) -> list[float]:
+    return [rng.uniform(-1, 1) for _ in range(dim)]
@@ -0,0 +1,66 @@
+from typing import Any, Literal
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from phoenix.server.span_decoder import decode_otlp_request
+from phoenix.trace.otel import decode_otlp_span
+
+from ._generator import TraceShape, generate_requests
+from .conftest import Ingestion, IngestionResult
+
+SHAPES = [
+    TraceShape(),
+    TraceShape(depth=6, fan_out=1),
+    TraceShape(depth=2, fan_out=10),
+    TraceShape(attribute_size=10_000),
+    TraceShape(embedding_dim=1536),
+]
+
+
+@pytest.mark.parametrize("shape", SHAPES, ids=str)
+@pytest.mark.parametrize("protocol", ["http", "grpc"])
+def test_span_ingestion(
+    benchmark: BenchmarkFixture,
+    ingestion: Ingestion,
+    ingestion_results: list[IngestionResult],
+    num_traces: int,
+    protocol: Literal["http", "grpc"],
+    shape: TraceShape,
+    dialect: str,
+) -> None:
+    num_spans = num_traces * shape.spans_per_trace
+
+    def setup() -> tuple[tuple[Any, ...], dict[str, Any]]:
+        # Every round ingests new traces, since spans that already exist are skipped.
+        payloads = [r.SerializeToString() for r in generate_requests(shape, num_traces=num_traces)]
+        return (payloads, num_spans), {}
+
+    ingest = ingestion.http if protocol == "http" else ingestion.grpc
+    benchmark.pedantic(ingest, setup=setup, rounds=3, warmup_rounds=1)
+    transactions = ingestion.bulk_inserter.transactions
+    result = IngestionResult(
+        name=f"{protocol}-{dialect}-{shape}",
+        num_spans=num_spans,
+        seconds=list(benchmark.stats.stats.data),
+        commit_latencies=[latency for _, latency in transactions],
+        spans_per_transaction=[size for size, _ in transactions],
+    )
+    ingestion_results.append(result)
+    benchmark.extra_info.update(
+        spans_per_second=result.spans_per_second,
+        commit_latency_p50=result.commit_latency_p50,
+        commit_latency_p99=result.commit_latency_p99,
+    )
+
+
+@pytest.mark.parametrize("shape", SHAPES, ids=str)
+def test_decode_otlp_request(benchmark: BenchmarkFixture, shape: TraceShape) -> None:
+    (request,) = generate_requests(shape, num_traces=10, traces_per_request=10)
+    benchmark(decode_otlp_request, request)
+
+
+def test_decode_otlp_span(benchmark: BenchmarkFixture) -> None:
+    (request,) = generate_requests(TraceShape(), num_traces=1)
+    (otlp_span, *_) = request.resource_spans[0].scope_spans[0].spans
+    benchmark(decode_otlp_span, otlp_span)
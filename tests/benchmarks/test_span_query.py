@@ -0,0 +1,95 @@
+"""
+Compares retrieving spans as Arrow tables built directly from the result set with the
+pandas path, each including the serialization to Arrow IPC bytes that is sent to clients.
+
+The peak memory is that traced by `tracemalloc` plus the memory allocated by Arrow, since
+the peak RSS of the process can't be isolated to a single benchmark.
+"""
+
+import tracemalloc
+from typing import Literal
+
+import pyarrow as pa
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from phoenix.server.api.routers.utils import df_to_bytes, table_to_bytes
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace.dsl import SpanQuery
+
+from ._generator import TraceShape, generate_requests
+from .conftest import Ingestion, QueryResult
+
+QUERIES = {
+    "all": SpanQuery(),
+    "select": SpanQuery().select(
+        "name",
+        "span_kind",
+        "input.value",
+        "output.value",
+        "llm.token_count.total",
+    ),
+    "filter": SpanQuery().select("name", "output.value").where("span_kind == 'LLM'"),
+}
+
+
+@pytest.fixture
+def num_spans(ingestion: Ingestion, num_traces: int) -> int:
+    shape = TraceShape()
+    payloads = [r.SerializeToString() for r in generate_requests(shape, num_traces=num_traces)]
+    num_spans = num_traces * shape.spans_per_trace
+    ingestion.http(payloads, num_spans)
+    return num_spans
+
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("format", ["pandas", "arrow"])
+def test_span_query(
+    benchmark: BenchmarkFixture,
+    ingestion: Ingestion,
+    query_results: list[QueryResult],
+    num_spans: int,
+    query: str,
+    format: Literal["pandas", "arrow"],
+    dialect: str,
+) -> None:
+    def run() -> int:
+        return ingestion.loop.run_until_complete(
+            _query(ingestion.db, QUERIES[query], format, num_spans)
+        )
+
+    num_rows = benchmark.pedantic(run, rounds=3, warmup_rounds=1)
+    allocated = pa.total_allocated_bytes()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    result = QueryResult(
+        name=f"{format}-{dialect}-{query}",
+        num_rows=num_rows,
+        seconds=list(benchmark.stats.stats.data),
+        peak_memory=peak + max(0, pa.total_allocated_bytes() - allocated),
+    )
+    query_results.append(result)
+    benchmark.extra_info.update(
+        rows_per_second=result.rows_per_second,
+        peak_memory=result.peak_memory,
+    )
+
+
+async def _query(
+    db: DbSessionFactory,
+    query: SpanQuery,
+    format: Literal["pandas", "arrow"],
+    limit: int,
+) -> int:
+    async with db.read() as session:
+        if format == "arrow":
+            table = await session.run_sync(query.to_arrow, "benchmark", limit=limit)
+            table_to_bytes(table)
+            return int(table.num_rows)
+        df = await session.run_sync(query, "benchmark", limit=limit)
+        df_to_bytes(df)
+        return len(df)
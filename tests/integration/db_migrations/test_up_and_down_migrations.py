@@ -293,3 +293,18 @@ def test_up_and_down_migrations(
         _up(_engine, _alembic_config, "bc8fea3c2bc8")
         _down(_engine, _alembic_config, "4ded9e43755f")
     _up(_engine, _alembic_config, "bc8fea3c2bc8")
+
+    for _ in range(2):
+        _up(_engine, _alembic_config, "dbdce6192b44")
+        _down(_engine, _alembic_config, "bc8fea3c2bc8")
+    _up(_engine, _alembic_config, "dbdce6192b44")
+
+    for _ in range(2):
+        _up(_engine, _alembic_config, "5a0f3c1e2b7d")
+        _down(_engine, _alembic_config, "dbdce6192b44")
+    _up(_engine, _alembic_config, "5a0f3c1e2b7d")
+
+    for _ in range(2):
+        _up(_engine, _alembic_config, "8a3764fe7f1a")
+        _down(_engine, _alembic_config, "5a0f3c1e2b7d")
+    _up(_engine, _alembic_config, "8a3764fe7f1a")
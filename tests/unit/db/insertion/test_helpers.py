@@ -6,7 +6,12 @@ from sqlalchemy import insert, select
 
 from phoenix.db import models
 from phoenix.db.helpers import SupportedSQLDialect
-from phoenix.db.insertion.helpers import OnConflict, insert_on_conflict
+from phoenix.db.insertion.helpers import (
+    MIN_RECORDS_TO_COPY,
+    OnConflict,
+    bulk_insert_on_conflict,
+    insert_on_conflict,
+)
 from phoenix.server.types import DbSessionFactory
 
 
@@ -174,3 +179,94 @@ class Test_insert_on_conflict:
             assert anno.label is None
             assert anno.explanation is None
             assert anno.metadata_ == {"2": "1"}
+
+
+class Test_bulk_insert_on_conflict:
+    @pytest.mark.parametrize(
+        "on_conflict",
+        [
+            pytest.param(
+                OnConflict.DO_NOTHING,
+                id="do-nothing",
+            ),
+            pytest.param(
+                OnConflict.DO_UPDATE,
+                id="do-update",
+            ),
+        ],
+    )
+    @pytest.mark.parametrize("num_records", [1, MIN_RECORDS_TO_COPY])
+    async def test_matches_insert_on_conflict(
+        self,
+        on_conflict: OnConflict,
+        num_records: int,
+        db: DbSessionFactory,
+    ) -> None:
+        async with db() as session:
+            project_rowid = await session.scalar(
+                insert(models.Project).values(dict(name="abc")).returning(models.Project.id)
+            )
+            trace_rowid = await session.scalar(
+                insert(models.Trace)
+                .values(
+                    dict(
+                        project_rowid=project_rowid,
+                        trace_id="xyz",
+                        start_time=datetime.now(),
+                        end_time=datetime.now(),
+                    )
+                )
+                .returning(models.Trace.id)
+            )
+            existing_id = await session.scalar(
+                insert(models.TraceAnnotation)
+                .values(
+                    dict(
+                        name="0",
+                        trace_rowid=trace_rowid,
+                        annotator_kind="LLM",
+                        score=0,
+                        metadata_={},
+                    )
+                )
+                .returning(models.TraceAnnotation.id)
+            )
+        async with db() as session:
+            ids = await bulk_insert_on_conflict(
+                session,
+                *(
+                    dict(
+                        name=str(i),
+                        trace_rowid=trace_rowid,
+                        annotator_kind="HUMAN",
+                        score=i + 1,
+                        metadata_={"i": i},
+                    )
+                    for i in range(num_records)
+                ),
+                table=models.TraceAnnotation,
+                unique_by=("name", "trace_rowid"),
+                returning=models.TraceAnnotation.id,
+                on_conflict=on_conflict,
+            )
+            annos = {
+                anno.name: anno
+                for anno in await session.scalars(
+                    select(models.TraceAnnotation).where(
+                        models.TraceAnnotation.trace_rowid == trace_rowid
+                    )
+                )
+            }
+        assert len(annos) == num_records
+        assert annos["0"].id == existing_id
+        if on_conflict is OnConflict.DO_NOTHING:
+            assert sorted(ids) == sorted(anno.id for anno in annos.values() if anno.name != "0")
+            assert annos["0"].score == 0
+            assert annos["0"].metadata_ == {}
+        else:
+            assert sorted(ids) == sorted(anno.id for anno in annos.values())
+            assert annos["0"].score == 1
+            assert annos["0"].metadata_ == {"i": 0}
+        for i in range(1, num_records):
+            assert annos[str(i)].score == i + 1
+            assert annos[str(i)].metadata_ == {"i": i}
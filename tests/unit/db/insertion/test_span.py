@@ -0,0 +1,339 @@
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+import pytest
+from sqlalchemy import delete, event, func, select
+
+from phoenix.db import models
+from phoenix.db.insertion.cache import RowIdCache
+from phoenix.db.insertion.helpers import MAX_BIND_PARAMETERS
+from phoenix.db.insertion.span import insert_span, insert_spans
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace.schemas import Span, SpanContext, SpanKind, SpanStatusCode
+
+_T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _span(
+    span_id: str,
+    parent_id: Optional[str] = None,
+    *,
+    trace_id: str = "t1",
+    start: int = 0,
+    end: int = 10,
+    error: bool = False,
+    attributes: Optional[dict[str, Any]] = None,
+) -> Span:
+    return Span(
+        name=span_id,
+        context=SpanContext(trace_id=trace_id, span_id=span_id),
+        span_kind=SpanKind.LLM,
+        parent_id=parent_id,
+        start_time=_T0 + timedelta(seconds=start),
+        end_time=_T0 + timedelta(seconds=end),
+        status_code=SpanStatusCode.ERROR if error else SpanStatusCode.OK,
+        status_message="",
+        attributes=attributes or {},
+        events=[],
+        conversation=None,
+    )
+
+
+def _tokens(prompt: int, completion: int) -> dict[str, Any]:
+    return {"llm": {"token_count": {"prompt": prompt, "completion": completion}}}
+
+
+@pytest.mark.parametrize("bulk,cache", [(True, None), (True, RowIdCache()), (False, None)])
+async def test_insert_spans_matches_insert_span(
+    db: DbSessionFactory,
+    bulk: bool,
+    cache: Optional[RowIdCache],
+) -> None:
+    # Spans arrive out of order across batches: the grandchild and the root first,
+    # then the child that connects them, then a duplicate of the root.
+    batches = [
+        [
+            (_span("c", "b", start=2, end=3, error=True, attributes=_tokens(1, 2)), "abc"),
+            (_span("a", start=0, end=10, attributes={"session": {"id": " s1 "}}), "abc"),
+            (_span("x", trace_id="t2", start=20, end=25), "xyz"),
+        ],
+        [
+            (_span("b", "a", start=1, end=11, attributes=_tokens(10, 20)), "xyz"),
+            (_span("d", "b", start=-1, end=4, error=True), "xyz"),
+        ],
+        [
+            (_span("a", start=0, end=10), "abc"),
+        ],
+    ]
+    for batch in batches:
+        async with db() as session:
+            if bulk:
+                await insert_spans(session, *batch, cache=cache)
+            else:
+                for span, project_name in batch:
+                    await insert_span(session, span, project_name)
+    async with db() as session:
+        projects = {p.id: p.name for p in await session.scalars(select(models.Project))}
+        traces = {t.trace_id: t for t in await session.scalars(select(models.Trace))}
+        spans = {s.span_id: s for s in await session.scalars(select(models.Span))}
+        project_sessions = list(await session.scalars(select(models.ProjectSession)))
+    assert sorted(projects.values()) == ["abc", "xyz"]
+    assert len(spans) == 5
+    t1 = traces["t1"]
+    assert t1.start_time == _T0 - timedelta(seconds=1)
+    assert t1.end_time == _T0 + timedelta(seconds=11)
+    assert projects[t1.project_rowid] == "xyz"
+    assert projects[traces["t2"].project_rowid] == "xyz"
+    assert traces["t2"].project_session_rowid is None
+    assert len(project_sessions) == 1
+    project_session = project_sessions[0]
+    assert project_session.session_id == "s1"
+    assert project_session.id == t1.project_session_rowid
+    assert projects[project_session.project_id] == "abc"
+    assert project_session.start_time == t1.start_time
+    assert project_session.end_time == t1.end_time
+    cumulative = {
+        span_id: (
+            s.cumulative_error_count,
+            s.cumulative_llm_token_count_prompt,
+            s.cumulative_llm_token_count_completion,
+        )
+        for span_id, s in spans.items()
+    }
+    assert cumulative == {
+        "a": (2, 11, 22),
+        "b": (2, 11, 22),
+        "c": (1, 1, 2),
+        "d": (1, 0, 0),
+        "x": (0, 0, 0),
+    }
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+async def test_insert_spans_reports_start_times(db: DbSessionFactory, bulk: bool) -> None:
+    batches = [
+        [(_span("a", start=5, end=10), "abc")],
+        [(_span("b", "a", start=2, end=12), "abc"), (_span("x", trace_id="t2", start=20), "abc")],
+    ]
+    for batch in batches:
+        async with db() as session:
+            if bulk:
+                events = await insert_spans(session, *batch)
+            else:
+                events = [e for s, n in batch if (e := await insert_span(session, s, n))]
+    assert [(e.start_time, e.previous_trace_start_time) for e in events] == [
+        (_T0 + timedelta(seconds=2), _T0 + timedelta(seconds=5)),
+        (_T0 + timedelta(seconds=20), None),
+    ]
+
+
+async def test_insert_spans_rolls_up_deep_traces_across_batches(
+    db: DbSessionFactory,
+) -> None:
+    depth = 200
+    chain = [
+        (_span(f"s{i}", f"s{i - 1}" if i else None, error=i % 3 == 0), "abc") for i in range(depth)
+    ]
+    # every third span in the first batch, the rest in reverse order
+    batches = [chain[::3], chain[1::3][::-1], chain[2::3]]
+    for batch in batches:
+        async with db() as session:
+            await insert_spans(session, *batch)
+    async with db() as session:
+        spans = {s.span_id: s for s in await session.scalars(select(models.Span))}
+    assert len(spans) == depth
+    for i in range(depth):
+        expected = sum(1 for j in range(i, depth) if j % 3 == 0)
+        assert spans[f"s{i}"].cumulative_error_count == expected
+
+
+@pytest.mark.parametrize(
+    "batches",
+    [
+        pytest.param([[("a", "a")]], id="self-parent"),
+        pytest.param([[("a", "a")], [("b", "a")]], id="self-parent-across-batches"),
+        pytest.param([[("a", "b"), ("b", "a")]], id="two-span-cycle"),
+        pytest.param([[("a", "b")], [("b", "a")]], id="two-span-cycle-across-batches"),
+    ],
+)
+async def test_insert_spans_with_cyclic_parents(
+    db: DbSessionFactory,
+    batches: list[list[tuple[str, str]]],
+) -> None:
+    for batch in batches:
+        async with db() as session:
+            await asyncio.wait_for(
+                insert_spans(
+                    session,
+                    *(
+                        (_span(span_id, parent_id, error=True), "abc")
+                        for span_id, parent_id in batch
+                    ),
+                ),
+                timeout=10,
+            )
+    async with db() as session:
+        spans = {s.span_id: s for s in await session.scalars(select(models.Span))}
+    assert sorted(spans) == sorted(span_id for batch in batches for span_id, _ in batch)
+    assert all(s.cumulative_error_count >= 1 for s in spans.values())
+
+
+async def test_insert_spans_with_many_single_span_traces(
+    db: DbSessionFactory,
+) -> None:
+    # Each trace and project session upserted is bound as several parameters, which would
+    # exceed the limit on bind parameters in a single statement if not chunked.
+    num_traces = 9_000
+    spans = [
+        (
+            _span(
+                f"s{i}",
+                trace_id=f"t{i}",
+                start=i,
+                end=i + 1,
+                attributes={"session": {"id": f"session-{i}"}},
+            ),
+            "abc",
+        )
+        for i in range(num_traces)
+    ]
+    max_parameters = 0
+
+    def count_parameters(conn: Any, cursor: Any, statement: Any, parameters: Any, *_: Any) -> None:
+        nonlocal max_parameters
+        max_parameters = max(max_parameters, len(parameters))
+
+    async with db() as session:
+        engine = session.bind
+        event.listen(engine.sync_engine, "before_cursor_execute", count_parameters)
+        try:
+            events = await insert_spans(session, *spans)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", count_parameters)
+    assert len(events) == num_traces
+    assert max_parameters <= MAX_BIND_PARAMETERS
+    async with db() as session:
+        assert await session.scalar(select(func.count(models.Trace.id))) == num_traces
+        assert await session.scalar(select(func.count(models.ProjectSession.id))) == num_traces
+        assert await session.scalar(select(func.count(models.Span.id))) == num_traces
+
+
+async def test_insert_spans_with_invalidated_cache(
+    db: DbSessionFactory,
+) -> None:
+    cache = RowIdCache()
+    async with db() as session:
+        await insert_spans(
+            session, (_span("a", attributes={"session": {"id": "s1"}}), "abc"), cache=cache
+        )
+    cached_trace = cache.traces.get("t1")
+    assert cached_trace is not None
+    assert cache.projects.get("abc") == cached_trace.project_rowid
+    async with db() as session:
+        await session.execute(delete(models.Project))
+    cache.invalidate_project(cached_trace.project_rowid)
+    assert cache.traces.get("t1") is None
+    assert cache.project_session_rowids.get("s1") is None
+    async with db() as session:
+        await insert_spans(
+            session, (_span("b", attributes={"session": {"id": "s1"}}), "abc"), cache=cache
+        )
+    async with db() as session:
+        trace = await session.scalar(select(models.Trace))
+        span = await session.scalar(select(models.Span))
+        project_session = await session.scalar(select(models.ProjectSession))
+    assert trace is not None and span is not None and project_session is not None
+    assert span.span_id == "b"
+    assert trace.project_session_rowid == project_session.id
+    assert cache.traces.get("t1") == (
+        trace.id,
+        trace.project_rowid,
+        trace.start_time,
+        trace.end_time,
+        project_session.id,
+    )
+
+
+async def test_insert_spans_from_multiple_writers(
+    db: DbSessionFactory,
+) -> None:
+    # Each writer has its own cache, which goes stale as the other writer inserts spans
+    # into the same trace and project session.
+    writers = [RowIdCache(), RowIdCache()]
+    batches = [
+        (0, [(_span("a", start=0, end=10, attributes={"session": {"id": "s1"}}), "abc")]),
+        (1, [(_span("b", "a", start=-5, end=5, error=True), "xyz")]),
+        (0, [(_span("c", "a", start=2, end=8, error=True), "abc")]),
+        (1, [(_span("d", "b", trace_id="t2", attributes={"session": {"id": "s1"}}), "xyz")]),
+        (0, [(_span("e", "c", start=9, end=20, attributes={"session": {"id": "s2"}}), "abc")]),
+    ]
+    for writer, batch in batches:
+        async with db() as session:
+            await insert_spans(session, *batch, cache=writers[writer])
+    async with db() as session:
+        projects = {p.id: p.name for p in await session.scalars(select(models.Project))}
+        traces = {t.trace_id: t for t in await session.scalars(select(models.Trace))}
+        spans = {s.span_id: s for s in await session.scalars(select(models.Span))}
+        project_sessions = list(await session.scalars(select(models.ProjectSession)))
+    t1 = traces["t1"]
+    assert t1.start_time == _T0 - timedelta(seconds=5)
+    assert t1.end_time == _T0 + timedelta(seconds=20)
+    assert projects[t1.project_rowid] == "abc"
+    assert len(project_sessions) == 1
+    project_session = project_sessions[0]
+    assert project_session.session_id == "s1"
+    assert t1.project_session_rowid == traces["t2"].project_session_rowid == project_session.id
+    assert project_session.start_time == t1.start_time
+    assert project_session.end_time == t1.end_time
+    assert {span_id: s.cumulative_error_count for span_id, s in spans.items()} == {
+        "a": 2,
+        "b": 1,
+        "c": 1,
+        "d": 0,
+        "e": 0,
+    }
+
+
+@pytest.mark.parametrize("dialect", ["postgresql"])
+async def test_insert_spans_concurrently(
+    db: DbSessionFactory,
+) -> None:
+    depth = 100
+    chain = [
+        (
+            _span(
+                f"s{i}",
+                f"s{i - 1}" if i else None,
+                start=-i,
+                end=i,
+                error=i % 3 == 0,
+                attributes={"session": {"id": "s1"}},
+            ),
+            "abc",
+        )
+        for i in range(depth)
+    ]
+    random.Random(42).shuffle(chain)
+    batches = [chain[i : i + 5] for i in range(0, depth, 5)]
+
+    async def insert(batch: list[tuple[Span, str]]) -> None:
+        async with db() as session:
+            await insert_spans(session, *batch)
+
+    await asyncio.gather(*(insert(batch) for batch in batches))
+    async with db() as session:
+        traces = list(await session.scalars(select(models.Trace)))
+        spans = {s.span_id: s for s in await session.scalars(select(models.Span))}
+        project_sessions = list(await session.scalars(select(models.ProjectSession)))
+    assert len(traces) == 1
+    assert traces[0].start_time == _T0 - timedelta(seconds=depth - 1)
+    assert traces[0].end_time == _T0 + timedelta(seconds=depth - 1)
+    assert len(project_sessions) == 1
+    assert project_sessions[0].start_time == traces[0].start_time
+    assert project_sessions[0].end_time == traces[0].end_time
+    assert len(spans) == depth
+    for i in range(depth):
+        expected = sum(1 for j in range(i, depth) if j % 3 == 0)
+        assert spans[f"s{i}"].cumulative_error_count == expected
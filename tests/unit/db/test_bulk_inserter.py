@@ -0,0 +1,164 @@
+import asyncio
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import pytest
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+from opentelemetry.proto.trace.v1.trace_pb2 import ResourceSpans, ScopeSpans
+from sqlalchemy import func, select
+
+from phoenix.db import models
+from phoenix.db.bulk_inserter import BulkInserter
+from phoenix.server.dml_event import SpanInsertEvent
+from phoenix.server.span_decoder import decode_otlp_request
+from phoenix.server.span_spool import SpanSpool
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace.otel import encode_span_to_otlp
+from phoenix.trace.schemas import Span
+
+from .insertion.test_span import _span
+
+
+class _EventQueue:
+    def __init__(self) -> None:
+        self.span_insertions = asyncio.Event()
+
+    def put(self, item: Any) -> None:
+        if isinstance(item, SpanInsertEvent):
+            self.span_insertions.set()
+
+
+async def _count_spans(db: DbSessionFactory) -> int:
+    async with db() as session:
+        return int(await session.scalar(select(func.count(models.Span.id))) or 0)
+
+
+async def test_spans_are_flushed_when_a_full_transaction_accumulates(
+    db: DbSessionFactory,
+) -> None:
+    event_queue = _EventQueue()
+    bulk_inserter = BulkInserter(
+        db,
+        event_queue=event_queue,
+        max_ops_per_transaction=3,
+        max_flush_latency=60,
+    )
+    async with bulk_inserter as (_, queue_span, *_):
+        await queue_span(_span("a"), "abc")
+        await queue_span(_span("b", "a"), "abc")
+        await asyncio.sleep(0.3)
+        assert not event_queue.span_insertions.is_set()
+        await queue_span(_span("c", "a"), "abc")
+        await asyncio.wait_for(event_queue.span_insertions.wait(), 30)
+    assert await _count_spans(db) == 3
+
+
+async def test_spans_are_flushed_after_max_flush_latency(
+    db: DbSessionFactory,
+) -> None:
+    event_queue = _EventQueue()
+    bulk_inserter = BulkInserter(
+        db,
+        event_queue=event_queue,
+        sleep=60,
+        max_flush_latency=0.2,
+    )
+    async with bulk_inserter as (_, queue_span, *_):
+        await asyncio.sleep(0.1)
+        await queue_span(_span("a"), "abc")
+        await asyncio.wait_for(event_queue.span_insertions.wait(), 30)
+    assert await _count_spans(db) == 1
+
+
+def test_spans_per_transaction_adapts_to_commit_latency() -> None:
+    bulk_inserter = BulkInserter(
+        DbSessionFactory(db=None, dialect="sqlite"),  # type: ignore[arg-type]
+        event_queue=_EventQueue(),
+        max_ops_per_transaction=100,
+        max_spans_per_transaction=300,
+        target_commit_latency=1.0,
+    )
+    # a fast but partial transaction says nothing about larger ones
+    bulk_inserter._adjust_spans_per_transaction(50, 0.01)
+    assert bulk_inserter._spans_per_transaction == 100
+    bulk_inserter._adjust_spans_per_transaction(100, 0.01)
+    assert bulk_inserter._spans_per_transaction == 200
+    bulk_inserter._adjust_spans_per_transaction(200, 0.8)
+    assert bulk_inserter._spans_per_transaction == 250
+    bulk_inserter._adjust_spans_per_transaction(250, 0.01)
+    assert bulk_inserter._spans_per_transaction == 300
+    bulk_inserter._adjust_spans_per_transaction(300, 10)
+    assert bulk_inserter._spans_per_transaction == 150
+
+
+async def test_span_queue_is_full_counts_admitted_spans(
+    db: DbSessionFactory,
+) -> None:
+    bulk_inserter = BulkInserter(
+        db,
+        event_queue=_EventQueue(),
+        sleep=60,
+        max_flush_latency=60,
+        max_spans_queue_size=3,
+    )
+    async with bulk_inserter as (_, queue_span, *_):
+        await queue_span(_span("a"), "abc")
+        release = bulk_inserter.admit_spans(2)
+        assert bulk_inserter.span_queue_is_full()
+        release()
+        assert not bulk_inserter.span_queue_is_full()
+        release()
+        assert bulk_inserter._num_admitted_spans == 0
+
+
+class _RecordingSpanSpool(SpanSpool):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.released = asyncio.Event()
+
+    def release(self, spans: Iterable[tuple[Span, str]]) -> None:
+        super().release(spans)
+        self.released.set()
+
+
+async def test_spooled_spans_are_dropped_after_retry_allowance(
+    db: DbSessionFactory,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def fail(*args: Any, **kwargs: Any) -> Any:
+        raise OSError("The spans are rejected")
+
+    monkeypatch.setattr("phoenix.db.bulk_inserter.insert_spans", fail)
+    monkeypatch.setattr(BulkInserter, "_insert_spans_individually", fail)
+    request = ExportTraceServiceRequest(
+        resource_spans=[
+            ResourceSpans(
+                scope_spans=[
+                    ScopeSpans(
+                        spans=[encode_span_to_otlp(_span(f"{1:016x}", trace_id=f"{1:032x}"))]
+                    )
+                ]
+            )
+        ]
+    )
+    async with _RecordingSpanSpool(tmp_path) as spool:
+        bulk_inserter = BulkInserter(
+            db,
+            event_queue=_EventQueue(),
+            sleep=0.01,
+            max_flush_latency=0.01,
+            retry_delay_sec=0.01,
+            retry_allowance=2,
+            span_spool=spool,
+        )
+        async with bulk_inserter as (_, queue_span, *_):
+            segment = await spool.append(request.SerializeToString())
+            spans = decode_otlp_request(request)
+            spool.assign(segment, spans)
+            for span, project_name in spans:
+                await queue_span(span, project_name)
+            await asyncio.wait_for(spool.released.wait(), 10)
+        assert not bulk_inserter._spans
+    assert not list(tmp_path.iterdir())
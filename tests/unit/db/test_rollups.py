@@ -0,0 +1,246 @@
+import math
+import random
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+import pytest
+from sqlalchemy import select
+
+from phoenix.db import models
+from phoenix.db.insertion.cache import RowIdCache
+from phoenix.db.insertion.span import insert_span, insert_spans
+from phoenix.db.rollups import (
+    RELATIVE_ACCURACY,
+    LatencySketch,
+    Rollup,
+    get_bucket_start,
+    get_latency_bin,
+    get_latency_ms,
+    is_aligned,
+    subtract_traces,
+)
+from phoenix.server.api.dataloaders import RecordCountDataLoader, TokenCountDataLoader
+from phoenix.server.api.input_types.TimeRange import TimeRange
+from phoenix.server.api.utils import delete_traces
+from phoenix.server.dml_event import DmlEvent
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace.schemas import Span, SpanContext, SpanKind, SpanStatusCode
+
+_T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_HOUR = timedelta(hours=1)
+
+
+class _EventQueue:
+    def put(self, item: DmlEvent) -> None:
+        pass
+
+
+def _span(
+    span_id: str,
+    parent_id: Optional[str] = None,
+    *,
+    trace_id: str = "t1",
+    start: float = 0,
+    error: bool = False,
+    tokens: tuple[int, int] = (0, 0),
+) -> Span:
+    attributes: dict[str, Any] = {}
+    if any(tokens):
+        attributes = {"llm": {"token_count": {"prompt": tokens[0], "completion": tokens[1]}}}
+    return Span(
+        name=span_id,
+        context=SpanContext(trace_id=trace_id, span_id=span_id),
+        span_kind=SpanKind.LLM,
+        parent_id=parent_id,
+        start_time=_T0 + start * _HOUR,
+        end_time=_T0 + start * _HOUR + timedelta(seconds=1),
+        status_code=SpanStatusCode.ERROR if error else SpanStatusCode.OK,
+        status_message="",
+        attributes=attributes,
+        events=[],
+        conversation=None,
+    )
+
+
+# Trace t1 moves to an earlier hour when its root span arrives, and then to an even earlier
+# hour, with spans from a different project.
+_BATCHES = [
+    [
+        (_span("c", "b", start=2.5, error=True, tokens=(1, 2)), "abc"),
+        (_span("x", trace_id="t2", start=3.5, tokens=(5, 5)), "abc"),
+    ],
+    [
+        (_span("a", start=1.5, tokens=(10, 20)), "xyz"),
+        (_span("y", "x", trace_id="t2", start=3.75, error=True), "abc"),
+    ],
+    [
+        (_span("b", "a", start=0.5, error=True), "xyz"),
+        (_span("a", start=1.5), "xyz"),
+    ],
+]
+
+
+async def _get_rollups(db: DbSessionFactory) -> dict[tuple[int, datetime], Rollup]:
+    async with db() as session:
+        rollups = await session.scalars(select(models.ProjectRollup))
+        return {
+            (r.project_rowid, r.bucket_start): Rollup(
+                span_count=r.span_count,
+                trace_count=r.trace_count,
+                error_count=r.error_count,
+                llm_token_count_prompt=r.llm_token_count_prompt,
+                llm_token_count_completion=r.llm_token_count_completion,
+            )
+            for r in rollups
+        }
+
+
+async def _get_latency_rollups(db: DbSessionFactory) -> dict[tuple[int, datetime, str, int], int]:
+    async with db() as session:
+        rollups = await session.scalars(select(models.ProjectLatencyRollup))
+        return {(r.project_rowid, r.bucket_start, r.kind, r.bin): r.count for r in rollups}
+
+
+async def _compute_latency_rollups(
+    db: DbSessionFactory,
+) -> dict[tuple[int, datetime, str, int], int]:
+    expected: Counter[tuple[int, datetime, str, int]] = Counter()
+    async with db() as session:
+        traces = {t.id: t for t in await session.scalars(select(models.Trace))}
+        spans = list(await session.scalars(select(models.Span)))
+    for kind, project_rowid, start_time, end_time in [
+        *(("trace", t.project_rowid, t.start_time, t.end_time) for t in traces.values()),
+        *(("span", traces[s.trace_rowid].project_rowid, s.start_time, s.end_time) for s in spans),
+    ]:
+        bin = get_latency_bin(get_latency_ms(start_time, end_time))
+        expected[(project_rowid, get_bucket_start(start_time), kind, bin)] += 1
+    return dict(expected)
+
+
+async def _compute_rollups(db: DbSessionFactory) -> dict[tuple[int, datetime], Rollup]:
+    expected: defaultdict[tuple[int, datetime], Rollup] = defaultdict(Rollup)
+    async with db() as session:
+        traces = {t.id: t for t in await session.scalars(select(models.Trace))}
+        spans = list(await session.scalars(select(models.Span)))
+    for trace in traces.values():
+        key = (trace.project_rowid, get_bucket_start(trace.start_time))
+        expected[key] += Rollup(trace_count=1)
+    for span in spans:
+        key = (traces[span.trace_rowid].project_rowid, get_bucket_start(span.start_time))
+        expected[key] += Rollup(
+            span_count=1,
+            error_count=int(span.status_code == "ERROR"),
+            llm_token_count_prompt=span.llm_token_count_prompt or 0,
+            llm_token_count_completion=span.llm_token_count_completion or 0,
+        )
+    return dict(expected)
+
+
+async def _insert(db: DbSessionFactory, bulk: bool, cache: Optional[RowIdCache]) -> None:
+    for batch in _BATCHES:
+        async with db() as session:
+            if bulk:
+                await insert_spans(session, *batch, cache=cache)
+            else:
+                for span, project_name in batch:
+                    await insert_span(session, span, project_name)
+
+
+def test_is_aligned() -> None:
+    assert is_aligned()
+    assert is_aligned(None, _T0 + _HOUR)
+    assert is_aligned(datetime(2024, 1, 1, 5, tzinfo=timezone(timedelta(hours=-5))))
+    assert not is_aligned(_T0, _T0 + timedelta(minutes=1))
+    assert not is_aligned(datetime(2024, 1, 1, 5, tzinfo=timezone(timedelta(hours=5, minutes=30))))
+
+
+def test_latency_sketch_quantiles_are_within_relative_accuracy() -> None:
+    rng = random.Random(42)
+    latencies = [rng.lognormvariate(5, 2) for _ in range(10_000)] + [0.0] * 10
+    sketch, other = LatencySketch(), LatencySketch()
+    for i, latency_ms in enumerate(latencies):
+        (sketch if i % 2 else other).add(latency_ms)
+    sketch.merge(other)
+    assert sketch.count == len(latencies)
+    assert LatencySketch(sketch.bins).bins == sketch.bins
+    ordered = sorted(latencies)
+    for probability in (0.0, 0.001, 0.01, 0.25, 0.5, 0.75, 0.9, 0.99, 0.999, 1.0):
+        rank = probability * (len(ordered) - 1)
+        lower, upper = ordered[math.floor(rank)], ordered[math.ceil(rank)]
+        actual = sketch.quantile(probability)
+        assert actual is not None
+        assert lower * (1 - RELATIVE_ACCURACY) <= actual <= upper * (1 + RELATIVE_ACCURACY)
+    assert LatencySketch().quantile(0.5) is None
+
+
+@pytest.mark.parametrize("bulk,cache", [(True, None), (True, RowIdCache()), (False, None)])
+async def test_span_insertion_maintains_rollups(
+    db: DbSessionFactory,
+    bulk: bool,
+    cache: Optional[RowIdCache],
+) -> None:
+    await _insert(db, bulk, cache)
+    rollups = await _get_rollups(db)
+    assert rollups == await _compute_rollups(db)
+    assert await _get_latency_rollups(db) == await _compute_latency_rollups(db)
+    async with db() as session:
+        trace = await session.scalar(select(models.Trace).filter_by(trace_id="t1"))
+    assert trace is not None
+    assert trace.start_time == _T0 + timedelta(minutes=30)
+    # The buckets emptied by moving the trace to earlier start times are removed.
+    assert not any(rollup.span_count == rollup.trace_count == 0 for rollup in rollups.values())
+
+
+async def test_trace_deletion_maintains_rollups(db: DbSessionFactory) -> None:
+    await _insert(db, True, None)
+    await delete_traces(db, "t2", event_queue=_EventQueue())
+    assert await _get_rollups(db) == await _compute_rollups(db)
+    assert await _get_latency_rollups(db) == await _compute_latency_rollups(db)
+    async with db() as session:
+        await subtract_traces(session, models.Trace.trace_id == "t1")
+        await session.execute(models.Trace.__table__.delete())
+    assert await _get_rollups(db) == {}
+    assert await _get_latency_rollups(db) == {}
+
+
+async def test_dataloaders_use_rollups_for_aligned_time_ranges(db: DbSessionFactory) -> None:
+    await _insert(db, True, None)
+    async with db() as session:
+        project_rowids = [p.id for p in await session.scalars(select(models.Project))]
+    time_ranges = [
+        None,
+        TimeRange(start=_T0, end=_T0 + 2 * _HOUR),
+        TimeRange(start=_T0 + timedelta(minutes=45), end=_T0 + 4 * _HOUR),
+    ]
+    record_counts = [
+        await RecordCountDataLoader(db)._load_fn(
+            [(kind, project_rowid, time_range, None) for project_rowid in project_rowids]
+        )
+        for kind in ("span", "trace")
+        for time_range in time_ranges
+    ]
+    token_counts = [
+        await TokenCountDataLoader(db)._load_fn(
+            [(kind, project_rowid, time_range, None) for project_rowid in project_rowids]
+        )
+        for kind in ("prompt", "completion", "total")
+        for time_range in time_ranges
+    ]
+    # A filter condition matching every span makes the dataloaders scan the spans instead.
+    condition = "span_kind == 'LLM'"
+    assert record_counts == [
+        await RecordCountDataLoader(db)._load_fn(
+            [(kind, project_rowid, time_range, condition) for project_rowid in project_rowids]
+        )
+        for kind in ("span", "trace")
+        for time_range in time_ranges
+    ]
+    assert token_counts == [
+        await TokenCountDataLoader(db)._load_fn(
+            [(kind, project_rowid, time_range, condition) for project_rowid in project_rowids]
+        )
+        for kind in ("prompt", "completion", "total")
+        for time_range in time_ranges
+    ]
+    assert record_counts[1] == [2, 0]
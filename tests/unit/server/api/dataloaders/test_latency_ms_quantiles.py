@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from random import Random
 from typing import Literal
 
 import numpy as np
@@ -7,10 +8,13 @@ import pytest
 from sqlalchemy import select
 
 from phoenix.db import models
+from phoenix.db.insertion.span import insert_spans
+from phoenix.db.rollups import RELATIVE_ACCURACY
 from phoenix.server.api.dataloaders import LatencyMsQuantileDataLoader
 from phoenix.server.api.dataloaders.latency_ms_quantile import Key
 from phoenix.server.api.input_types.TimeRange import TimeRange
 from phoenix.server.types import DbSessionFactory
+from phoenix.trace.schemas import Span, SpanContext, SpanKind, SpanStatusCode
 
 
 async def test_latency_ms_quantiles_p25_p50_p75(
@@ -57,6 +61,7 @@ async def test_latency_ms_quantiles_p25_p50_p75(
             TimeRange(start=start_time, end=end_time),
             "'_trace4_' in name" if kind == "span" else None,
             probability,
+            False,
         )
         for kind in kinds
         for id_ in range(10)
@@ -64,3 +69,59 @@ async def test_latency_ms_quantiles_p25_p50_p75(
     ]
     actual = await LatencyMsQuantileDataLoader(db)._load_fn(keys)
     assert actual == pytest.approx(expected, 1e-7)
+
+
+async def test_approximate_latency_ms_quantiles_match_exact_ones(
+    db: DbSessionFactory,
+) -> None:
+    rng = Random(42)
+    t0 = datetime.fromisoformat("2021-01-01T00:00:00.000+00:00")
+    spans = []
+    for i in range(300):
+        trace_start = t0 + timedelta(minutes=rng.randint(0, 6 * 60))
+        for j in range(5):
+            start_time = trace_start + timedelta(milliseconds=rng.randint(0, 100))
+            latency_ms = rng.lognormvariate(6, 1.5) + 50
+            spans.append(
+                (
+                    Span(
+                        name=f"span-{i}-{j}",
+                        context=SpanContext(trace_id=f"trace-{i}", span_id=f"span-{i}-{j}"),
+                        span_kind=SpanKind.LLM,
+                        parent_id=None if j == 0 else f"span-{i}-0",
+                        start_time=start_time,
+                        end_time=start_time + timedelta(milliseconds=latency_ms),
+                        status_code=SpanStatusCode.OK,
+                        status_message="",
+                        attributes={},
+                        events=[],
+                        conversation=None,
+                    ),
+                    "abc" if i % 3 else "xyz",
+                )
+            )
+    for i in range(0, len(spans), 100):
+        async with db() as session:
+            await insert_spans(session, *spans[i : i + 100])
+    time_ranges = [
+        None,
+        TimeRange(start=t0 + timedelta(hours=1), end=t0 + timedelta(hours=4)),
+        TimeRange(start=t0 + timedelta(hours=2)),
+    ]
+    kinds: list[Literal["span", "trace"]] = ["trace", "span"]
+    loader = LatencyMsQuantileDataLoader(db)
+    for kind in kinds:
+        for time_range in time_ranges:
+            for approximate in (False, True):
+                keys: list[Key] = [
+                    (kind, project_rowid, time_range, None, probability, approximate)
+                    for project_rowid in (1, 2)
+                    for probability in (0.01, 0.25, 0.50, 0.75, 0.99)
+                ]
+                if approximate:
+                    actual = await loader._load_fn(keys)
+                else:
+                    expected = await loader._load_fn(keys)
+            # The exact latencies are rounded to 0.1ms.
+            assert actual == pytest.approx(expected, rel=RELATIVE_ACCURACY + 0.001)
+            assert actual != expected
@@ -1,12 +1,14 @@
-from datetime import datetime
+from asyncio import Future
+from datetime import datetime, timedelta
 from typing import Literal
 
 import pandas as pd
+from prometheus_client import REGISTRY
 from sqlalchemy import func, select
 
 from phoenix.db import models
 from phoenix.server.api.dataloaders import RecordCountDataLoader
-from phoenix.server.api.dataloaders.record_counts import Key
+from phoenix.server.api.dataloaders.record_counts import Key, RecordCountCache
 from phoenix.server.api.input_types.TimeRange import TimeRange
 from phoenix.server.types import DbSessionFactory
 
@@ -56,3 +58,33 @@ async def test_record_counts(
 
     actual = await RecordCountDataLoader(db)._load_fn(keys)
     assert actual == expected
+
+
+async def test_record_count_cache_invalidates_overlapping_time_intervals() -> None:
+    t0 = datetime.fromisoformat("2021-01-01T00:00:00.000+00:00")
+    hour = timedelta(hours=1)
+    keys: list[Key] = [
+        ("span", 1, TimeRange(start=t0, end=t0 + hour), None),
+        ("span", 1, TimeRange(start=t0 + hour, end=t0 + 2 * hour), None),
+        ("trace", 1, TimeRange(start=t0 + 2 * hour, end=t0 + 3 * hour), None),
+        ("trace", 1, None, None),
+        ("span", 2, TimeRange(start=t0, end=t0 + hour), None),
+    ]
+    cache = RecordCountCache(enable_prometheus=True)
+    for key in keys:
+        cache.set(key, Future())
+    labels = {"cache": "record_count", "reason": "invalidation"}
+    evictions = REGISTRY.get_sample_value("dataloader_cache_evictions_total", labels) or 0
+    hits = REGISTRY.get_sample_value("dataloader_cache_hits_total", {"cache": "record_count"})
+
+    # Interval end times are exclusive, so the first interval is not affected.
+    cache.invalidate(1, t0 + hour, t0 + hour + timedelta(minutes=5))
+
+    assert [cache.get(key) is not None for key in keys] == [True, False, True, False, True]
+    assert REGISTRY.get_sample_value("dataloader_cache_evictions_total", labels) == evictions + 2
+    assert (
+        REGISTRY.get_sample_value("dataloader_cache_hits_total", {"cache": "record_count"})
+        == (hits or 0) + 3
+    )
+    cache.invalidate(1)
+    assert [cache.get(key) is not None for key in keys] == [False, False, False, False, True]
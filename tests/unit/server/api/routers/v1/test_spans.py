@@ -5,6 +5,7 @@ from typing import Any, cast
 
 import httpx
 import pandas as pd
+import pyarrow as pa
 import pytest
 from faker import Faker
 from sqlalchemy import insert, select
@@ -124,3 +125,107 @@ async def project_with_a_single_trace_and_span(
             )
             .returning(models.Span.id)
         )
+
+
+@pytest.fixture
+async def spans_with_documents(db: DbSessionFactory) -> None:
+    async with db() as session:
+        project_rowid = await session.scalar(
+            insert(models.Project).values(name="default").returning(models.Project.id)
+        )
+        start_time = datetime.fromisoformat("2021-01-01T00:00:00.000+00:00")
+        for i in range(5):
+            trace_rowid = await session.scalar(
+                insert(models.Trace)
+                .values(
+                    trace_id=f"trace-{i}",
+                    project_rowid=project_rowid,
+                    start_time=start_time,
+                    end_time=start_time,
+                )
+                .returning(models.Trace.id)
+            )
+            for j, parent_id in enumerate((None, f"span-{i}-0")):
+                documents = [{"document": {"content": f"{i}-{j}-{k}"}} for k in range(i % 3)]
+                await session.execute(
+                    insert(models.Span).values(
+                        trace_rowid=trace_rowid,
+                        span_id=f"span-{i}-{j}",
+                        parent_id=parent_id,
+                        name="retriever" if j else "chain",
+                        span_kind="RETRIEVER" if j else "CHAIN",
+                        start_time=start_time,
+                        end_time=start_time,
+                        attributes={"retrieval": {"documents": documents}},
+                        events=[],
+                        status_code="OK",
+                        status_message="",
+                        cumulative_error_count=0,
+                        cumulative_llm_token_count_prompt=0,
+                        cumulative_llm_token_count_completion=0,
+                    )
+                )
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        SpanQuery(),
+        SpanQuery().where("span_kind == 'RETRIEVER'"),
+        SpanQuery().select("name", "span_kind"),
+        SpanQuery().explode("retrieval.documents", content="document.content"),
+        SpanQuery().concat("retrieval.documents", content="document.content"),
+    ],
+)
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+@pytest.mark.parametrize("root_spans_only", [None, True])
+async def test_query_spans_in_chunks_matches_query_spans(
+    px_client: Client,
+    spans_with_documents: Any,
+    query: SpanQuery,
+    chunk_size: int,
+    root_spans_only: bool,
+) -> None:
+    expected = px_client.query_spans(query, limit=None, root_spans_only=root_spans_only)
+    chunks = list(
+        px_client.query_spans_in_chunks(
+            query, chunk_size=chunk_size, root_spans_only=root_spans_only
+        )
+    )
+    assert all(len(chunk.index.unique(0)) <= chunk_size for chunk in chunks)
+    if not chunks:
+        assert expected is None or isinstance(expected, pd.DataFrame) and expected.empty
+        return
+    assert isinstance(expected, pd.DataFrame)
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks).sort_index(axis=0).sort_index(axis=1),
+        expected.sort_index(axis=0).sort_index(axis=1),
+        check_dtype=False,
+        check_index_type=False,
+    )
+    limited = list(px_client.query_spans_in_chunks(query, chunk_size=chunk_size, limit=3))
+    assert sum(len(chunk.index.unique(0)) for chunk in limited) <= 3
+
+
+async def test_query_spans_as_arrow(
+    px_client: Client,
+    spans_with_documents: Any,
+) -> None:
+    queries = [
+        SpanQuery().select("name", "span_kind").where("span_kind == 'RETRIEVER'"),
+        SpanQuery().explode("retrieval.documents", content="document.content"),
+    ]
+    dfs = cast(list[pd.DataFrame], px_client.query_spans(*queries))
+    tables = cast(list[pa.Table], px_client.query_spans(*queries, format="arrow"))
+    assert len(tables) == len(dfs) == 2
+    pd.testing.assert_frame_equal(
+        tables[0].to_pandas().set_index("context.span_id").sort_index(),
+        dfs[0].sort_index(),
+    )
+    pd.testing.assert_frame_equal(
+        tables[1].to_pandas().sort_index(), dfs[1].sort_index(), check_index_type=False
+    )
+    table = px_client.query_spans(SpanQuery().select("name"), format="arrow")
+    assert isinstance(table, pa.Table)
+    assert table.column_names == ["context.span_id", "name"]
+    assert table.num_rows == 10
@@ -1,13 +1,18 @@
 from asyncio import sleep
 from datetime import datetime
-from typing import Any
+from typing import Any, NoReturn, Optional
 
+import grpc
 import httpx
 import pytest
 from faker import Faker
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
 from sqlalchemy import insert, select
 
 from phoenix.db import models
+from phoenix.db.bulk_inserter import BulkInserter
+from phoenix.server.api.routers.v1.traces import SPAN_QUEUE_RETRY_AFTER_SECONDS
+from phoenix.server.grpc_server import Servicer
 from phoenix.server.types import DbSessionFactory
 
 
@@ -98,3 +103,44 @@ async def test_rest_trace_annotation(
     assert orm_annotation.score == 0.95
     assert orm_annotation.explanation == "This is a test annotation."
     assert orm_annotation.metadata_ == dict()
+
+
+@pytest.fixture
+def full_span_queue(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(BulkInserter, "span_queue_is_full", lambda _: True)
+
+
+async def test_post_traces_is_rejected_when_span_queue_is_full(
+    full_span_queue: None,
+    httpx_client: httpx.AsyncClient,
+) -> None:
+    response = await httpx_client.post(
+        "v1/traces",
+        content=ExportTraceServiceRequest().SerializeToString(),
+        headers={"content-type": "application/x-protobuf"},
+    )
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(SPAN_QUEUE_RETRY_AFTER_SECONDS)
+
+
+class _ServicerContext:
+    def __init__(self) -> None:
+        self.code: Optional[grpc.StatusCode] = None
+
+    async def abort(self, code: grpc.StatusCode, details: str) -> NoReturn:
+        self.code = code
+        raise grpc.aio.AbortError()
+
+
+async def test_grpc_export_is_rejected_when_span_queue_is_full() -> None:
+    queued_spans = []
+
+    async def queue_span(*args: Any) -> None:
+        queued_spans.append(args)
+
+    servicer = Servicer(queue_span, span_queue_is_full=lambda: True)
+    context = _ServicerContext()
+    with pytest.raises(grpc.aio.AbortError):
+        await servicer.Export(ExportTraceServiceRequest(), context)  # type: ignore[arg-type]
+    assert context.code is grpc.StatusCode.RESOURCE_EXHAUSTED
+    assert not queued_spans
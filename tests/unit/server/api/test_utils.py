@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+
+from phoenix.db import models
+from phoenix.server.api.utils import delete_projects, delete_traces
+from phoenix.server.dml_event import DmlEvent, ProjectDeleteEvent, SpanDeleteEvent
+from phoenix.server.types import DbSessionFactory
+
+
+class _EventQueue:
+    def __init__(self) -> None:
+        self.events: list[DmlEvent] = []
+
+    def put(self, item: DmlEvent) -> None:
+        self.events.append(item)
+
+
+async def test_deletions_emit_dml_events(db: DbSessionFactory) -> None:
+    now = datetime.now(timezone.utc)
+    async with db() as session:
+        project_ids = [
+            await session.scalar(
+                insert(models.Project).values(name=name).returning(models.Project.id)
+            )
+            for name in ("abc", "xyz")
+        ]
+        await session.execute(
+            insert(models.Trace).values(
+                trace_id="t1",
+                project_rowid=project_ids[1],
+                start_time=now,
+                end_time=now,
+            )
+        )
+    event_queue = _EventQueue()
+    assert await delete_traces(db, "t1", "t2", event_queue=event_queue)
+    assert await delete_projects(db, "abc", event_queue=event_queue)
+    assert not await delete_traces(db, "t1", event_queue=event_queue)
+    assert event_queue.events == [
+        SpanDeleteEvent((project_ids[1],)),
+        ProjectDeleteEvent((project_ids[0],)),
+    ]
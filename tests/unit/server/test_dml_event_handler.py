@@ -0,0 +1,54 @@
+import asyncio
+from asyncio import Future
+from datetime import datetime, timedelta
+
+import pytest
+
+from phoenix.server.api.dataloaders import CacheForDataLoaders
+from phoenix.server.api.dataloaders.record_counts import Key
+from phoenix.server.api.input_types.TimeRange import TimeRange
+from phoenix.server.dml_event import SpanDeleteEvent, SpanDmlEvent, SpanInsertEvent
+from phoenix.server.dml_event_handler import DmlEventHandler
+from phoenix.server.types import DbSessionFactory, LastUpdatedAt
+
+_T0 = datetime.fromisoformat("2021-01-01T00:00:00.000+00:00")
+_HOUR = timedelta(hours=1)
+
+
+@pytest.mark.parametrize(
+    "event,expected",
+    [
+        pytest.param(
+            SpanInsertEvent((1,), min_start_time=_T0 + _HOUR, max_start_time=_T0 + _HOUR),
+            [True, False, True],
+            id="insert-with-start-times",
+        ),
+        pytest.param(SpanInsertEvent((1,)), [False, False, True], id="insert"),
+        pytest.param(SpanDeleteEvent((1,)), [False, False, True], id="delete"),
+    ],
+)
+async def test_span_dml_events_invalidate_record_counts(
+    db: DbSessionFactory,
+    event: SpanDmlEvent,
+    expected: list[bool],
+) -> None:
+    cache = CacheForDataLoaders()
+    keys: list[Key] = [
+        ("span", 1, TimeRange(start=_T0, end=_T0 + _HOUR), None),
+        ("span", 1, TimeRange(start=_T0 + _HOUR, end=_T0 + 2 * _HOUR), None),
+        ("span", 2, TimeRange(start=_T0 + _HOUR, end=_T0 + 2 * _HOUR), None),
+    ]
+    for key in keys:
+        cache.record_count.set(key, Future())
+    cache.min_start_or_max_end_time.set((1, "start"), Future())
+    handler = DmlEventHandler(
+        db=db,
+        last_updated_at=LastUpdatedAt(),
+        cache_for_dataloaders=cache,
+        sleep_seconds=0.01,
+    )
+    async with handler:
+        handler.put(event)
+        await asyncio.sleep(0.1)
+    assert [cache.record_count.get(key) is not None for key in keys] == expected
+    assert cache.min_start_or_max_end_time.get((1, "start")) is None
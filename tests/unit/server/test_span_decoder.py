@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from openinference.semconv.resource import ResourceAttributes
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+from opentelemetry.proto.common.v1.common_pb2 import AnyValue, KeyValue
+from opentelemetry.proto.resource.v1.resource_pb2 import Resource
+from opentelemetry.proto.trace.v1.trace_pb2 import ResourceSpans, ScopeSpans
+
+from phoenix.server.span_decoder import SpanDecoder, _split, decode_otlp_request
+from phoenix.trace.otel import encode_span_to_otlp
+from phoenix.trace.schemas import Span, SpanContext, SpanKind, SpanStatusCode
+
+_T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _span(i: int) -> Span:
+    return Span(
+        name=f"span-{i}",
+        context=SpanContext(trace_id=f"{i // 3:032x}", span_id=f"{i:016x}"),
+        span_kind=SpanKind.CHAIN,
+        parent_id=None,
+        start_time=_T0 + timedelta(seconds=i),
+        end_time=_T0 + timedelta(seconds=i + 1),
+        status_code=SpanStatusCode.OK,
+        status_message="",
+        attributes={"input": {"value": str(i)}},
+        events=[],
+        conversation=None,
+    )
+
+
+def _request(*sizes_by_project: tuple[str, list[int]]) -> ExportTraceServiceRequest:
+    request = ExportTraceServiceRequest()
+    i = 0
+    for project_name, sizes in sizes_by_project:
+        attribute = KeyValue(
+            key=ResourceAttributes.PROJECT_NAME, value=AnyValue(string_value=project_name)
+        )
+        scope_spans = []
+        for size in sizes:
+            scope_spans.append(
+                ScopeSpans(spans=[encode_span_to_otlp(_span(i + j)) for j in range(size)])
+            )
+            i += size
+        request.resource_spans.append(
+            ResourceSpans(resource=Resource(attributes=[attribute]), scope_spans=scope_spans)
+        )
+    return request
+
+
+def test_split_preserves_spans_and_resources() -> None:
+    request = _request(("abc", [3, 4]), ("xyz", [0, 5]))
+    chunks = list(_split(request, 4))
+    assert [
+        sum(len(s.spans) for rs in chunk.resource_spans for s in rs.scope_spans) for chunk in chunks
+    ] == [4, 4, 4]
+    merged = ExportTraceServiceRequest()
+    for chunk in chunks:
+        merged.resource_spans.extend(chunk.resource_spans)
+    assert [
+        (rs.resource, span)
+        for rs in merged.resource_spans
+        for s in rs.scope_spans
+        for span in s.spans
+    ] == [
+        (rs.resource, span)
+        for rs in request.resource_spans
+        for s in rs.scope_spans
+        for span in s.spans
+    ]
+
+
+@pytest.mark.parametrize("max_workers", [0, 2])
+async def test_decode(max_workers: int) -> None:
+    request = _request(("abc", [3, 4]), ("xyz", [5]))
+    async with SpanDecoder(max_workers=max_workers, chunk_size=2) as decoder:
+        decoded_spans = await decoder.decode(request)
+    assert decoded_spans == decode_otlp_request(request)
+    assert [(span.name, project_name) for span, project_name in decoded_spans] == [
+        (f"span-{i}", "abc" if i < 7 else "xyz") for i in range(12)
+    ]
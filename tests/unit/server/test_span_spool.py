@@ -0,0 +1,68 @@
+from pathlib import Path
+
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+from opentelemetry.proto.trace.v1.trace_pb2 import ResourceSpans, ScopeSpans
+
+from phoenix.server.span_decoder import SpanDecoder
+from phoenix.server.span_spool import SpanSpool
+from phoenix.trace.otel import encode_span_to_otlp
+from phoenix.trace.schemas import Span
+
+from .test_span_decoder import _span
+
+
+def _request(*spans: Span) -> ExportTraceServiceRequest:
+    return ExportTraceServiceRequest(
+        resource_spans=[
+            ResourceSpans(scope_spans=[ScopeSpans(spans=[encode_span_to_otlp(s) for s in spans])])
+        ]
+    )
+
+
+async def _spool(
+    spool: SpanSpool, decoder: SpanDecoder, request: ExportTraceServiceRequest
+) -> list[tuple[Span, str]]:
+    segment = await spool.append(request.SerializeToString())
+    spans = await decoder.decode(request)
+    spool.assign(segment, spans)
+    return spans
+
+
+async def test_segments_are_removed_once_their_spans_are_released(tmp_path: Path) -> None:
+    decoder = SpanDecoder()
+    async with SpanSpool(tmp_path, max_segment_bytes=1) as spool:
+        first = await _spool(spool, decoder, _request(_span(0), _span(1)))
+        second = await _spool(spool, decoder, _request(_span(2)))
+        assert len(list(tmp_path.iterdir())) == 2
+        spool.release(first[:1])
+        assert len(list(tmp_path.iterdir())) == 2
+        spool.release(first[1:])
+        assert len(list(tmp_path.iterdir())) == 1
+        spool.release(second)
+        (active,) = tmp_path.iterdir()
+        assert active.stat().st_size == 0
+    assert not list(tmp_path.iterdir())
+
+
+async def test_unreleased_spans_are_replayed(tmp_path: Path) -> None:
+    decoder = SpanDecoder()
+    async with SpanSpool(tmp_path) as spool:
+        first = await _spool(spool, decoder, _request(_span(0), _span(1)))
+        await _spool(spool, decoder, _request(_span(2)))
+        spool.release(first)
+    # simulate a record torn by a crash
+    (segment,) = tmp_path.iterdir()
+    with open(segment, "ab") as f:
+        f.write(b"\x00\x00\x01\x00\x01")
+    queued: list[tuple[Span, str]] = []
+
+    async def queue_span(span: Span, project_name: str) -> None:
+        queued.append((span, project_name))
+
+    async with SpanSpool(tmp_path) as spool:
+        await spool.replay(decoder.decode, queue_span)
+        assert [span.name for span, _ in queued] == ["span-0", "span-1", "span-2"]
+        assert len(list(tmp_path.iterdir())) == 2
+        spool.release(queued)
+        assert len(list(tmp_path.iterdir())) == 1
+    assert not list(tmp_path.iterdir())
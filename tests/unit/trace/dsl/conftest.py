@@ -167,6 +167,7 @@ async def abc_project(db: DbSessionFactory) -> None:
                 trace_rowid=trace_rowid,
                 span_id="234",
                 parent_id="123",
+                is_root=True,
                 name="root span",
                 span_kind="UNKNOWN",
                 start_time=datetime.fromisoformat("2021-01-01T00:00:00.000+00:00"),
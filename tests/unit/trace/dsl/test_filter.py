@@ -11,7 +11,12 @@ from sqlalchemy import select
 import phoenix.trace.dsl.filter
 from phoenix.db import models
 from phoenix.server.types import DbSessionFactory
-from phoenix.trace.dsl.filter import SpanFilter, _apply_eval_aliasing, _get_attribute_keys_list
+from phoenix.trace.dsl.filter import (
+    SpanFilter,
+    _apply_eval_aliasing,
+    _get_attribute_keys_list,
+    get_span_filter_cache_info,
+)
 
 
 @pytest.mark.parametrize(
@@ -157,6 +162,8 @@ async def test_filter_translated(
         "uuid4",
         return_value=UUID(hex="00000000000000000000000000000000"),
     ):
+        # The condition may have been compiled by another test, with a different alias.
+        phoenix.trace.dsl.filter._compile.cache_clear()
         f = SpanFilter(expression)
     assert unparse(f.translated).strip() == expected
     # next line is only to test that the syntax is accepted
@@ -242,3 +249,20 @@ def test_apply_eval_aliasing(filter_condition: str, expected: str) -> None:
     ):
         aliased, _ = _apply_eval_aliasing(filter_condition)
     assert aliased == expected
+
+
+def test_span_filter_compiles_each_condition_once() -> None:
+    condition = "span_kind == 'LLM' and evals['Hallucination'].score < 0.5"
+    info = get_span_filter_cache_info()
+    f = SpanFilter(condition)
+    assert get_span_filter_cache_info().misses == info.misses + 1
+    g = SpanFilter.from_dict({"condition": condition})
+    assert get_span_filter_cache_info().hits == info.hits + 1
+    assert g.compiled is f.compiled
+    assert g == f
+    # The valid eval names are part of the cache key, since they affect the validation.
+    with pytest.raises(SyntaxError):
+        SpanFilter(condition, valid_eval_names=["Q&A Correctness"])
+    h = SpanFilter(condition, valid_eval_names=("Hallucination",))
+    assert h.compiled is not f.compiled
+    assert get_span_filter_cache_info().misses == info.misses + 3
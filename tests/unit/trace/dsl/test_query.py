@@ -2,9 +2,12 @@ from datetime import datetime
 from typing import Any
 
 import pandas as pd
+import pyarrow as pa
 import pytest
 from pandas.testing import assert_frame_equal
+from sqlalchemy import event
 from sqlalchemy.engine.base import Engine
+from sqlalchemy.orm import Session
 
 from phoenix.server.types import DbSessionFactory
 from phoenix.trace.dsl import SpanQuery
@@ -1382,3 +1385,76 @@ async def test_explode_and_concat_on_same_array_with_non_ascii_kwargs(
         actual.sort_index().sort_index(axis=1),
         expected.sort_index().sort_index(axis=1),
     )
+
+
+@pytest.mark.parametrize(
+    "sq",
+    [
+        SpanQuery(),
+        SpanQuery().where("span_kind == 'LLM'"),
+        SpanQuery().select("name", tcp="llm.token_count.prompt"),
+        SpanQuery().select("span_id", "trace_id", "input.value").with_index("trace_id"),
+        SpanQuery().select("name", "metadata").where("parent_id is not None").rename(name="n"),
+        SpanQuery().explode("retrieval.documents", content="document.content"),
+    ],
+)
+@pytest.mark.parametrize("root_spans_only", [None, True])
+async def test_to_arrow_matches_dataframe(
+    db: DbSessionFactory,
+    default_project: Any,
+    abc_project: Any,
+    sq: SpanQuery,
+    root_spans_only: bool,
+) -> None:
+    async with db() as session:
+        df = await session.run_sync(sq, project_name="abc", root_spans_only=root_spans_only)
+        table = await session.run_sync(
+            sq.to_arrow, project_name="abc", root_spans_only=root_spans_only
+        )
+    expected = df.reset_index(drop=not sq._select and not sq._explode)
+    actual = table.to_pandas()
+    if "attributes.attributes" in expected.columns:
+        if expected["attributes.attributes"].dropna().map(type).nunique() > 1:
+            # It's a string in one span and an object in another, so it's JSON-encoded.
+            assert table.schema.field("attributes.attributes").type == pa.string()
+        expected = expected.drop("attributes.attributes", axis=1)
+        actual = actual.drop("attributes.attributes", axis=1)
+    if sq._explode:
+        actual = actual.reset_index()
+    assert_frame_equal(
+        actual.sort_values(list(actual.columns[:1])).sort_index(axis=1).reset_index(drop=True),
+        expected.sort_values(list(actual.columns[:1])).sort_index(axis=1).reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+async def test_explode_and_concat_only_select_projected_values(
+    db: DbSessionFactory,
+    default_project: Any,
+    abc_project: Any,
+) -> None:
+    sq = (
+        SpanQuery()
+        .concat("retrieval.documents", content="document.content")
+        .explode("retrieval.documents", score="document.score")
+    )
+    statements: list[str] = []
+
+    def record(_: Any, __: Any, statement: str, *___: Any) -> None:
+        statements.append(statement)
+
+    def query(session: Session) -> pd.DataFrame:
+        bind = session.connection()
+        event.listen(bind, "before_cursor_execute", record)
+        try:
+            return sq(session, project_name="abc")
+        finally:
+            event.remove(bind, "before_cursor_execute", record)
+
+    async with db() as session:
+        actual = await session.run_sync(query)
+    assert len(actual) == 3
+    assert len(statements) == 2
+    for statement in statements:
+        assert "json_each" in statement or "jsonb_array_elements" in statement
+        assert "spans.attributes AS" not in statement